@@ -0,0 +1,6 @@
+"""Benchmarks dos sistemas do Dungeon Keeper.
+
+Execute a partir da raiz do repositório, por exemplo::
+
+    python -m benchmarks.bench_initiative
+"""
@@ -0,0 +1,66 @@
+"""Benchmark da consulta de habilidades aprendíveis de uma árvore inteira.
+
+Compara ``can_learn_ability`` chamado para cada nó (a consulta anterior, O(árvore)
+por chamada) com ``get_learnable_abilities``, que mantém o conjunto entre as
+chamadas e só reavalia o que mudou, numa árvore de 500 habilidades em que o
+personagem aprende uma habilidade por consulta.
+"""
+import random
+import time
+
+from src.systems.character.ability_system import (
+    Ability, AbilityCost, AbilityRequirement, AbilityResource, AbilitySystem, AbilityTree,
+    AbilityType
+)
+
+NODES = 500
+ATTRIBUTES = {"strength": 14, "intelligence": 12, "wisdom": 10}
+
+
+def build_system(seed: int = 1) -> AbilitySystem:
+    rng = random.Random(seed)
+    tree = AbilityTree("Grande", "Árvore para a interface")
+    for index in range(NODES):
+        name = f"habilidade_{index}"
+        attribute = rng.choice(list(ATTRIBUTES))
+        requirement = AbilityRequirement(level=rng.randint(1, 5), attributes={
+            attribute: rng.randint(8, ATTRIBUTES[attribute])
+        })
+        prerequisites = {f"habilidade_{rng.randrange(index)}"} if index else None
+        tree.add_ability(name, Ability(name, name, AbilityType.PASSIVE,
+                                       AbilityCost(AbilityResource.NONE), requirement),
+                         prerequisites)
+    system = AbilitySystem()
+    system.trees["grande"] = tree
+    return system
+
+
+def full_recheck(system: AbilitySystem) -> set:
+    tree = system.trees["grande"]
+    return {name for name in tree.abilities if name not in system.learned_abilities
+            and system.can_learn_ability("grande", name, 5, ATTRIBUTES)}
+
+
+def run(query) -> float:
+    """Milissegundos por consulta, aprendendo uma habilidade entre elas até esgotar a árvore."""
+    system = build_system()
+    queries = 0
+    start = time.perf_counter()
+    while True:
+        learnable = query(system)
+        queries += 1
+        if not learnable:
+            break
+        system.learn_ability("grande", min(learnable), 5, ATTRIBUTES)
+    return (time.perf_counter() - start) / queries * 1e3
+
+
+def main() -> None:
+    print(f"Habilidades aprendíveis numa árvore de {NODES} nós:")
+    print(f"  can_learn_ability por nó:  {run(full_recheck):8.3f} ms/consulta")
+    incremental = run(lambda system: system.get_learnable_abilities("grande", 5, ATTRIBUTES))
+    print(f"  get_learnable_abilities:   {incremental:8.3f} ms/consulta")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Benchmark de ``CombatRound.get_available_actions`` em grupos grandes.
+
+Mede o custo de consultar as ações disponíveis de todos os participantes,
+com parte deles sob condições que restringem ações; com máscaras de bits o
+custo por personagem deve permanecer constante.
+"""
+import timeit
+
+from src.systems.character.character import Character
+from src.systems.combat.combat_round import CombatRound, ActionType
+from src.systems.combat.combat_state import CombatState
+from src.systems.combat.condition import Condition, ConditionType
+
+PARTY_SIZES = (10, 100, 1000, 10_000)
+CONDITIONS = (ConditionType.POISONED, ConditionType.PARALYZED, ConditionType.BLINDED)
+ROUNDS = 20
+
+
+def build_round(count: int) -> CombatRound:
+    """Monta um round com ``count`` participantes, metade com condições e ações usadas."""
+    participants = [Character(name=f"Combatente {i}", stats={"hp": 50}) for i in range(count)]
+    state = CombatState()
+    state.start_combat(participants)
+    combat_round = CombatRound(state)
+    combat_round.start_round()
+    for index, participant in enumerate(participants):
+        if index % 2:
+            condition = CONDITIONS[index % len(CONDITIONS)]
+            state.condition_manager.add_condition(participant, Condition(condition, 5))
+            combat_round.use_action(participant, ActionType.STANDARD)
+    return combat_round
+
+
+def bench_available_actions(count: int) -> float:
+    """Retorna o custo médio por personagem, em nanossegundos."""
+    combat_round = build_round(count)
+    participants = combat_round.combat_state.participants
+    get_available_actions = combat_round.get_available_actions
+
+    def query_all() -> None:
+        for participant in participants:
+            get_available_actions(participant)
+
+    seconds = min(timeit.repeat(query_all, number=ROUNDS, repeat=5))
+    return seconds / (ROUNDS * count) * 1e9
+
+
+def main() -> None:
+    print(f"{'participantes':>14} {'ns/personagem':>14}")
+    for count in PARTY_SIZES:
+        print(f"{count:>14} {bench_available_actions(count):>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
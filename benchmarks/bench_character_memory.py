@@ -0,0 +1,35 @@
+"""Benchmark de memória: Character contra CompactCharacter.
+
+Mede, com ``tracemalloc``, o custo por instância de manter muitos personagens
+de NPC residentes em memória.
+"""
+import tracemalloc
+
+from src.systems.character.character import Character
+from src.systems.character.compact_character import CompactCharacter
+
+INSTANCES = 100_000
+
+
+def measure(factory) -> float:
+    """Retorna os bytes alocados por instância criada por ``factory``."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    instances = [factory(index) for index in range(INSTANCES)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del instances
+    return (after - before) / INSTANCES
+
+
+def main() -> None:
+    full = measure(lambda index: Character(name=f"NPC {index}"))
+    compact = measure(lambda index: CompactCharacter(name=f"NPC {index}"))
+    print(f"{'classe':>18} {'bytes/instância':>16}")
+    print(f"{'Character':>18} {full:>16.0f}")
+    print(f"{'CompactCharacter':>18} {compact:>16.0f}")
+    print(f"{'redução':>18} {1 - compact / full:>16.0%}")
+
+
+if __name__ == "__main__":
+    main()
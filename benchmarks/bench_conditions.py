@@ -0,0 +1,44 @@
+"""Benchmark de criação de condições em massa.
+
+Mede a criação de 10 mil ``Condition`` (como uma nuvem de veneno ou um
+atordoamento em área) e a aplicação delas a 10 mil personagens.
+"""
+import timeit
+
+from src.systems.character.character import Character
+from src.systems.combat.condition import Condition, ConditionType, ConditionManager
+
+CONDITION_COUNT = 10_000
+CONDITION_TYPES = list(ConditionType)
+
+
+def bench_construction() -> float:
+    """Retorna o tempo para criar ``CONDITION_COUNT`` condições, em milissegundos."""
+    types = [CONDITION_TYPES[i % len(CONDITION_TYPES)] for i in range(CONDITION_COUNT)]
+
+    def create() -> None:
+        for condition_type in types:
+            Condition(condition_type, 3)
+
+    return min(timeit.repeat(create, number=1, repeat=10)) * 1e3
+
+
+def bench_mass_application() -> float:
+    """Retorna o tempo para atordoar ``CONDITION_COUNT`` personagens, em milissegundos."""
+    characters = [Character(name=f"Alvo {i}") for i in range(CONDITION_COUNT)]
+
+    def apply() -> None:
+        manager = ConditionManager()
+        for character in characters:
+            manager.add_condition(character, Condition(ConditionType.STUNNED, 1))
+
+    return min(timeit.repeat(apply, number=1, repeat=10)) * 1e3
+
+
+def main() -> None:
+    print(f"criar {CONDITION_COUNT} condições:    {bench_construction():8.2f} ms")
+    print(f"aplicar {CONDITION_COUNT} condições:  {bench_mass_application():8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark das rolagens de d20.
+
+Compara ``random.randint(1, 20)`` chamado uma rolagem por vez com o
+``DiceStream`` (rolagem escalar, buffer de d20 e geração em bloco NumPy).
+"""
+import random
+import timeit
+
+from src.systems.dice.rng import DiceStream
+
+ROLLS = 100_000
+
+
+def _best(function) -> float:
+    return min(timeit.repeat(function, number=1, repeat=10)) * 1e3
+
+
+def bench_randint() -> float:
+    """Retorna o tempo de ``ROLLS`` chamadas a ``random.randint``, em milissegundos."""
+    rng = random.Random(1)
+    return _best(lambda: [rng.randint(1, 20) for _ in range(ROLLS)])
+
+
+def bench_stream_roll() -> float:
+    """Retorna o tempo de ``ROLLS`` chamadas a ``DiceStream.roll(20)``, em milissegundos."""
+    stream = DiceStream(1)
+    return _best(lambda: [stream.roll(20) for _ in range(ROLLS)])
+
+
+def bench_buffered_d20() -> float:
+    """Retorna o tempo de ``ROLLS`` chamadas a ``DiceStream.d20()``, em milissegundos."""
+    stream = DiceStream(1)
+    return _best(lambda: [stream.d20() for _ in range(ROLLS)])
+
+
+def bench_bound_buffer() -> float:
+    """Retorna o tempo de ``ROLLS`` chamadas a um buffer de d20 guardado, em milissegundos."""
+    d20 = DiceStream(1).buffer(20)
+    return _best(lambda: [d20() for _ in range(ROLLS)])
+
+
+def bench_bulk() -> float:
+    """Retorna o tempo para gerar ``ROLLS`` d20 num único array, em milissegundos."""
+    stream = DiceStream(1)
+    return _best(lambda: stream.rolls(20, ROLLS))
+
+
+def main() -> None:
+    print(f"random.randint x {ROLLS}:    {bench_randint():8.2f} ms")
+    print(f"DiceStream.roll x {ROLLS}:   {bench_stream_roll():8.2f} ms")
+    print(f"DiceStream.d20 x {ROLLS}:    {bench_buffered_d20():8.2f} ms")
+    print(f"buffer(20)() x {ROLLS}:      {bench_bound_buffer():8.2f} ms")
+    print(f"DiceStream.rolls({ROLLS}):   {bench_bulk():8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""Benchmark de memória do histórico de efeitos de um personagem longevo.
+
+Compara uma lista sem limite com as instâncias encerradas (o modelo anterior,
+que crescia para sempre) com o ``EffectHistory`` circular de registros
+compactos usado pelo ``StatusEffectManager``.
+"""
+import time
+import tracemalloc
+
+from src.systems.character.effect_history import EffectHistory
+from src.systems.character.status_effect import (
+    EFFECT_TEMPLATES, EffectInstance, StatusEffectManager
+)
+
+EFFECTS = 100_000
+
+
+def measure(build) -> float:
+    """Retorna os KiB alocados pela função ``build``."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / 1024
+
+
+def play(manager: StatusEffectManager) -> StatusEffectManager:
+    """Aplica e deixa expirar ``EFFECTS`` vezes o efeito "amedrontado"."""
+    for _ in range(EFFECTS):
+        manager.apply_effect("amedrontado", {})
+        manager.update_effects({})
+        manager.update_effects({})
+    return manager
+
+
+def unbounded_list() -> list:
+    template = EFFECT_TEMPLATES["amedrontado"]
+    return [EffectInstance(template, applied=2 * index) for index in range(EFFECTS)]
+
+
+def ring_buffer() -> StatusEffectManager:
+    return play(StatusEffectManager(effect_history=EffectHistory()))
+
+
+def main() -> None:
+    listed = measure(unbounded_list)
+    ring = measure(ring_buffer)
+    print(f"Histórico após {EFFECTS} efeitos encerrados:")
+    print(f"  lista de instâncias sem limite: {listed:8.1f} KiB")
+    print(f"  EffectHistory (64 registros):   {ring:8.1f} KiB")
+
+    manager = play(StatusEffectManager())
+    start = time.perf_counter()
+    for _ in range(10_000):
+        manager.get_effect_history(10)
+    print(f"  get_effect_history(10):         "
+          f"{(time.perf_counter() - start) / 10_000 * 1e6:8.2f} µs")
+
+
+if __name__ == "__main__":
+    main()
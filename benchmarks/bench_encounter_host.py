@@ -0,0 +1,68 @@
+"""Benchmark do host de encontros com milhares de lutas simultâneas.
+
+Abre ``ENCOUNTERS`` lutas num único ``EncounterHost``. Em parte delas o herói é
+controlado por um cliente (uma corrotina que responde a cada turno); nas
+demais, todos são NPCs. Mede o tempo até todas as lutas terminarem e os turnos
+resolvidos por segundo.
+"""
+import asyncio
+import time
+
+from src.systems.combat.encounter_host import EncounterHost
+from src.systems.combat.simulation import CombatantTemplate, EncounterTemplate
+
+ENCOUNTERS = 2000
+PLAYER_SHARE = 4  # uma luta a cada PLAYER_SHARE tem um jogador
+
+TEMPLATE = EncounterTemplate(combatants=[
+    CombatantTemplate(name="Guerreiro", team="herois", stats={"hp": 30, "armor_class": 15},
+                      attack_bonus=5, damage_dice=(1, 8), damage_bonus=3),
+    CombatantTemplate(name="Clériga", team="herois", stats={"hp": 24, "armor_class": 14},
+                      attack_bonus=4, damage_dice=(1, 6), damage_bonus=2),
+    CombatantTemplate(name="Goblin", team="goblins", count=4,
+                      stats={"hp": 7, "armor_class": 13}, attack_bonus=4, damage_dice=(1, 6)),
+])
+
+
+async def client(host: EncounterHost, encounter_id: int) -> int:
+    """Jogador que sempre escolhe a primeira ação disponível."""
+    turns = 0
+    prompt = await host.next_turn(encounter_id)
+    while prompt is not None:
+        host.submit_action(encounter_id, prompt.actions[0], prompt.turn_number)
+        turns += 1
+        prompt = await host.next_turn(encounter_id, after=prompt.turn_number)
+    return turns
+
+
+async def main_async() -> None:
+    host = EncounterHost(turn_timeout=1.0, tick_interval=0.001)
+    clients = []
+    start = time.perf_counter()
+    for index in range(ENCOUNTERS):
+        combatants = TEMPLATE.build()
+        players = [combatants[0][0]] if index % PLAYER_SHARE == 0 else []
+        encounter = host.add_encounter(combatants, players=players, seed=index)
+        if players:
+            clients.append(asyncio.create_task(client(host, encounter.id)))
+
+    stop = asyncio.Event()
+    runner = asyncio.create_task(host.run(stop))
+    player_turns = sum(await asyncio.gather(*clients))
+    while host.encounters:
+        await asyncio.sleep(0.01)
+    stop.set()
+    await runner
+    elapsed = time.perf_counter() - start
+
+    print(f"{ENCOUNTERS} lutas ({len(clients)} com jogador): {elapsed:.2f} s")
+    print(f"  turnos resolvidos: {host.turns_resolved} ({player_turns} de jogadores)")
+    print(f"  {host.turns_resolved / elapsed:,.0f} turnos/s")
+
+
+def main() -> None:
+    asyncio.run(main_async())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+"""Benchmark das expirações de condições por turno.
+
+Um cerco longo: um personagem acumula centenas de condições de longa duração
+e apenas algumas expiram por turno. O custo por turno deve acompanhar o número
+de expirações, não o total de condições ativas.
+"""
+import timeit
+
+from src.systems.character.character import Character
+from src.systems.combat.condition import Condition, ConditionManager, ConditionType
+
+ACTIVE_COUNTS = (10, 100, 1000, 10000)
+TURNS = 1000
+
+
+def bench_update_conditions(active: int) -> float:
+    """Retorna o custo médio por turno, em microssegundos."""
+    manager = ConditionManager()
+    character = Character(name="Defensor")
+    for index in range(active):
+        manager.add_condition(character, Condition(ConditionType.BLINDED, duration=10_000 + index))
+
+    # Uma condição curta expira a cada turno
+    def turn() -> None:
+        manager.add_condition(character, Condition(ConditionType.PRONE, duration=1))
+        manager.update_conditions(character)
+
+    seconds = min(timeit.repeat(turn, number=TURNS, repeat=3))
+    return seconds / TURNS * 1e6
+
+
+def main() -> None:
+    print(f"{'condições ativas':>17} {'µs/turno':>10}")
+    for active in ACTIVE_COUNTS:
+        print(f"{active:>17} {bench_update_conditions(active):>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
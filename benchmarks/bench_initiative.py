@@ -0,0 +1,57 @@
+"""Benchmark do avanço de turno da iniciativa.
+
+Mede o custo por turno de ``Initiative.next_turn`` para diferentes números de
+participantes; com a ordem em array o custo deve permanecer constante.
+"""
+import random
+import timeit
+
+from src.systems.character.character import Character
+from src.systems.combat.initiative import Initiative
+
+PARTICIPANT_COUNTS = (10, 100, 300, 1000, 3000)
+TURNS = 100_000
+
+
+def build_initiative(count: int) -> Initiative:
+    """Monta uma iniciativa com ``count`` participantes."""
+    initiative = Initiative(random.Random(0))
+    initiative.roll_initiative([Character(name=f"Combatente {i}") for i in range(count)])
+    return initiative
+
+
+def bench_next_turn(count: int) -> float:
+    """Retorna o custo médio por turno, em nanossegundos."""
+    initiative = build_initiative(count)
+    seconds = min(timeit.repeat(initiative.next_turn, number=TURNS, repeat=5))
+    return seconds / TURNS * 1e9
+
+
+def bench_churn(count: int) -> float:
+    """Custo médio por turno com entradas e saídas durante o combate."""
+    initiative = build_initiative(count)
+    active = initiative.get_initiative_order()
+    reserves = [Character(name=f"Reforço {i}") for i in range(count)]
+
+    def turn() -> None:
+        initiative.next_turn()
+        index = random.randrange(len(active))
+        leaving = active[index]
+        active[index] = reserves.pop()
+        initiative.remove_participant(leaving)
+        initiative.add_participant(active[index])
+
+    turns = min(TURNS // 10, count)
+    seconds = timeit.timeit(turn, number=turns)
+    return seconds / turns * 1e9
+
+
+def main() -> None:
+    random.seed(0)
+    print(f"{'participantes':>14} {'ns/turno':>10} {'ns/turno (entradas/saídas)':>28}")
+    for count in PARTICIPANT_COUNTS:
+        print(f"{count:>14} {bench_next_turn(count):>10.1f} {bench_churn(count):>28.1f}")
+
+
+if __name__ == "__main__":
+    main()
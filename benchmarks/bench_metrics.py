@@ -0,0 +1,37 @@
+"""Benchmark do custo da instrumentação das fases do combate.
+
+Mede ``CombatState.next_turn`` sem métricas, com as métricas ligadas e depois
+de desligá-las (os métodos originais voltam ao lugar, sem custo residual).
+"""
+import timeit
+
+from src.systems.character.character import Character
+from src.systems.combat.combat_state import CombatState
+from src.systems.combat.metrics import METRICS
+
+PARTICIPANTS = 50
+TURNS = 100_000
+
+
+def per_turn(state: CombatState) -> float:
+    """Retorna nanossegundos por ``next_turn``."""
+    return min(timeit.repeat(state.next_turn, number=TURNS, repeat=5)) / TURNS * 1e9
+
+
+def main() -> None:
+    state = CombatState()
+    state.start_combat([Character(name=f"Combatente {i}", stats={"hp": 50})
+                        for i in range(PARTICIPANTS)])
+    disabled = per_turn(state)
+    METRICS.enable()
+    enabled = per_turn(state)
+    METRICS.disable()
+    restored = per_turn(state)
+    print(f"next_turn com {PARTICIPANTS} participantes:")
+    print(f"  sem métricas:     {disabled:6.0f} ns")
+    print(f"  métricas ligadas: {enabled:6.0f} ns")
+    print(f"  desligadas:       {restored:6.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
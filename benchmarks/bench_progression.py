@@ -0,0 +1,40 @@
+"""Benchmark de concessões grandes de XP.
+
+Compara o laço antigo (um ``level_up`` por nível alcançado) com o salto direto
+de ``add_experience`` pela curva de XP, e mede ``award_experience`` para uma
+raid inteira.
+"""
+import timeit
+
+from src.systems.character.character import Character
+from src.systems.character.progression import award_experience
+
+GRANT = 1_000_000  # 1000 níveis de uma vez
+RAID_SIZE = 40
+REPEAT = 20
+
+
+def level_by_level(character: Character, amount: int) -> None:
+    """Comportamento anterior: um level_up por nível."""
+    character.experience += amount
+    while character.experience >= character.level * 1000:
+        character.level_up()
+
+
+def main() -> None:
+    loop = min(timeit.repeat(lambda: level_by_level(Character(name="Admin"), GRANT),
+                             number=REPEAT, repeat=3)) / REPEAT * 1e3
+    jump = min(timeit.repeat(lambda: Character(name="Admin").add_experience(GRANT),
+                             number=REPEAT, repeat=3)) / REPEAT * 1e3
+    print(f"Concessão de {GRANT} XP:")
+    print(f"  um nível por vez: {loop:8.3f} ms")
+    print(f"  salto direto:     {jump:8.3f} ms")
+
+    raid = [Character(name=f"Aventureiro {i}") for i in range(RAID_SIZE)]
+    award = min(timeit.repeat(lambda: award_experience(raid, 5000), number=REPEAT,
+                              repeat=3)) / REPEAT * 1e6
+    print(f"award_experience para {RAID_SIZE} personagens: {award:8.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
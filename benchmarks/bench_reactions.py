@@ -0,0 +1,55 @@
+"""Benchmark da busca de quem pode reagir a um gatilho.
+
+Numa batalha grande, só alguns combatentes ameaçam quem se move. Compara a
+varredura de todos os participantes com ``can_react_to`` com a consulta ao
+índice invertido de ``CombatRound.get_reactors``.
+"""
+import timeit
+
+from src.systems.character.character import Character
+from src.systems.combat.combat_round import CombatRound
+from src.systems.combat.combat_state import CombatState
+
+PARTY_SIZES = (100, 1000, 10_000)
+REACTORS = 4
+TRIGGER = "attack_of_opportunity"
+QUERIES = 200
+
+
+def build_round(count: int) -> CombatRound:
+    """Monta um round com ``count`` participantes, ``REACTORS`` deles ameaçando."""
+    participants = [Character(name=f"Combatente {i}", stats={"hp": 50}) for i in range(count)]
+    state = CombatState()
+    state.start_combat(participants)
+    combat_round = CombatRound(state)
+    combat_round.start_round()
+    for participant in participants[::count // REACTORS]:
+        combat_round.register_reaction_opportunity(participant, TRIGGER)
+    return combat_round
+
+
+def bench(count: int) -> tuple:
+    """Retorna (varredura, índice) em microssegundos por consulta."""
+    combat_round = build_round(count)
+    participants = combat_round.combat_state.participants
+
+    def scan() -> None:
+        [p for p in participants if combat_round.can_react_to(p, TRIGGER)]
+
+    def index() -> None:
+        combat_round.get_reactors(TRIGGER)
+
+    scan_time = min(timeit.repeat(scan, number=QUERIES, repeat=5)) / QUERIES * 1e6
+    index_time = min(timeit.repeat(index, number=QUERIES, repeat=5)) / QUERIES * 1e6
+    return scan_time, index_time
+
+
+def main() -> None:
+    for count in PARTY_SIZES:
+        scan_time, index_time = bench(count)
+        print(f"{count:>6} participantes: varredura {scan_time:10.1f} µs  "
+              f"índice {index_time:6.1f} µs")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Benchmark de memória das resistências de grupos grandes de monstros.
+
+Compara um dicionário de resistências por personagem (o modelo anterior) com
+perfis internados do ``DamageTypeManager``, em que todos os goblins do grupo
+compartilham o mesmo ``ResistanceProfile``.
+"""
+import timeit
+import tracemalloc
+
+from src.systems.combat.damage_type import DamageType, DamageTypeManager, ResistanceType
+
+GROUP_SIZE = 10_000
+GOBLIN = {
+    DamageType.POISON: ResistanceType.RESISTANT,
+    DamageType.NECROTIC: ResistanceType.RESISTANT,
+    DamageType.RADIANT: ResistanceType.VULNERABLE,
+}
+
+
+def measure(build) -> float:
+    """Retorna os bytes alocados por personagem pela função ``build``."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / GROUP_SIZE
+
+
+def per_character_dicts() -> dict:
+    return {key: dict(GOBLIN) for key in range(GROUP_SIZE)}
+
+
+def shared_profiles() -> DamageTypeManager:
+    manager = DamageTypeManager()
+    for key in range(GROUP_SIZE):
+        manager.set_profile(key, GOBLIN)
+    return manager
+
+
+def main() -> None:
+    dicts = measure(per_character_dicts)
+    profiles = measure(shared_profiles)
+    print(f"{GROUP_SIZE} goblins com {len(GOBLIN)} resistâncias")
+    print(f"  dicionário por personagem: {dicts:6.0f} bytes/personagem")
+    print(f"  perfil internado:          {profiles:6.0f} bytes/personagem")
+
+    manager = shared_profiles()
+    lookups = min(timeit.repeat(lambda: manager.get_all_resistances(7), number=100_000,
+                                repeat=5)) / 100_000 * 1e9
+    print(f"  get_all_resistances:       {lookups:6.0f} ns (sem alocação)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Benchmark do início de round em batalhas grandes.
+
+Executa 1000 rounds com 1000 participantes, em que só alguns agem por round.
+Compara o reset preguiçoso de ``CombatRound.start_round`` (a geração avança e
+os registros antigos são ignorados) com um reset que reconstrói o uso de ações
+de todos os participantes a cada round.
+"""
+import time
+
+from src.systems.character.character import Character
+from src.systems.combat.combat_round import ActionType, CombatRound
+from src.systems.combat.combat_state import CombatState
+
+PARTICIPANTS = 1000
+ROUNDS = 1000
+ACTORS_PER_ROUND = 10
+
+
+class EagerResetRound(CombatRound):
+    """Round de referência: zera o uso de todos os participantes a cada round."""
+
+    def reset_actions(self) -> None:
+        super().reset_actions()
+        stamp = self._stamp
+        self._usage = dict.fromkeys((p.id for p in self.combat_state.participants), stamp)
+
+
+def run(round_class: type) -> float:
+    """Retorna o tempo total, em milissegundos, de ``ROUNDS`` rounds."""
+    participants = [Character(name=f"Combatente {i}", stats={"hp": 50})
+                    for i in range(PARTICIPANTS)]
+    state = CombatState()
+    state.start_combat(participants)
+    combat_round = round_class(state)
+    start = time.perf_counter()
+    for number in range(ROUNDS):
+        combat_round.start_round()
+        offset = number * ACTORS_PER_ROUND % PARTICIPANTS
+        for participant in participants[offset:offset + ACTORS_PER_ROUND]:
+            combat_round.use_action(participant, ActionType.STANDARD)
+    return (time.perf_counter() - start) * 1e3
+
+
+def main() -> None:
+    eager = min(run(EagerResetRound) for _ in range(3))
+    lazy = min(run(CombatRound) for _ in range(3))
+    print(f"{ROUNDS} rounds x {PARTICIPANTS} participantes "
+          f"({ACTORS_PER_ROUND} agindo por round)")
+    print(f"  reset completo:    {eager:8.1f} ms")
+    print(f"  reset preguiçoso:  {lazy:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
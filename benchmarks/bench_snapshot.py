@@ -0,0 +1,49 @@
+"""Benchmark de snapshot, restauração e fork de combates.
+
+Meta: checkpoints abaixo de 1 ms para combates típicos (rollback de rede e
+busca da IA).
+"""
+import random
+import timeit
+
+from src.systems.character.character import Character
+from src.systems.combat.combat_round import CombatRound, ActionType
+from src.systems.combat.combat_state import CombatState
+from src.systems.combat.condition import Condition, ConditionType
+from src.systems.combat.damage_type import DamageType
+
+PARTICIPANT_COUNTS = (8, 32, 128)
+REPEAT = 1000
+
+
+def build_round(count: int) -> CombatRound:
+    """Monta um combate em andamento com condições, resistências e ações usadas."""
+    participants = [Character(name=f"Combatente {i}", stats={"hp": 50}) for i in range(count)]
+    state = CombatState(rng=random.Random(0))
+    state.start_combat(participants)
+    combat_round = CombatRound(state)
+    combat_round.start_round()
+    for index, participant in enumerate(participants):
+        state.damage_type_manager.add_resistance(participant, DamageType.FIRE)
+        state.condition_manager.add_condition(participant, Condition(ConditionType.POISONED, 3))
+        if index % 2:
+            combat_round.use_action(participant, ActionType.STANDARD)
+    return combat_round
+
+
+def main() -> None:
+    print(f"{'participantes':>14} {'snapshot µs':>12} {'restore µs':>11} {'fork µs':>9}")
+    for count in PARTICIPANT_COUNTS:
+        combat_round = build_round(count)
+        snapshot = combat_round.snapshot()
+        timings = [
+            timeit.timeit(combat_round.snapshot, number=REPEAT),
+            timeit.timeit(lambda: combat_round.restore(snapshot), number=REPEAT),
+            timeit.timeit(combat_round.fork, number=REPEAT),
+        ]
+        snapshot_us, restore_us, fork_us = (t / REPEAT * 1e6 for t in timings)
+        print(f"{count:>14} {snapshot_us:>12.1f} {restore_us:>11.1f} {fork_us:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark de resolução de efeitos de área.
+
+Compara o ``SpatialIndex`` com a varredura de todos os participantes para
+resolver uma bola de fogo (raio de 20 pés) numa batalha de 500 unidades, e
+mede o custo de mover unidades no índice.
+"""
+import random
+import timeit
+
+from src.systems.character.character import Character
+from src.systems.combat.spatial import SpatialIndex
+
+UNIT_COUNTS = (100, 500, 2000)
+MAP_SIZE = 500.0
+RADIUS = 20.0
+QUERIES = 2000
+
+
+def build(count: int, rng: random.Random):
+    """Espalha ``count`` unidades aleatoriamente pelo mapa."""
+    index = SpatialIndex()
+    positions = {}
+    for i in range(count):
+        character = Character(name=f"Unidade {i}")
+        x, y = rng.uniform(0, MAP_SIZE), rng.uniform(0, MAP_SIZE)
+        index.place(character, x, y)
+        positions[character] = (x, y)
+    return index, positions
+
+
+def linear_scan(positions, origin):
+    ox, oy = origin
+    limit = RADIUS * RADIUS
+    return [c for c, (x, y) in positions.items() if (x - ox) ** 2 + (y - oy) ** 2 <= limit]
+
+
+def main() -> None:
+    rng = random.Random(0)
+    print(f"{'unidades':>9} {'varredura µs':>13} {'índice µs':>10} {'mover ns':>9}")
+    for count in UNIT_COUNTS:
+        index, positions = build(count, rng)
+        origins = [(rng.uniform(0, MAP_SIZE), rng.uniform(0, MAP_SIZE)) for _ in range(QUERIES)]
+        for origin in origins[:50]:
+            assert {c.id for c in linear_scan(positions, origin)} == \
+                {c.id for c in index.query_radius(origin, RADIUS)}
+
+        scan = timeit.timeit(lambda: [linear_scan(positions, o) for o in origins], number=1)
+        grid = timeit.timeit(lambda: [index.query_radius(o, RADIUS) for o in origins], number=1)
+
+        units = list(positions)
+        moves = [(rng.choice(units), rng.uniform(0, MAP_SIZE), rng.uniform(0, MAP_SIZE))
+                 for _ in range(QUERIES)]
+        move = timeit.timeit(lambda: [index.place(c, x, y) for c, x, y in moves], number=1)
+        print(f"{count:>9} {scan / QUERIES * 1e6:>13.1f} {grid / QUERIES * 1e6:>10.1f} "
+              f"{move / QUERIES * 1e9:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
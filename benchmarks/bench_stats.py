@@ -0,0 +1,52 @@
+"""Benchmark dos atributos em camadas (``StatBlock``).
+
+Mede a leitura de atributos num laço de combate quente e o custo de adicionar
+e remover modificadores (buffs e condições) que tocam um único atributo.
+"""
+import timeit
+
+from src.systems.character.character import Character
+from src.systems.character.stats import ModifierLayer
+
+READS = 100_000
+MODIFIERS = 10_000
+
+
+def bench_reads() -> float:
+    """Retorna o tempo de ``READS`` leituras de atributos com modificadores, em ms."""
+    character = Character(name="Guerreiro")
+    character.add_modifier("armor_class", 2, ModifierLayer.EQUIPMENT)
+    character.add_modifier("strength", 0.2, ModifierLayer.EFFECTS, percentage=True)
+    stats = character.stats
+
+    def read() -> None:
+        for _ in range(READS):
+            stats["hp"]
+            stats["armor_class"]
+            stats["strength"]
+
+    return min(timeit.repeat(read, number=1, repeat=10)) * 1e3
+
+
+def bench_add_remove() -> float:
+    """Retorna o tempo para adicionar, ler e remover ``MODIFIERS`` modificadores, em ms."""
+    character = Character(name="Mago")
+    for stat in ("strength", "dexterity", "wisdom", "armor_class"):
+        character.add_modifier(stat, 1, ModifierLayer.EQUIPMENT)
+
+    def cycle() -> None:
+        for _ in range(MODIFIERS):
+            token = character.add_modifier("strength", 0.1, ModifierLayer.EFFECTS, True)
+            character.stats["strength"]
+            character.remove_modifier(token)
+
+    return min(timeit.repeat(cycle, number=1, repeat=10)) * 1e3
+
+
+def main() -> None:
+    print(f"{READS} x 3 leituras:              {bench_reads():8.2f} ms")
+    print(f"{MODIFIERS} ciclos de modificador:  {bench_add_remove():8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
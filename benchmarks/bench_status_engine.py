@@ -0,0 +1,52 @@
+"""Benchmark do tick de efeitos de status do mundo inteiro.
+
+Compara 10 mil ``StatusEffectManager`` (um por personagem, cada um com o
+veneno padrão) atualizados um a um com um único ``StatusEngine``, que avança
+os mesmos efeitos numa passada vetorizada.
+"""
+import time
+
+from src.systems.character.status_effect import EFFECT_TEMPLATES, StatusEffectManager
+from src.systems.character.status_engine import StatusEngine
+
+CHARACTERS = 10_000
+TICKS = 3
+
+
+def per_manager() -> float:
+    """Milissegundos por tick do mundo com um gerenciador por personagem."""
+    managers = [StatusEffectManager() for _ in range(CHARACTERS)]
+    for manager in managers:
+        manager.apply_effect("envenenado", {})
+        manager.extend_duration("envenenado", 100)  # dura os três ticks medidos
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        {index: manager.update_effects({}) for index, manager in enumerate(managers)}
+    return (time.perf_counter() - start) / TICKS * 1e3
+
+
+def world_engine(as_dict: bool) -> float:
+    """Milissegundos por tick do mundo com o StatusEngine (e, opcionalmente, ``as_dict``)."""
+    engine = StatusEngine()
+    poison = EFFECT_TEMPLATES["envenenado"]
+    for index in range(CHARACTERS):
+        # Duração longa para os três ticks medidos
+        engine.add_effect(index, poison.name, 100, poison.tick_amounts)
+    engine.get_effects(0)  # monta as colunas fora da medição
+    start = time.perf_counter()
+    for _ in range(TICKS):
+        tick = engine.tick()
+        if as_dict:
+            tick.as_dict()
+    return (time.perf_counter() - start) / TICKS * 1e3
+
+
+def main() -> None:
+    print(f"Tick do mundo com {CHARACTERS} personagens envenenados:")
+    print(f"  um gerenciador por personagem: {per_manager():8.2f} ms")
+    print(f"  StatusEngine (arrays):         {world_engine(False):8.2f} ms")
+    print(f"  StatusEngine + as_dict:        {world_engine(True):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Benchmark de memória e criação de ``StatusEffectManager``.
+
+Compara uma cópia do catálogo de efeitos por alvo (o modelo anterior, em que
+cada gerenciador registrava os efeitos padrão) com o catálogo global de
+modelos, em que cada alvo guarda só as instâncias dos efeitos aplicados.
+"""
+import dataclasses
+import timeit
+import tracemalloc
+
+from src.systems.character.status_effect import EFFECT_TEMPLATES, StatusEffectManager
+
+CHARACTERS = 10_000
+
+
+def measure(build) -> float:
+    """Retorna os bytes alocados por personagem pela função ``build``."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return (after - before) / CHARACTERS
+
+
+def copied_catalog() -> list:
+    return [{name: dataclasses.replace(template) for name, template in EFFECT_TEMPLATES.items()}
+            for _ in range(CHARACTERS)]
+
+
+def shared_templates() -> list:
+    managers = [StatusEffectManager() for _ in range(CHARACTERS)]
+    for manager in managers:
+        manager.apply_effect("envenenado", {})
+    return managers
+
+
+def main() -> None:
+    copied = measure(copied_catalog)
+    shared = measure(shared_templates)
+    print(f"{CHARACTERS} personagens, um efeito aplicado:")
+    print(f"  catálogo copiado por alvo: {copied:6.0f} bytes/personagem")
+    print(f"  modelos compartilhados:    {shared:6.0f} bytes/personagem")
+
+    creation = min(timeit.repeat(StatusEffectManager, number=100_000, repeat=5)) / 100_000 * 1e9
+    print(f"  StatusEffectManager():     {creation:6.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+from typing import Any, Dict, List, Optional, Set, FrozenSet, Mapping, AbstractSet, Iterable, Tuple
+from typing import TYPE_CHECKING, TypeVar
+from bisect import bisect_right
+
+if TYPE_CHECKING:
+    from .ability_system import Ability
+
+# Valor de um atributo ausente: não cumpre nenhuma exigência
+_MISSING = float('-inf')
+_K = TypeVar('_K')
+_V = TypeVar('_V')
+
+def find_cycle(prerequisites: Mapping[str, AbstractSet[str]], name: str,
+               new_prerequisites: Iterable[str]) -> Optional[List[str]]:
+    """Ciclo criado ao dar ``new_prerequisites`` a ``name``, se houver.
+
+    Retorna o caminho ``[name, ..., name]`` em que cada habilidade exige a
+    seguinte, ou None.
+    """
+    parents: Dict[str, str] = {}
+    stack = []
+    for prereq in new_prerequisites:
+        if prereq not in parents:
+            parents[prereq] = name
+            stack.append(prereq)
+    while stack:
+        current = stack.pop()
+        if current == name:
+            path = [name]
+            node = parents[name]
+            while node != name:
+                path.append(node)
+                node = parents[node]
+            path.append(name)
+            return path[::-1]
+        for prereq in prerequisites.get(current, ()):
+            if prereq not in parents:
+                parents[prereq] = current
+                stack.append(prereq)
+    return None
+
+class VersionedDict(Dict[_K, _V]):
+    """Dicionário que conta as próprias edições em ``version``.
+
+    Permite que caches (o grafo de uma árvore, os conjuntos de habilidades
+    aprendíveis) saibam que ficaram velhos sem comparar o conteúdo a cada
+    consulta.
+    """
+    __slots__ = ('version',)
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__()
+        self.version = 0
+        self.update(*args, **kwargs)
+
+    def __setitem__(self, key: _K, value: _V) -> None:
+        super().__setitem__(key, value)
+        self.version += 1
+
+    def __delitem__(self, key: _K) -> None:
+        super().__delitem__(key)
+        self.version += 1
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        for key, value in dict(*args, **kwargs).items():
+            self[key] = value
+
+    def setdefault(self, key: _K, default: _V) -> _V:
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def pop(self, key: _K, *default: Any) -> Any:
+        self.version += 1
+        return super().pop(key, *default)
+
+    def popitem(self) -> Tuple[_K, _V]:
+        self.version += 1
+        return super().popitem()
+
+    def clear(self) -> None:
+        super().clear()
+        self.version += 1
+
+class PrerequisiteMap(VersionedDict[str, FrozenSet[str]]):
+    """Pré-requisitos de uma árvore, guardados como ``frozenset``."""
+    __slots__ = ()
+
+    def __setitem__(self, name: str, prerequisites: Iterable[str]) -> None:
+        super().__setitem__(name, frozenset(prerequisites))
+
+class PrerequisiteGraph:
+    """DAG compilado dos pré-requisitos de uma ``AbilityTree``.
+
+    Guarda as habilidades em ordem topológica (pré-requisitos primeiro), os
+    dependentes de cada habilidade e as exigências de nível e de atributo
+    ordenadas, para que o ``LearnableSet`` reavalie só as habilidades afetadas
+    por uma mudança. Pré-requisitos de fora da árvore (habilidades aprendidas
+    em outras árvores) são aceitos, mas não entram na ordem.
+    """
+    __slots__ = ('order', 'prerequisites', 'dependents', 'requirements', '_levels',
+                 '_level_names', '_attributes')
+
+    def __init__(self, abilities: Mapping[str, 'Ability'],
+                 prerequisites: Mapping[str, AbstractSet[str]]):
+        self.prerequisites: Dict[str, FrozenSet[str]] = {
+            name: frozenset(prerequisites.get(name, ())) for name in abilities
+        }
+        self.dependents: Dict[str, List[str]] = {}
+        for name, prereqs in self.prerequisites.items():
+            for prereq in prereqs:
+                self.dependents.setdefault(prereq, []).append(name)
+        self.order = self._topological_order()
+        self.requirements = {name: ability.requirements for name, ability in abilities.items()}
+
+        # Exigências em ordem crescente: (valor exigido, habilidade)
+        by_level = sorted((req.level, name) for name, req in self.requirements.items())
+        self._levels = [level for level, _ in by_level]
+        self._level_names = [name for _, name in by_level]
+        by_attribute: Dict[str, List[Tuple[int, str]]] = {}
+        for name, req in self.requirements.items():
+            for attr, value in req.attributes.items():
+                by_attribute.setdefault(attr, []).append((value, name))
+        self._attributes: Dict[str, Tuple[List[int], List[str]]] = {}
+        for attr, entries in by_attribute.items():
+            entries.sort()
+            self._attributes[attr] = ([value for value, _ in entries],
+                                      [name for _, name in entries])
+
+    def __len__(self) -> int:
+        return len(self.prerequisites)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.prerequisites
+
+    def unmet(self, name: str, learned: AbstractSet[str], level: int,
+              attributes: Mapping[str, int]) -> int:
+        """Quantos requisitos de ``name`` ainda não são cumpridos."""
+        req = self.requirements[name]
+        missing = sum(prereq not in learned for prereq in self.prerequisites[name])
+        missing += level < req.level
+        missing += sum(attributes.get(attr, _MISSING) < value
+                       for attr, value in req.attributes.items())
+        return missing
+
+    def level_changes(self, old: int, new: int) -> List[str]:
+        """Habilidades cuja exigência de nível muda de estado entre ``old`` e ``new``."""
+        low, high = sorted((old, new))
+        levels = self._levels
+        return self._level_names[bisect_right(levels, low):bisect_right(levels, high)]
+
+    def attribute_changes(self, attr: str, old: float, new: float) -> List[str]:
+        """Habilidades cuja exigência de ``attr`` muda de estado entre ``old`` e ``new``."""
+        entries = self._attributes.get(attr)
+        if entries is None:
+            return []
+        values, names = entries
+        low, high = sorted((old, new))
+        return names[bisect_right(values, low):bisect_right(values, high)]
+
+    def _topological_order(self) -> Tuple[str, ...]:
+        """Ordem de Kahn; um ciclo gera ``ValueError`` com o caminho encontrado."""
+        pending = {name: sum(prereq in self.prerequisites for prereq in prereqs)
+                   for name, prereqs in self.prerequisites.items()}
+        ready = [name for name, count in pending.items() if not count]
+        order = []
+        while ready:
+            name = ready.pop()
+            order.append(name)
+            for dependent in self.dependents.get(name, ()):
+                pending[dependent] -= 1
+                if not pending[dependent]:
+                    ready.append(dependent)
+        if len(order) < len(pending):
+            # Toda habilidade restante tem um pré-requisito restante: seguindo-os, acha-se o ciclo
+            node = next(name for name, count in pending.items() if count)
+            path: List[str] = []
+            seen: Dict[str, int] = {}
+            while node not in seen:
+                seen[node] = len(path)
+                path.append(node)
+                node = next(prereq for prereq in self.prerequisites[node] if pending.get(prereq))
+            cycle = path[seen[node]:] + [node]
+            raise ValueError(f"Ciclo de pré-requisitos: {' -> '.join(cycle)}")
+        return tuple(order)
+
+class LearnableSet:
+    """Habilidades de uma árvore que podem ser aprendidas, mantidas incrementalmente.
+
+    Cada habilidade conta os requisitos que ainda faltam (pré-requisitos não
+    aprendidos, nível e cada atributo abaixo do exigido). ``learn`` e
+    ``update`` só recontam as habilidades afetadas pela mudança, então
+    consultar a árvore inteira custa O(mudanças), não O(árvore).
+    """
+
+    def __init__(self, graph: PrerequisiteGraph, learned: Iterable[str],
+                 level: int, attributes: Mapping[str, int], version: int = 0):
+        self.graph = graph
+        # Versão das habilidades aprendidas que o conjunto reflete
+        self.version = version
+        self.level = level
+        self.attributes = dict(attributes)
+        self.learned: Set[str] = set(learned)
+        self._unmet: Dict[str, int] = {}
+        self._learnable: Set[str] = set()
+        for name in graph.order:
+            unmet = self._unmet[name] = graph.unmet(name, self.learned, level, attributes)
+            if not unmet and name not in self.learned:
+                self._learnable.add(name)
+        self._frozen: Optional[FrozenSet[str]] = None
+
+    @property
+    def abilities(self) -> FrozenSet[str]:
+        """Habilidades ainda não aprendidas cujos requisitos estão todos cumpridos."""
+        if self._frozen is None:
+            self._frozen = frozenset(self._learnable)
+        return self._frozen
+
+    def meets_requirements(self, name: str) -> bool:
+        """Verifica se todos os requisitos de ``name`` estão cumpridos (aprendida ou não)."""
+        return self._unmet.get(name) == 0
+
+    def learn(self, name: str) -> None:
+        """Registra uma habilidade aprendida (de qualquer árvore)."""
+        if name in self.learned:
+            return
+        self.learned.add(name)
+        if name in self._learnable:
+            self._learnable.discard(name)
+            self._frozen = None
+        for dependent in self.graph.dependents.get(name, ()):
+            self._adjust(dependent, -1)
+
+    def update(self, level: int, attributes: Mapping[str, int]) -> None:
+        """Atualiza nível e atributos, recontando só as exigências que mudaram de estado."""
+        graph = self.graph
+        if level != self.level:
+            delta = -1 if level > self.level else 1
+            for name in graph.level_changes(self.level, level):
+                self._adjust(name, delta)
+            self.level = level
+        current = self.attributes
+        if attributes == current:
+            return
+        for attr in current.keys() | attributes.keys():
+            old, new = current.get(attr, _MISSING), attributes.get(attr, _MISSING)
+            if old == new:
+                continue
+            delta = -1 if new > old else 1
+            for name in graph.attribute_changes(attr, old, new):
+                self._adjust(name, delta)
+        self.attributes = dict(attributes)
+
+    def _adjust(self, name: str, delta: int) -> None:
+        unmet = self._unmet[name] = self._unmet[name] + delta
+        learnable = not unmet and name not in self.learned
+        if learnable != (name in self._learnable):
+            if learnable:
+                self._learnable.add(name)
+            else:
+                self._learnable.discard(name)
+            self._frozen = None
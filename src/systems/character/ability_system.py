@@ -1,8 +1,11 @@
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, FrozenSet, Iterable, Tuple
 from dataclasses import dataclass, field
 from enum import Enum, auto
 from ..combat.damage_type import DamageType
-from ..combat.ability_effect import AbilityEffect
+from ..combat.ability_effect import AbilityEffect, EffectDuration, EffectTarget, EffectType
+from .ability_graph import (
+    LearnableSet, PrerequisiteGraph, PrerequisiteMap, VersionedDict, find_cycle
+)
 
 class AbilityType(Enum):
     PASSIVE = auto()    # Habilidades passivas
@@ -53,19 +56,65 @@ class AbilityTree:
     """Representa uma árvore de habilidades."""
     name: str
     description: str
-    abilities: Dict[str, Ability] = field(default_factory=dict)
-    prerequisites: Dict[str, Set[str]] = field(default_factory=dict)
+    abilities: VersionedDict[str, Ability] = field(default_factory=VersionedDict)
+    prerequisites: PrerequisiteMap = field(default_factory=PrerequisiteMap)
+    _graph: Optional[PrerequisiteGraph] = field(default=None, init=False, repr=False,
+                                                compare=False)
+    # Versões de ``abilities`` e ``prerequisites`` usadas para compilar o grafo
+    _graph_version: Tuple[int, int] = field(default=(-1, -1), init=False, repr=False,
+                                            compare=False)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        if name == 'prerequisites' and not isinstance(value, PrerequisiteMap):
+            value = PrerequisiteMap(value)
+        elif name == 'abilities' and not isinstance(value, VersionedDict):
+            value = VersionedDict(value)
+        if name in ('abilities', 'prerequisites'):
+            super().__setattr__('_graph', None)
+        super().__setattr__(name, value)
+
+    def add_ability(self, name: str, ability: Ability,
+                    prerequisites: Optional[Iterable[str]] = None) -> None:
+        """Adiciona uma habilidade; pré-requisitos que formem um ciclo geram ``ValueError``."""
+        if prerequisites:
+            cycle = find_cycle(self.prerequisites, name, prerequisites)
+            if cycle:
+                raise ValueError(f"Ciclo de pré-requisitos: {' -> '.join(cycle)}")
+        self.abilities[name] = ability
+        if prerequisites:
+            self.prerequisites[name] = prerequisites
+        self._graph = None
+
+    @property
+    def graph(self) -> PrerequisiteGraph:
+        """DAG compilado dos pré-requisitos; um ciclo gera ``ValueError``.
+
+        Recompilado após ``add_ability`` ou edições diretas em ``abilities`` e
+        ``prerequisites``.
+        """
+        version = (self.abilities.version, self.prerequisites.version)
+        if self._graph is None or self._graph_version != version:
+            self._graph = PrerequisiteGraph(self.abilities, self.prerequisites)
+            self._graph_version = version
+        return self._graph
 
 @dataclass
 class AbilitySystem:
     """Sistema de gerenciamento de habilidades."""
     trees: Dict[str, AbilityTree] = field(default_factory=dict)
-    learned_abilities: Dict[str, Ability] = field(default_factory=dict)
+    learned_abilities: VersionedDict[str, Ability] = field(default_factory=VersionedDict)
+    # Habilidades aprendíveis de cada árvore, mantidas incrementalmente
+    _learnable: Dict[str, LearnableSet] = field(default_factory=dict, repr=False)
+
+    def __setattr__(self, name: str, value: object) -> None:
+        if name == 'learned_abilities' and not isinstance(value, VersionedDict):
+            value = VersionedDict(value)
+        super().__setattr__(name, value)
     
-    def __post_init__(self):
+    def __post_init__(self) -> None:
         self._initialize_default_content()
     
-    def _initialize_default_content(self):
+    def _initialize_default_content(self) -> None:
         """Inicializa o conteúdo padrão do sistema."""
         # Árvore de Combate
         combat_tree = AbilityTree(
@@ -74,23 +123,31 @@ class AbilitySystem:
         )
         
         # Adiciona habilidades básicas de combate
+        precise_strike = AbilityEffect(EffectType.DAMAGE, EffectTarget(), EffectDuration())
+        precise_strike.add_damage(DamageType.SLASHING, 6)
         combat_tree.abilities["golpe_preciso"] = Ability(
             "Golpe Preciso",
             "Um ataque preciso que causa dano adicional.",
             AbilityType.ACTIVE,
             AbilityCost(AbilityResource.STAMINA, 10),
             AbilityRequirement(level=1),
-            effects=[AbilityEffect("damage", {"physical": 6})],
+            effects=[precise_strike],
             cooldown=2
         )
         
+        defensive_stance = AbilityEffect(
+            EffectType.BUFF,
+            EffectTarget(single_target=False, self_target=True, affects_enemies=False),
+            EffectDuration(instant=False, turns=3)
+        )
+        defensive_stance.add_stat_modifier("defense", 3)
         combat_tree.abilities["postura_defensiva"] = Ability(
             "Postura Defensiva",
             "Assume uma postura defensiva, aumentando a defesa.",
             AbilityType.ACTIVE,
             AbilityCost(AbilityResource.STAMINA, 15),
             AbilityRequirement(level=2),
-            effects=[AbilityEffect("buff", {"defense": 3, "duration": 3})],
+            effects=[defensive_stance],
             cooldown=4
         )
         
@@ -102,13 +159,19 @@ class AbilitySystem:
             "Habilidades de suporte e utilidade geral"
         )
         
+        first_aid = AbilityEffect(
+            EffectType.HEAL,
+            EffectTarget(affects_allies=True, affects_enemies=False),
+            EffectDuration()
+        )
+        first_aid.set_custom_effect(lambda character: character.heal(5))
         utility_tree.abilities["primeiros_socorros"] = Ability(
             "Primeiros Socorros",
             "Cura ferimentos leves.",
             AbilityType.ACTIVE,
             AbilityCost(AbilityResource.NONE),
             AbilityRequirement(level=1),
-            effects=[AbilityEffect("heal", {"amount": 5})],
+            effects=[first_aid],
             cooldown=6
         )
         
@@ -117,50 +180,37 @@ class AbilitySystem:
     def add_ability_tree(self, name: str, description: str) -> None:
         """Adiciona uma nova árvore de habilidades."""
         self.trees[name] = AbilityTree(name, description)
+        self._learnable.pop(name, None)
     
     def add_ability(self, tree_name: str, ability: Ability,
-                    prerequisites: Set[str] = None) -> bool:
-        """Adiciona uma nova habilidade a uma árvore."""
+                    prerequisites: Optional[Iterable[str]] = None) -> bool:
+        """Adiciona uma nova habilidade a uma árvore.
+
+        Pré-requisitos que formem um ciclo na árvore geram ``ValueError``.
+        """
         if tree_name not in self.trees:
             return False
         
-        tree = self.trees[tree_name]
-        tree.abilities[ability.name] = ability
-        if prerequisites:
-            tree.prerequisites[ability.name] = prerequisites
-        
+        self.trees[tree_name].add_ability(ability.name, ability, prerequisites)
         return True
     
     def can_learn_ability(self, tree_name: str, ability_name: str,
                          character_level: int,
                          character_attributes: Dict[str, int]) -> bool:
         """Verifica se uma habilidade pode ser aprendida."""
-        if tree_name not in self.trees:
-            return False
-        
-        tree = self.trees[tree_name]
-        if ability_name not in tree.abilities:
-            return False
-        
-        ability = tree.abilities[ability_name]
-        
-        # Verifica nível
-        if character_level < ability.requirements.level:
-            return False
-        
-        # Verifica atributos
-        for attr, required_value in ability.requirements.attributes.items():
-            if attr not in character_attributes or \
-               character_attributes[attr] < required_value:
-                return False
-        
-        # Verifica pré-requisitos
-        if ability_name in tree.prerequisites:
-            for prereq in tree.prerequisites[ability_name]:
-                if prereq not in self.learned_abilities:
-                    return False
-        
-        return True
+        learnable = self._learnable_set(tree_name, character_level, character_attributes)
+        return learnable is not None and learnable.meets_requirements(ability_name)
+    
+    def get_learnable_abilities(self, tree_name: str, character_level: int,
+                                character_attributes: Dict[str, int]) -> FrozenSet[str]:
+        """Habilidades da árvore ainda não aprendidas que já podem ser aprendidas.
+
+        O conjunto é mantido entre as chamadas: só as habilidades afetadas por
+        uma habilidade aprendida ou por mudanças de nível e atributos são
+        reavaliadas.
+        """
+        learnable = self._learnable_set(tree_name, character_level, character_attributes)
+        return learnable.abilities if learnable is not None else frozenset()
     
     def learn_ability(self, tree_name: str, ability_name: str,
                       character_level: int,
@@ -171,9 +221,33 @@ class AbilitySystem:
             return False
         
         ability = self.trees[tree_name].abilities[ability_name]
-        self.learned_abilities[ability_name] = ability
+        learned = self.learned_abilities
+        learned[ability_name] = ability
+        for learnable in self._learnable.values():
+            if learnable.version == learned.version - 1:
+                learnable.learn(ability_name)
+                learnable.version = learned.version
         return True
     
+    def _learnable_set(self, tree_name: str, character_level: int,
+                       character_attributes: Dict[str, int]) -> Optional[LearnableSet]:
+        """``LearnableSet`` da árvore, atualizado para o nível e os atributos dados."""
+        tree = self.trees.get(tree_name)
+        if tree is None:
+            return None
+        graph = tree.graph
+        learnable = self._learnable.get(tree_name)
+        learned = self.learned_abilities
+        # Árvore recompilada ou habilidades aprendidas fora de learn_ability: recria
+        if (learnable is None or learnable.graph is not graph
+                or learnable.version != learned.version):
+            learnable = self._learnable[tree_name] = LearnableSet(
+                graph, learned, character_level, character_attributes, learned.version
+            )
+        else:
+            learnable.update(character_level, character_attributes)
+        return learnable
+    
     def can_use_ability(self, ability_name: str,
                         current_resources: Dict[AbilityResource, int]) -> bool:
         """Verifica se uma habilidade pode ser usada."""
@@ -1,18 +1,29 @@
-from typing import Dict, Any, Optional
-from dataclasses import dataclass, field
+from typing import Dict, Any, ClassVar, Mapping, Optional, Union
+from dataclasses import dataclass, field, replace
+from itertools import count
+from .stats import ModifierLayer, Number, StatBlock
+from .progression import DEFAULT_XP_CURVE, LevelChange, XPCurve, apply_experience, apply_levels
 
-@dataclass
+# Gerador de IDs estáveis (únicos dentro do processo)
+_next_character_id = count(1).__next__
+
+# Igualdade por identidade: personagens são chaves dos gerenciadores de combate
+@dataclass(eq=False)
 class Character:
     name: str
-    stats: Dict[str, int] = field(default_factory=dict)
+    # Dicionários comuns são convertidos em StatBlock em __post_init__
+    stats: StatBlock = field(default_factory=StatBlock)
     level: int = 1
     experience: int = 0
     inventory: Dict[str, Any] = field(default_factory=dict)
     equipment: Dict[str, Any] = field(default_factory=dict)
     abilities: Dict[str, Any] = field(default_factory=dict)
     status_effects: Dict[str, Any] = field(default_factory=dict)
+    id: int = field(default_factory=_next_character_id)
+    # Curva de XP e ganhos por nível (configurável por subclasse)
+    xp_curve: ClassVar[XPCurve] = DEFAULT_XP_CURVE
     
-    def __post_init__(self):
+    def __post_init__(self) -> None:
         # Inicializa stats padrão se não fornecidos
         default_stats = {
             'strength': 10,
@@ -28,16 +39,50 @@ class Character:
             'armor_class': 10,
             'initiative_bonus': 0
         }
+        stats: Mapping[str, Number] = self.stats
+        block = stats if isinstance(stats, StatBlock) else StatBlock(stats)
         for stat, value in default_stats.items():
-            if stat not in self.stats:
-                self.stats[stat] = value
+            if stat not in block:
+                block[stat] = value
+        self.stats = block
+    
+    def clone(self) -> 'Character':
+        """Cópia com o mesmo ID e atributos próprios; inventário, equipamento,
+        habilidades e efeitos são compartilhados com o original."""
+        return replace(self, stats=self.stats.copy())
     
     def modify_stat(self, stat: str, amount: int) -> None:
-        """Modifica um atributo do personagem."""
+        """Modifica permanentemente o valor base de um atributo."""
         if stat in self.stats:
-            self.stats[stat] += amount
+            self.stats[stat] = self.stats.base[stat] + amount
+    
+    def add_modifier(self, stat: str, value: int,
+                     layer: ModifierLayer = ModifierLayer.EFFECTS,
+                     percentage: bool = False) -> int:
+        """Adiciona um modificador temporário; retorna o token para removê-lo."""
+        return self.stats.add_modifier(stat, value, layer, percentage)
+    
+    def remove_modifier(self, token: int) -> bool:
+        """Remove um modificador adicionado por ``add_modifier``."""
+        return self.stats.remove_modifier(token)
+    
+    def clear_modifiers(self, layer: ModifierLayer) -> int:
+        """Remove todos os modificadores de uma camada."""
+        return self.stats.clear_layer(layer)
+    
+    def get_base_stat(self, stat: str) -> Optional[Number]:
+        """Retorna o valor base de um atributo, sem modificadores."""
+        return self.stats.base.get(stat)
     
-    def get_stat(self, stat: str) -> Optional[int]:
+    def snapshot_stats(self) -> tuple:
+        """Valores base e modificadores como tuplas imutáveis."""
+        return self.stats.snapshot()
+    
+    def restore_stats(self, snapshot: tuple) -> None:
+        """Restaura atributos capturados por ``snapshot_stats``."""
+        self.stats.restore(snapshot)
+    
+    def get_stat(self, stat: str) -> Optional[Number]:
         """Retorna o valor de um atributo."""
         return self.stats.get(stat)
     
@@ -47,42 +92,30 @@ class Character:
     
     def heal(self, amount: int) -> None:
         """Cura o personagem."""
-        self.stats['hp'] = min(self.stats['hp'] + amount, self.stats['max_hp'])
+        self.stats['hp'] = min(self.stats.base['hp'] + amount, self.stats['max_hp'])
     
     def take_damage(self, amount: int) -> None:
         """Causa dano ao personagem."""
-        self.stats['hp'] = max(0, self.stats['hp'] - amount)
+        self.stats['hp'] = max(0, self.stats.base['hp'] - amount)
     
     def restore_mana(self, amount: int) -> None:
         """Restaura mana do personagem."""
-        self.stats['mp'] = min(self.stats['mp'] + amount, self.stats['max_mp'])
+        self.stats['mp'] = min(self.stats.base['mp'] + amount, self.stats['max_mp'])
     
     def use_mana(self, amount: int) -> bool:
         """Tenta usar mana. Retorna True se sucesso."""
         if self.stats['mp'] >= amount:
-            self.stats['mp'] -= amount
+            self.stats['mp'] = self.stats.base['mp'] - amount
             return True
         return False
     
-    def add_experience(self, amount: int) -> None:
-        """Adiciona experiência ao personagem."""
-        self.experience += amount
-        self._check_level_up()
-    
-    def _check_level_up(self) -> None:
-        """Verifica se o personagem pode subir de nível."""
-        # Implementação básica: 1000 XP por nível
-        while self.experience >= self.level * 1000:
-            self.level_up()
+    def add_experience(self, amount: int) -> Optional[LevelChange]:
+        """Adiciona experiência; sobe todos os níveis alcançados de uma vez."""
+        return apply_experience(self, amount)
     
-    def level_up(self) -> None:
+    def level_up(self) -> LevelChange:
         """Aumenta o nível do personagem."""
-        self.level += 1
-        # Aumenta stats base
-        self.stats['max_hp'] += 5
-        self.stats['hp'] = self.stats['max_hp']
-        self.stats['max_mp'] += 3
-        self.stats['mp'] = self.stats['max_mp']
+        return apply_levels(self, 1)
     
     def equip_item(self, slot: str, item: Any) -> bool:
         """Equipa um item em um slot."""
@@ -135,4 +168,13 @@ class Character:
     
     def has_status_effect(self, effect_name: str) -> bool:
         """Verifica se tem um efeito de status."""
-        return effect_name in self.status_effects
\ No newline at end of file
+        return effect_name in self.status_effects
+
+# Referência aceita pelos gerenciadores: o personagem ou o seu ID
+CharacterRef = Union[Character, int]
+
+def character_id(character: CharacterRef) -> int:
+    """Retorna o ID de um personagem, aceitando também um ID já numérico."""
+    if isinstance(character, int):
+        return character
+    return character.id
@@ -0,0 +1,338 @@
+from typing import Dict, Any, Optional, Iterator, MutableMapping
+from array import array
+from enum import IntEnum
+from .character import Character, _next_character_id
+from .progression import DEFAULT_XP_CURVE, LevelChange, apply_experience, apply_levels
+from .stats import ModifierLayer, StatBlock, StatModifier
+
+class CoreStat(IntEnum):
+    """Posição de cada atributo básico no array de atributos."""
+    STRENGTH = 0
+    DEXTERITY = 1
+    CONSTITUTION = 2
+    INTELLIGENCE = 3
+    WISDOM = 4
+    CHARISMA = 5
+    HP = 6
+    MAX_HP = 7
+    MP = 8
+    MAX_MP = 9
+    ARMOR_CLASS = 10
+    INITIATIVE_BONUS = 11
+
+CORE_STAT_INDEX: Dict[str, int] = {stat.name.lower(): stat.value for stat in CoreStat}
+
+# Mesmos valores padrão de Character
+_DEFAULT_CORE_STATS = array('i', [10, 10, 10, 10, 10, 10, 10, 10, 10, 10, 10, 0])
+
+_HP = CoreStat.HP.value
+_MAX_HP = CoreStat.MAX_HP.value
+_MP = CoreStat.MP.value
+_MAX_MP = CoreStat.MAX_MP.value
+
+class CompactStats(MutableMapping):
+    """Visão de dicionário sobre os atributos de um CompactCharacter."""
+    __slots__ = ('_owner',)
+
+    def __init__(self, owner: 'CompactCharacter'):
+        self._owner = owner
+
+    def __getitem__(self, stat: str) -> int:
+        index = CORE_STAT_INDEX.get(stat)
+        if index is not None:
+            return self._owner._core[index]
+        extra = self._owner._extra
+        if extra is None:
+            raise KeyError(stat)
+        return extra[stat]
+
+    def __setitem__(self, stat: str, value: int) -> None:
+        index = CORE_STAT_INDEX.get(stat)
+        if index is not None:
+            self._owner._core[index] = value
+            return
+        if self._owner._extra is None:
+            self._owner._extra = {}
+        self._owner._extra[stat] = value
+
+    def __delitem__(self, stat: str) -> None:
+        if stat in CORE_STAT_INDEX:
+            raise KeyError(f"Atributo básico não pode ser removido: {stat}")
+        if self._owner._extra is None:
+            raise KeyError(stat)
+        del self._owner._extra[stat]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from CORE_STAT_INDEX
+        if self._owner._extra:
+            yield from self._owner._extra
+
+    def __len__(self) -> int:
+        return len(CORE_STAT_INDEX) + len(self._owner._extra or ())
+
+class CompactCharacter:
+    """Variante compacta de Character para grandes quantidades de NPCs.
+
+    Os atributos básicos ficam num ``array('i')`` indexado por ``CoreStat``;
+    atributos extras e os dicionários de inventário, equipamento, habilidades
+    e efeitos só são alocados quando usados. Modificadores temporários (só
+    fixos) são somados diretamente aos valores e registrados por token.
+    """
+    __slots__ = ('name', 'level', 'experience', 'id', '_core', '_extra', '_modifiers',
+                 '_next_token', '_inventory', '_equipment', '_abilities', '_status_effects')
+    xp_curve = DEFAULT_XP_CURVE
+
+    def __init__(self, name: str, stats: Optional[Dict[str, int]] = None,
+                 level: int = 1, experience: int = 0):
+        self.name = name
+        self.level = level
+        self.experience = experience
+        self.id = _next_character_id()
+        self._core = array('i', _DEFAULT_CORE_STATS)
+        self._extra: Optional[Dict[str, int]] = None
+        self._modifiers: Optional[Dict[int, StatModifier]] = None
+        # Tokens nunca são reaproveitados, nem depois de remover o último
+        self._next_token = 1
+        self._inventory: Optional[Dict[str, Any]] = None
+        self._equipment: Optional[Dict[str, Any]] = None
+        self._abilities: Optional[Dict[str, Any]] = None
+        self._status_effects: Optional[Dict[str, Any]] = None
+        if stats:
+            self.stats.update(stats)
+
+    @classmethod
+    def from_character(cls, character: Character) -> 'CompactCharacter':
+        """Cria uma versão compacta de um Character (mantendo o mesmo ID)."""
+        stats = {stat: int(value) for stat, value in character.stats.items()}
+        compact = cls(character.name, stats, character.level, character.experience)
+        compact.id = character.id
+        compact._inventory = dict(character.inventory) or None
+        compact._equipment = dict(character.equipment) or None
+        compact._abilities = dict(character.abilities) or None
+        compact._status_effects = dict(character.status_effects) or None
+        return compact
+
+    def to_character(self) -> Character:
+        """Converte de volta para Character (mantendo o mesmo ID)."""
+        return Character(
+            name=self.name,
+            stats=StatBlock(self.stats),
+            level=self.level,
+            experience=self.experience,
+            inventory=dict(self.inventory),
+            equipment=dict(self.equipment),
+            abilities=dict(self.abilities),
+            status_effects=dict(self.status_effects),
+            id=self.id
+        )
+
+    def clone(self) -> 'CompactCharacter':
+        """Cópia com o mesmo ID e atributos próprios; os demais dicionários são
+        compartilhados com o original."""
+        clone = CompactCharacter.__new__(CompactCharacter)
+        clone.name = self.name
+        clone.level = self.level
+        clone.experience = self.experience
+        clone.id = self.id
+        clone._core = array('i', self._core)
+        clone._extra = dict(self._extra) if self._extra is not None else None
+        clone._modifiers = dict(self._modifiers) if self._modifiers is not None else None
+        clone._next_token = self._next_token
+        clone._inventory = self._inventory
+        clone._equipment = self._equipment
+        clone._abilities = self._abilities
+        clone._status_effects = self._status_effects
+        return clone
+
+    def __repr__(self) -> str:
+        return f"CompactCharacter(name={self.name!r}, level={self.level}, id={self.id})"
+
+    @property
+    def stats(self) -> CompactStats:
+        return CompactStats(self)
+
+    @property
+    def inventory(self) -> Dict[str, Any]:
+        if self._inventory is None:
+            self._inventory = {}
+        return self._inventory
+
+    @property
+    def equipment(self) -> Dict[str, Any]:
+        if self._equipment is None:
+            self._equipment = {}
+        return self._equipment
+
+    @property
+    def abilities(self) -> Dict[str, Any]:
+        if self._abilities is None:
+            self._abilities = {}
+        return self._abilities
+
+    @property
+    def status_effects(self) -> Dict[str, Any]:
+        if self._status_effects is None:
+            self._status_effects = {}
+        return self._status_effects
+
+    def modify_stat(self, stat: str, amount: int) -> None:
+        """Modifica um atributo do personagem."""
+        index = CORE_STAT_INDEX.get(stat)
+        if index is not None:
+            self._core[index] += amount
+        elif self._extra and stat in self._extra:
+            self._extra[stat] += amount
+
+    def add_modifier(self, stat: str, value: int,
+                     layer: ModifierLayer = ModifierLayer.EFFECTS,
+                     percentage: bool = False) -> int:
+        """Adiciona um modificador temporário; retorna o token para removê-lo."""
+        if percentage:
+            raise ValueError("CompactCharacter não suporta modificadores percentuais")
+        if self._modifiers is None:
+            self._modifiers = {}
+        token = self._next_token
+        self._next_token += 1
+        # Guarda o valor efetivamente aplicado (0 se o atributo não existir)
+        applied = value if self.get_stat(stat) is not None else 0
+        self.modify_stat(stat, applied)
+        self._modifiers[token] = StatModifier(stat, applied, ModifierLayer(layer))
+        return token
+
+    def remove_modifier(self, token: int) -> bool:
+        """Remove um modificador adicionado por ``add_modifier``."""
+        modifier = self._modifiers.pop(token, None) if self._modifiers else None
+        if modifier is None:
+            return False
+        self.modify_stat(modifier.stat, -int(modifier.value))
+        return True
+
+    def clear_modifiers(self, layer: ModifierLayer) -> int:
+        """Remove todos os modificadores de uma camada."""
+        if not self._modifiers:
+            return 0
+        tokens = [token for token, modifier in self._modifiers.items() if modifier.layer == layer]
+        for token in tokens:
+            self.remove_modifier(token)
+        return len(tokens)
+
+    def get_stat(self, stat: str) -> Optional[int]:
+        """Retorna o valor de um atributo."""
+        index = CORE_STAT_INDEX.get(stat)
+        if index is not None:
+            return self._core[index]
+        return self._extra.get(stat) if self._extra else None
+
+    def get_base_stat(self, stat: str) -> Optional[int]:
+        """Retorna o valor base de um atributo, sem modificadores."""
+        value = self.get_stat(stat)
+        if value is not None and self._modifiers:
+            value -= sum(int(m.value) for m in self._modifiers.values() if m.stat == stat)
+        return value
+
+    def snapshot_stats(self) -> tuple:
+        """Atributos e modificadores como tuplas imutáveis."""
+        return (
+            tuple(self._core),
+            tuple(self._extra.items()) if self._extra else (),
+            tuple(self._modifiers.items()) if self._modifiers else ()
+        )
+
+    def restore_stats(self, snapshot: tuple) -> None:
+        """Restaura atributos capturados por ``snapshot_stats``."""
+        core, extra, modifiers = snapshot
+        self._core = array('i', core)
+        self._extra = dict(extra) if extra else None
+        self._modifiers = dict(modifiers) if modifiers else None
+        if modifiers:
+            self._next_token = max(self._next_token, max(token for token, _ in modifiers) + 1)
+
+    def is_alive(self) -> bool:
+        """Verifica se o personagem está vivo."""
+        return self._core[_HP] > 0
+
+    def heal(self, amount: int) -> None:
+        """Cura o personagem."""
+        core = self._core
+        core[_HP] = min(core[_HP] + amount, core[_MAX_HP])
+
+    def take_damage(self, amount: int) -> None:
+        """Causa dano ao personagem."""
+        core = self._core
+        core[_HP] = max(0, core[_HP] - amount)
+
+    def restore_mana(self, amount: int) -> None:
+        """Restaura mana do personagem."""
+        core = self._core
+        core[_MP] = min(core[_MP] + amount, core[_MAX_MP])
+
+    def use_mana(self, amount: int) -> bool:
+        """Tenta usar mana. Retorna True se sucesso."""
+        core = self._core
+        if core[_MP] >= amount:
+            core[_MP] -= amount
+            return True
+        return False
+
+    def add_experience(self, amount: int) -> Optional[LevelChange]:
+        """Adiciona experiência; sobe todos os níveis alcançados de uma vez."""
+        return apply_experience(self, amount)
+
+    def level_up(self) -> LevelChange:
+        """Aumenta o nível do personagem."""
+        return apply_levels(self, 1)
+
+    def equip_item(self, slot: str, item: Any) -> bool:
+        """Equipa um item em um slot."""
+        if slot in self.equipment:
+            old_item = self.equipment[slot]
+            self.inventory[old_item.name] = old_item
+        self.equipment[slot] = item
+        return True
+
+    def unequip_item(self, slot: str) -> Optional[Any]:
+        """Remove um item equipado."""
+        if self._equipment and slot in self._equipment:
+            item = self._equipment.pop(slot)
+            self.inventory[item.name] = item
+            return item
+        return None
+
+    def add_to_inventory(self, item: Any) -> bool:
+        """Adiciona um item ao inventário."""
+        self.inventory[item.name] = item
+        return True
+
+    def remove_from_inventory(self, item_name: str) -> Optional[Any]:
+        """Remove um item do inventário."""
+        return self._inventory.pop(item_name, None) if self._inventory else None
+
+    def has_item(self, item_name: str) -> bool:
+        """Verifica se tem um item no inventário."""
+        return self._inventory is not None and item_name in self._inventory
+
+    def add_ability(self, ability_name: str, ability: Any) -> None:
+        """Adiciona uma habilidade ao personagem."""
+        self.abilities[ability_name] = ability
+
+    def remove_ability(self, ability_name: str) -> Optional[Any]:
+        """Remove uma habilidade do personagem."""
+        return self._abilities.pop(ability_name, None) if self._abilities else None
+
+    def has_ability(self, ability_name: str) -> bool:
+        """Verifica se tem uma habilidade."""
+        return self._abilities is not None and ability_name in self._abilities
+
+    def add_status_effect(self, effect_name: str, effect: Any) -> None:
+        """Adiciona um efeito de status."""
+        self.status_effects[effect_name] = effect
+
+    def remove_status_effect(self, effect_name: str) -> Optional[Any]:
+        """Remove um efeito de status."""
+        if not self._status_effects:
+            return None
+        return self._status_effects.pop(effect_name, None)
+
+    def has_status_effect(self, effect_name: str) -> bool:
+        """Verifica se tem um efeito de status."""
+        return self._status_effects is not None and effect_name in self._status_effects
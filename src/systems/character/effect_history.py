@@ -0,0 +1,91 @@
+from typing import List, Optional, Iterator, NamedTuple
+import csv
+import os
+
+# Registros mantidos em memória por histórico, por padrão
+HISTORY_CAPACITY = 64
+# Registros descartados acumulados antes de cada escrita em disco
+SPILL_BATCH = 256
+
+class EffectRecord(NamedTuple):
+    """Registro compacto de um efeito encerrado."""
+    template: str  # nome do modelo no catálogo de efeitos
+    applied: int   # tick do gerenciador em que o efeito foi aplicado
+    removed: int   # tick em que foi removido ou expirou
+    stacks: int
+
+class EffectHistory:
+    """Histórico circular de efeitos encerrados.
+
+    Guarda só os ``capacity`` registros mais recentes. Com ``spill_path``, os
+    registros que saem do buffer são anexados a um arquivo CSV em lotes de
+    ``SPILL_BATCH``, para auditoria; ``spilled`` os lê de volta. Um lote
+    incompleto só vai para o disco em ``flush``/``close`` (ou ao sair de um
+    bloco ``with``).
+    """
+    __slots__ = ('capacity', 'spill_path', '_records', '_start', '_evicted')
+
+    def __init__(self, capacity: int = HISTORY_CAPACITY,
+                 spill_path: Optional[str] = None):
+        if capacity < 1:
+            raise ValueError("O histórico precisa guardar ao menos um registro")
+        self.capacity = capacity
+        self.spill_path = spill_path
+        self._records: List[EffectRecord] = []
+        self._start = 0  # posição do registro mais antigo quando o buffer está cheio
+        self._evicted: List[EffectRecord] = []
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[EffectRecord]:
+        """Registros em memória, do mais antigo ao mais recente."""
+        records, start = self._records, self._start
+        yield from records[start:]
+        yield from records[:start]
+
+    def append(self, record: EffectRecord) -> None:
+        records = self._records
+        if len(records) < self.capacity:
+            records.append(record)
+            return
+        if self.spill_path is not None:
+            self._evicted.append(records[self._start])
+            if len(self._evicted) >= SPILL_BATCH:
+                self.flush()
+        records[self._start] = record
+        self._start = (self._start + 1) % self.capacity
+
+    def recent(self, limit: Optional[int] = None) -> List[EffectRecord]:
+        """Os ``limit`` registros mais recentes (ou todos), do mais antigo ao mais novo."""
+        records = self._records[self._start:] + self._records[:self._start]
+        if limit is None:
+            return records
+        return records[-limit:] if limit > 0 else []
+
+    def flush(self) -> None:
+        """Grava em disco os registros descartados ainda pendentes."""
+        if not self._evicted or self.spill_path is None:
+            return
+        with open(self.spill_path, 'a', newline='', encoding='utf-8') as spill:
+            csv.writer(spill).writerows(self._evicted)
+        self._evicted = []
+
+    def close(self) -> None:
+        """Grava os descartados pendentes; chamado ao encerrar o dono do histórico."""
+        self.flush()
+
+    def __enter__(self) -> 'EffectHistory':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def spilled(self) -> Iterator[EffectRecord]:
+        """Registros já descartados do buffer, lidos do arquivo de despejo."""
+        self.flush()
+        if self.spill_path is None or not os.path.exists(self.spill_path):
+            return
+        with open(self.spill_path, newline='', encoding='utf-8') as spill:
+            for template, applied, removed, stacks in csv.reader(spill):
+                yield EffectRecord(template, int(applied), int(removed), int(stacks))
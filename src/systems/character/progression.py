@@ -0,0 +1,136 @@
+from typing import Dict, List, Optional, Sequence, Callable, Any, NamedTuple, Union
+from bisect import bisect_right
+import numpy as np
+
+# Recursos reabastecidos ao subir de nível: recurso -> atributo máximo
+REFILLED_RESOURCES: Dict[str, str] = {'hp': 'max_hp', 'mp': 'max_mp'}
+
+class LevelChange(NamedTuple):
+    """Evento de mudança de nível (um por concessão de XP, mesmo saltando vários níveis)."""
+    character: Any
+    old_level: int
+    new_level: int
+
+# Ouvintes de mudança de nível, chamados com cada LevelChange
+LEVEL_CHANGE_LISTENERS: List[Callable[[LevelChange], None]] = []
+
+def on_level_change(listener: Callable[[LevelChange], None]) -> Callable[[LevelChange], None]:
+    """Registra um ouvinte de mudanças de nível (pode ser usado como decorador)."""
+    LEVEL_CHANGE_LISTENERS.append(listener)
+    return listener
+
+class XPCurve:
+    """Curva de XP pré-calculada e ganhos de atributo por nível.
+
+    ``thresholds[n - 1]`` é o XP acumulado necessário para o nível ``n``
+    (``thresholds[0] == 0``). Depois do fim da tabela, cada nível custa o
+    mesmo que o último degrau, então o nível de qualquer total de XP sai de
+    uma busca binária ou de uma divisão, sem laço por nível. ``max_level``
+    limita o nível, se definido.
+    """
+
+    def __init__(self, thresholds: Sequence[int],
+                 stat_gains: Optional[Dict[str, int]] = None,
+                 max_level: Optional[int] = None):
+        if len(thresholds) < 2 or thresholds[0] != 0:
+            raise ValueError("A curva precisa de ao menos dois níveis, começando em 0 XP")
+        if any(b <= a for a, b in zip(thresholds, thresholds[1:])):
+            raise ValueError("Os limiares de XP devem ser estritamente crescentes")
+        self.thresholds = tuple(thresholds)
+        self.stat_gains = (dict(stat_gains) if stat_gains is not None
+                           else {'max_hp': 5, 'max_mp': 3})
+        self.max_level = max_level
+        self._array = np.asarray(self.thresholds, dtype=np.int64)
+        self._step = self.thresholds[-1] - self.thresholds[-2]
+
+    @classmethod
+    def linear(cls, per_level: int = 1000, levels: int = 20,
+               stat_gains: Optional[Dict[str, int]] = None,
+               max_level: Optional[int] = None) -> 'XPCurve':
+        """Curva com custo fixo por nível (``per_level`` XP a cada nível)."""
+        return cls([level * per_level for level in range(levels)], stat_gains, max_level)
+
+    def level_for(self, experience: int) -> int:
+        """Nível correspondente a ``experience`` XP acumulado."""
+        thresholds = self.thresholds
+        if experience >= thresholds[-1]:
+            level = len(thresholds) + (experience - thresholds[-1]) // self._step
+        else:
+            level = bisect_right(thresholds, experience)
+        return level if self.max_level is None else min(level, self.max_level)
+
+    def levels_for(self, experience: Sequence[int]) -> np.ndarray:
+        """``level_for`` de vários totais de XP de uma vez."""
+        totals = np.asarray(experience, dtype=np.int64)
+        last = self.thresholds[-1]
+        levels: np.ndarray = np.where(totals >= last,
+                                      len(self.thresholds) + (totals - last) // self._step,
+                                      np.searchsorted(self._array, totals, side='right'))
+        if self.max_level is not None:
+            levels = np.minimum(levels, self.max_level)
+        return levels
+
+    def experience_for(self, level: int) -> int:
+        """XP acumulado necessário para chegar a ``level``."""
+        if level <= len(self.thresholds):
+            return self.thresholds[max(level, 1) - 1]
+        return self.thresholds[-1] + (level - len(self.thresholds)) * self._step
+
+# Curva padrão: 1000 XP por nível, +5 de HP máximo e +3 de MP máximo por nível
+DEFAULT_XP_CURVE = XPCurve.linear(1000)
+
+def apply_levels(character: Any, levels: int, curve: Optional[XPCurve] = None) -> LevelChange:
+    """Sobe ``levels`` níveis de uma vez: soma todos os ganhos e emite um único evento."""
+    curve = curve or character.xp_curve
+    old_level = character.level
+    character.level = old_level + levels
+    for stat, gain in curve.stat_gains.items():
+        character.modify_stat(stat, gain * levels)
+    stats = character.stats
+    for resource, maximum in REFILLED_RESOURCES.items():
+        if maximum in curve.stat_gains:
+            stats[resource] = stats[maximum]
+    change = LevelChange(character, old_level, character.level)
+    for listener in LEVEL_CHANGE_LISTENERS:
+        listener(change)
+    return change
+
+def apply_experience(character: Any, amount: int,
+                     curve: Optional[XPCurve] = None) -> Optional[LevelChange]:
+    """Adiciona XP e aplica, num passo só, todos os níveis alcançados."""
+    curve = curve or character.xp_curve
+    character.experience += amount
+    levels = curve.level_for(character.experience) - character.level
+    return apply_levels(character, levels, curve) if levels > 0 else None
+
+def award_experience(characters: Sequence[Any], amount: Union[int, Sequence[int]],
+                     curve: Optional[XPCurve] = None) -> List[LevelChange]:
+    """Concede XP a um grupo (ex.: uma raid) numa única chamada.
+
+    ``amount`` vale para todos ou é uma sequência com o XP de cada personagem.
+    Os novos níveis são calculados de uma vez por curva; só quem subiu de
+    nível tem atributos alterados. Retorna os eventos de mudança de nível.
+    """
+    amounts = [amount] * len(characters) if isinstance(amount, int) else list(amount)
+    if len(amounts) != len(characters):
+        raise ValueError("Quantidade de XP diferente da quantidade de personagens")
+    groups: Dict[int, List[int]] = {}
+    curves: Dict[int, XPCurve] = {}
+    for index, character in enumerate(characters):
+        character.experience += amounts[index]
+        character_curve = curve or character.xp_curve
+        curves[id(character_curve)] = character_curve
+        groups.setdefault(id(character_curve), []).append(index)
+
+    new_levels = [0] * len(characters)
+    for key, indexes in groups.items():
+        levels = curves[key].levels_for([characters[i].experience for i in indexes])
+        for index, level in zip(indexes, levels.tolist()):
+            new_levels[index] = level
+
+    changes = []
+    for character, level in zip(characters, new_levels):
+        if level > character.level:
+            changes.append(apply_levels(character, level - character.level,
+                                        curve or character.xp_curve))
+    return changes
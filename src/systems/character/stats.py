@@ -0,0 +1,263 @@
+from typing import (Any, Dict, Iterable, Iterator, List, Mapping, NamedTuple, Optional, Set,
+                    Tuple, TypeVar, Union, overload)
+from typing import TYPE_CHECKING
+from enum import IntEnum
+
+if TYPE_CHECKING:
+    from _collections_abc import dict_items, dict_keys, dict_values
+
+Number = Union[int, float]
+_T = TypeVar('_T')
+# Marca a ausência de valor padrão em ``StatBlock.pop``
+_NO_DEFAULT: Any = object()
+
+class ModifierLayer(IntEnum):
+    """Camadas de modificadores aplicadas sobre os valores base."""
+    EQUIPMENT = 1
+    CONDITIONS = 2
+    EFFECTS = 3
+    STATUS = 4
+
+class StatModifier(NamedTuple):
+    """Modificador registrado num StatBlock.
+
+    ``value`` é somado ao atributo ou, com ``percentage``, é uma fração do
+    valor (0.1 = +10%). Percentuais são somados entre si e aplicados depois
+    dos modificadores fixos.
+    """
+    stat: str
+    value: Number
+    layer: ModifierLayer
+    percentage: bool = False
+
+class StatBlock(Dict[str, Number]):
+    """Atributos de um personagem calculados a partir de camadas de modificadores.
+
+    ``base`` guarda os valores base; o próprio dicionário guarda os valores
+    efetivos já calculados. Adicionar ou remover um modificador apenas marca o
+    atributo afetado como sujo, e ele é recalculado na próxima leitura
+    (``__missing__``). Leituras de atributos limpos são consultas diretas ao
+    dicionário. Escritas (``stats['hp'] = ...``) alteram o valor base.
+    """
+    __slots__ = ('base', '_modifiers', '_by_stat', '_dirty', '_next_token')
+
+    def __init__(self, base: Optional[Mapping[str, Number]] = None):
+        super().__init__()
+        self.base: Dict[str, Number] = dict(base) if base else {}
+        self._modifiers: Dict[int, StatModifier] = {}
+        # Modificadores de cada atributo, por token
+        self._by_stat: Dict[str, Dict[int, StatModifier]] = {}
+        self._dirty: Set[str] = set()
+        self._next_token = 1
+        super().update(self.base)
+
+    # Leitura
+
+    def __missing__(self, stat: str) -> Number:
+        if stat not in self._dirty:
+            raise KeyError(stat)
+        value = self._compute(stat)
+        dict.__setitem__(self, stat, value)
+        self._dirty.discard(stat)
+        return value
+
+    @overload
+    def get(self, stat: str) -> Optional[Number]: ...
+
+    @overload
+    def get(self, stat: str, default: Union[Number, _T]) -> Union[Number, _T]: ...
+
+    def get(self, stat: str, default: Any = None) -> Any:
+        try:
+            return self[stat]
+        except KeyError:
+            return default
+
+    def __contains__(self, stat: object) -> bool:
+        return stat in self.base
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.base)
+
+    def keys(self) -> 'dict_keys[str, Number]':
+        return self.base.keys()
+
+    def items(self) -> 'dict_items[str, Number]':
+        """Pares (atributo, valor efetivo), na ordem dos valores base.
+
+        Como os valores efetivos podem estar sujos, a visão é de uma cópia
+        calculada na chamada, não do próprio bloco.
+        """
+        return self._effective().items()
+
+    def values(self) -> 'dict_values[str, Number]':
+        return self._effective().values()
+
+    def _effective(self) -> Dict[str, Number]:
+        """Cópia com todos os valores efetivos, na ordem dos valores base."""
+        return {stat: self[stat] for stat in self.base}
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, dict):
+            return NotImplemented
+        return dict(self.items()) == (dict(other.items()) if isinstance(other, StatBlock)
+                                      else other)
+
+    def __ne__(self, other: object) -> bool:
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return repr(dict(self.items()))
+
+    # Escrita (valores base)
+
+    def __setitem__(self, stat: str, value: Number) -> None:
+        self.base[stat] = value
+        if stat in self._by_stat:
+            self._invalidate(stat)
+        else:
+            dict.__setitem__(self, stat, value)
+
+    def __delitem__(self, stat: str) -> None:
+        del self.base[stat]
+        self._dirty.discard(stat)
+        dict.pop(self, stat, None)
+
+    def update(self, *args: Any, **kwargs: Number) -> None:
+        for stat, value in dict(*args, **kwargs).items():
+            self[stat] = value
+
+    def setdefault(self, stat: str, default: Number = 0) -> Number:
+        if stat not in self.base:
+            self[stat] = default
+        return self[stat]
+
+    @overload
+    def pop(self, stat: str) -> Number: ...
+
+    @overload
+    def pop(self, stat: str, default: Union[Number, _T]) -> Union[Number, _T]: ...
+
+    def pop(self, stat: str, default: Any = _NO_DEFAULT) -> Any:
+        if stat not in self.base:
+            if default is not _NO_DEFAULT:
+                return default
+            raise KeyError(stat)
+        value = self[stat]
+        del self[stat]
+        return value
+
+    def clear(self) -> None:
+        self.base.clear()
+        self._dirty.clear()
+        super().clear()
+
+    # Modificadores
+
+    def add_modifier(self, stat: str, value: Number,
+                     layer: ModifierLayer = ModifierLayer.EFFECTS,
+                     percentage: bool = False) -> int:
+        """Registra um modificador e retorna o token usado para removê-lo."""
+        token = self._next_token
+        self._next_token += 1
+        modifier = StatModifier(stat, value, ModifierLayer(layer), percentage)
+        self._modifiers[token] = modifier
+        self._by_stat.setdefault(stat, {})[token] = modifier
+        self._invalidate(stat)
+        return token
+
+    def remove_modifier(self, token: int) -> bool:
+        """Remove o modificador de ``token``; retorna False se ele não existir."""
+        modifier = self._modifiers.pop(token, None)
+        if modifier is None:
+            return False
+        modifiers = self._by_stat[modifier.stat]
+        del modifiers[token]
+        if not modifiers:
+            del self._by_stat[modifier.stat]
+        self._invalidate(modifier.stat)
+        return True
+
+    def clear_layer(self, layer: ModifierLayer) -> int:
+        """Remove todos os modificadores de uma camada; retorna quantos foram removidos."""
+        tokens = [token for token, modifier in self._modifiers.items() if modifier.layer == layer]
+        for token in tokens:
+            self.remove_modifier(token)
+        return len(tokens)
+
+    def get_modifiers(self, stat: Optional[str] = None,
+                      layer: Optional[ModifierLayer] = None) -> List[StatModifier]:
+        """Retorna os modificadores ativos, opcionalmente filtrados."""
+        modifiers: Iterable[StatModifier] = (
+            self._modifiers.values() if stat is None else self._by_stat.get(stat, {}).values()
+        )
+        return [m for m in modifiers if layer is None or m.layer == layer]
+
+    def _invalidate(self, stat: str) -> None:
+        """Marca um atributo como sujo; só atributos com valor base são visíveis."""
+        if stat in self.base:
+            dict.pop(self, stat, None)
+            self._dirty.add(stat)
+
+    def _compute(self, stat: str) -> Number:
+        """Calcula o valor efetivo de um atributo a partir da base e dos modificadores."""
+        base = self.base[stat]
+        flat: Number = 0
+        percent: Number = 0
+        for modifier in self._by_stat.get(stat, {}).values():
+            if modifier.percentage:
+                percent += modifier.value
+            else:
+                flat += modifier.value
+        value = base + flat
+        if percent:
+            value = value * (1 + percent)
+            if isinstance(base, int):
+                value = round(value)
+        return value
+
+    # Cópias e snapshots
+
+    def copy(self) -> 'StatBlock':
+        clone = StatBlock.__new__(StatBlock)
+        super(StatBlock, clone).update(super().items())
+        clone.base = dict(self.base)
+        clone._modifiers = dict(self._modifiers)
+        clone._by_stat = {stat: dict(modifiers) for stat, modifiers in self._by_stat.items()}
+        clone._dirty = set(self._dirty)
+        clone._next_token = self._next_token
+        return clone
+
+    def snapshot(self) -> tuple:
+        """Retorna valores base e modificadores como tuplas imutáveis."""
+        return (tuple(self.base.items()), tuple(self._modifiers.items()), self._next_token)
+
+    def restore(self, snapshot: tuple) -> None:
+        """Restaura valores base e modificadores de ``snapshot``."""
+        base, modifiers, next_token = snapshot
+        self.base = dict(base)
+        self._modifiers = dict(modifiers)
+        self._by_stat = {}
+        for token, modifier in modifiers:
+            self._by_stat.setdefault(modifier.stat, {})[token] = modifier
+        # Tokens nunca são reutilizados, mesmo depois de um rollback
+        self._next_token = max(self._next_token, next_token)
+        super().clear()
+        super().update(self.base)
+        self._dirty = set()
+        for stat in self._by_stat:
+            self._invalidate(stat)
+
+    def __reduce__(self) -> Tuple[Any, Tuple[tuple]]:
+        return (_rebuild_stat_block, (self.snapshot(),))
+
+def _rebuild_stat_block(snapshot: tuple) -> StatBlock:
+    block = StatBlock()
+    block.restore(snapshot)
+    return block
@@ -1,7 +1,9 @@
-from typing import Dict, List, Optional, Callable
-from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Callable, Mapping, Tuple
+from dataclasses import dataclass, field, fields
 from enum import Enum, auto
-from datetime import datetime, timedelta
+from types import MappingProxyType
+from .effect_history import EffectHistory, EffectRecord
+from .stats import ModifierLayer, StatBlock
 
 class StatusType(Enum):
     BUFF = auto()       # Efeitos positivos
@@ -16,161 +18,216 @@ class StatusCategory(Enum):
     SOCIAL = auto()      # Efeitos sociais
     ENVIRONMENTAL = auto() # Efeitos ambientais
 
-@dataclass
+@dataclass(frozen=True)
 class StatusModifier:
-    """Modificador de atributos ou estatísticas."""
+    """Modificador de atributos ou estatísticas (valor por pilha)."""
     attribute: str
     value: float
     is_percentage: bool = False
     stacks: bool = False
     max_stacks: int = 1
-    current_stacks: int = 1
 
-@dataclass
+@dataclass(frozen=True, eq=False)
 class StatusEffect:
-    """Representa um efeito de status."""
+    """Modelo de um efeito de status (imutável e compartilhado pelo catálogo)."""
     name: str
     description: str
     status_type: StatusType
     category: StatusCategory
     duration: Optional[int] = None  # None para efeitos permanentes
-    remaining_duration: Optional[int] = None
-    modifiers: Dict[str, StatusModifier] = field(default_factory=dict)
+    modifiers: Mapping[str, StatusModifier] = field(default_factory=dict)
     is_active: bool = True
     is_visible: bool = True
     can_be_dispelled: bool = True
     can_be_resisted: bool = True
     resistance_attribute: Optional[str] = None
     tick_effect: Optional[Callable] = None
+    # Quantias fixas de cada tick (ex.: {"damage": 3}), sem callback
+    tick_amounts: Mapping[str, float] = field(default_factory=dict)
     removal_effect: Optional[Callable] = None
-    application_time: datetime = field(default_factory=datetime.now)
-    tags: List[str] = field(default_factory=list)
+    tags: Tuple[str, ...] = ()
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, 'modifiers', MappingProxyType(dict(self.modifiers)))
+        object.__setattr__(self, 'tick_amounts', MappingProxyType(dict(self.tick_amounts)))
+        object.__setattr__(self, 'tags', tuple(self.tags))
+
+class EffectInstance:
+    """Efeito aplicado a um alvo: modelo do catálogo, pilhas e duração restante."""
+    __slots__ = ('template', 'stacks', 'remaining', 'applied')
+
+    def __init__(self, template: StatusEffect, stacks: int = 1, applied: int = 0):
+        self.template = template
+        self.stacks = stacks
+        self.applied = applied  # tick do gerenciador em que foi aplicado
+        self.remaining: Optional[int] = template.duration  # None para permanentes
+
+    @property
+    def name(self) -> str:
+        return self.template.name
+
+    def __repr__(self) -> str:
+        return (f"EffectInstance({self.template.name!r}, stacks={self.stacks}, "
+                f"remaining={self.remaining})")
+
+# Catálogo global de modelos de efeito, por nome
+_TEMPLATES: Dict[str, StatusEffect] = {}
+EFFECT_TEMPLATES: Mapping[str, StatusEffect] = MappingProxyType(_TEMPLATES)
+
+def register_effect(name: str, description: str,
+                    status_type: StatusType, category: StatusCategory,
+                    duration: Optional[int] = None,
+                    modifiers: Optional[Dict[str, StatusModifier]] = None,
+                    tick_effect: Optional[Callable] = None,
+                    removal_effect: Optional[Callable] = None,
+                    tags: Optional[List[str]] = None,
+                    tick_amounts: Optional[Dict[str, float]] = None,
+                    replace: bool = False) -> StatusEffect:
+    """Registra um modelo de efeito no catálogo global.
+
+    Registrar de novo um nome com a mesma definição devolve o modelo já
+    registrado; uma definição diferente gera ``ValueError``, a menos que
+    ``replace`` seja verdadeiro.
+    """
+    template = StatusEffect(
+        name=name,
+        description=description,
+        status_type=status_type,
+        category=category,
+        duration=duration,
+        modifiers=modifiers or {},
+        tick_effect=tick_effect,
+        tick_amounts=tick_amounts or {},
+        removal_effect=removal_effect,
+        tags=tuple(tags or ())
+    )
+    current = _TEMPLATES.get(name)
+    if current is not None and not replace:
+        if _same_definition(current, template):
+            return current
+        raise ValueError(f"Efeito {name} já registrado com outra definição")
+    _TEMPLATES[name] = template
+    return template
+
+def _same_definition(first: StatusEffect, second: StatusEffect) -> bool:
+    return all(getattr(first, f.name) == getattr(second, f.name) for f in fields(StatusEffect))
+
+def get_template(name: str) -> Optional[StatusEffect]:
+    """Retorna o modelo de efeito registrado com ``name``."""
+    return _TEMPLATES.get(name)
+
+# Efeitos padrão, registrados uma única vez
+# Efeitos positivos (Buffs)
+register_effect(
+    "inspirado",
+    "Aumenta a chance de sucesso em testes.",
+    StatusType.BUFF,
+    StatusCategory.MENTAL,
+    duration=3,
+    modifiers={
+        "skill_check": StatusModifier("skill_check", 2)
+    }
+)
+
+register_effect(
+    "protegido",
+    "Aumenta a defesa física.",
+    StatusType.BUFF,
+    StatusCategory.PHYSICAL,
+    duration=5,
+    modifiers={
+        "defense": StatusModifier("defense", 3)
+    }
+)
+
+# Efeitos negativos (Debuffs)
+register_effect(
+    "envenenado",
+    "Causa dano ao longo do tempo.",
+    StatusType.DEBUFF,
+    StatusCategory.PHYSICAL,
+    duration=4,
+    modifiers={
+        "health_regen": StatusModifier("health_regen", -2)
+    },
+    tick_amounts={"damage": 3}
+)
+
+register_effect(
+    "amedrontado",
+    "Reduz a eficácia em combate.",
+    StatusType.DEBUFF,
+    StatusCategory.MENTAL,
+    duration=2,
+    modifiers={
+        "attack": StatusModifier("attack", -2),
+        "defense": StatusModifier("defense", -1)
+    }
+)
 
 @dataclass
 class StatusEffectManager:
-    """Gerenciador de efeitos de status."""
-    active_effects: Dict[str, StatusEffect] = field(default_factory=dict)
-    effect_history: List[StatusEffect] = field(default_factory=list)
+    """Efeitos de status aplicados a um alvo.
+
+    Os modelos ficam no catálogo global (``EFFECT_TEMPLATES``); o gerenciador
+    guarda só as instâncias ativas do alvo, então criá-lo não copia nada. Os
+    efeitos encerrados vão para um histórico circular de registros compactos;
+    com despejo em disco, quem cria o gerenciador deve chamar ``close`` (ou
+    usá-lo num bloco ``with``) para gravar o último lote.
+    """
+    active_effects: Dict[str, EffectInstance] = field(default_factory=dict)
+    effect_history: EffectHistory = field(default_factory=EffectHistory)
     immunity_list: List[str] = field(default_factory=list)
-    
-    def __post_init__(self):
-        self._initialize_default_effects()
-    
-    def _initialize_default_effects(self):
-        """Inicializa efeitos de status padrão."""
-        # Efeitos positivos (Buffs)
-        self.register_effect(
-            "inspirado",
-            "Aumenta a chance de sucesso em testes.",
-            StatusType.BUFF,
-            StatusCategory.MENTAL,
-            duration=3,
-            modifiers={
-                "skill_check": StatusModifier("skill_check", 2)
-            }
-        )
-        
-        self.register_effect(
-            "protegido",
-            "Aumenta a defesa física.",
-            StatusType.BUFF,
-            StatusCategory.PHYSICAL,
-            duration=5,
-            modifiers={
-                "defense": StatusModifier("defense", 3)
-            }
-        )
-        
-        # Efeitos negativos (Debuffs)
-        self.register_effect(
-            "envenenado",
-            "Causa dano ao longo do tempo.",
-            StatusType.DEBUFF,
-            StatusCategory.PHYSICAL,
-            duration=4,
-            modifiers={
-                "health_regen": StatusModifier("health_regen", -2)
-            },
-            tick_effect=lambda: {"damage": 3}
-        )
-        
-        self.register_effect(
-            "amedrontado",
-            "Reduz a eficácia em combate.",
-            StatusType.DEBUFF,
-            StatusCategory.MENTAL,
-            duration=2,
-            modifiers={
-                "attack": StatusModifier("attack", -2),
-                "defense": StatusModifier("defense", -1)
-            }
-        )
-    
+    # Ticks processados por update_effects
+    current_tick: int = 0
+    # Tokens dos modificadores aplicados a um StatBlock, por efeito
+    _modifier_tokens: Dict[str, List[int]] = field(default_factory=dict, repr=False)
+
     def register_effect(self, name: str, description: str,
                        status_type: StatusType, category: StatusCategory,
                        duration: Optional[int] = None,
                        modifiers: Dict[str, StatusModifier] = None,
                        tick_effect: Optional[Callable] = None,
                        removal_effect: Optional[Callable] = None,
-                       tags: List[str] = None) -> None:
-        """Registra um novo efeito de status."""
-        effect = StatusEffect(
-            name=name,
-            description=description,
-            status_type=status_type,
-            category=category,
-            duration=duration,
-            remaining_duration=duration,
-            modifiers=modifiers or {},
-            tick_effect=tick_effect,
-            removal_effect=removal_effect,
-            tags=tags or []
-        )
-        self.active_effects[name] = effect
+                       tags: List[str] = None,
+                       tick_amounts: Optional[Dict[str, float]] = None,
+                       replace: bool = False) -> StatusEffect:
+        """Registra um modelo no catálogo global (atalho para ``register_effect``)."""
+        return register_effect(name, description, status_type, category, duration,
+                               modifiers, tick_effect, removal_effect, tags, tick_amounts,
+                               replace)
     
     def apply_effect(self, name: str, target_stats: Dict[str, float]) -> bool:
-        """Aplica um efeito de status aos atributos do alvo."""
-        if name not in self.active_effects or name in self.immunity_list:
+        """Aplica um efeito do catálogo ao alvo (reaplicar renova a duração)."""
+        template = _TEMPLATES.get(name)
+        if template is None or name in self.immunity_list or not template.is_active:
             return False
         
-        effect = self.active_effects[name]
-        if not effect.is_active:
-            return False
-        
-        # Aplica modificadores
-        for mod in effect.modifiers.values():
-            if mod.attribute in target_stats:
-                if mod.is_percentage:
-                    target_stats[mod.attribute] *= (1 + mod.value * mod.current_stacks)
-                else:
-                    target_stats[mod.attribute] += mod.value * mod.current_stacks
+        instance = self.active_effects.get(name)
+        if instance is not None:
+            instance.remaining = template.duration
+            return True
         
+        instance = self.active_effects[name] = EffectInstance(template,
+                                                              applied=self.current_tick)
+        self._apply_modifiers(instance, target_stats)
         return True
     
     def remove_effect(self, name: str, target_stats: Dict[str, float]) -> bool:
         """Remove um efeito de status."""
-        if name not in self.active_effects:
+        instance = self.active_effects.pop(name, None)
+        if instance is None:
             return False
         
-        effect = self.active_effects[name]
-        
-        # Remove modificadores
-        for mod in effect.modifiers.values():
-            if mod.attribute in target_stats:
-                if mod.is_percentage:
-                    target_stats[mod.attribute] /= (1 + mod.value * mod.current_stacks)
-                else:
-                    target_stats[mod.attribute] -= mod.value * mod.current_stacks
+        self._remove_modifiers(instance, target_stats)
         
         # Executa efeito de remoção
-        if effect.removal_effect:
-            effect.removal_effect()
+        if instance.template.removal_effect:
+            instance.template.removal_effect()
         
         # Adiciona ao histórico
-        self.effect_history.append(effect)
-        
-        # Remove o efeito
-        del self.active_effects[name]
+        self.effect_history.append(EffectRecord(name, instance.applied, self.current_tick,
+                                                instance.stacks))
         
         return True
     
@@ -178,22 +235,22 @@ class StatusEffectManager:
         """Atualiza todos os efeitos ativos e retorna efeitos de tick."""
         tick_effects = []
         effects_to_remove = []
+        self.current_tick += 1
         
-        for name, effect in self.active_effects.items():
-            if not effect.is_active:
-                continue
-            
+        for name, instance in self.active_effects.items():
             # Atualiza duração
-            if effect.duration is not None:
-                if effect.remaining_duration is not None:
-                    effect.remaining_duration -= 1
-                    if effect.remaining_duration <= 0:
-                        effects_to_remove.append(name)
-                        continue
+            if instance.remaining is not None:
+                instance.remaining -= 1
+                if instance.remaining <= 0:
+                    effects_to_remove.append(name)
+                    continue
             
             # Processa efeito de tick
-            if effect.tick_effect:
-                tick_result = effect.tick_effect()
+            template = instance.template
+            if template.tick_amounts:
+                tick_effects.append(dict(template.tick_amounts))
+            if template.tick_effect:
+                tick_result = template.tick_effect()
                 if tick_result:
                     tick_effects.append(tick_result)
         
@@ -205,44 +262,67 @@ class StatusEffectManager:
     
     def stack_effect(self, name: str, target_stats: Dict[str, float]) -> bool:
         """Adiciona uma pilha a um efeito existente."""
-        if name not in self.active_effects:
+        instance = self.active_effects.get(name)
+        if instance is None:
             return False
         
-        effect = self.active_effects[name]
-        
         # Verifica se pode empilhar
-        for mod in effect.modifiers.values():
-            if not mod.stacks or mod.current_stacks >= mod.max_stacks:
+        for mod in instance.template.modifiers.values():
+            if not mod.stacks or instance.stacks >= mod.max_stacks:
                 return False
-            
-            # Remove valor atual
+        
+        # Troca o valor atual pelo valor com a nova pilha
+        self._remove_modifiers(instance, target_stats)
+        instance.stacks += 1
+        self._apply_modifiers(instance, target_stats)
+        
+        return True
+    
+    def _apply_modifiers(self, instance: EffectInstance, target_stats: Dict[str, float]) -> None:
+        """Aplica os modificadores do efeito aos atributos do alvo.
+
+        Num ``StatBlock`` (como ``Character.stats``) eles entram na camada de
+        status e saem pelos tokens, sem divisões; num dicionário comum os
+        valores são alterados diretamente.
+        """
+        modifiers, stacks = instance.template.modifiers, instance.stacks
+        if isinstance(target_stats, StatBlock):
+            self._modifier_tokens.setdefault(instance.name, []).extend(
+                target_stats.add_modifier(mod.attribute, mod.value * stacks,
+                                          ModifierLayer.STATUS, mod.is_percentage)
+                for mod in modifiers.values() if mod.attribute in target_stats
+            )
+            return
+        for mod in modifiers.values():
             if mod.attribute in target_stats:
                 if mod.is_percentage:
-                    target_stats[mod.attribute] /= (1 + mod.value * mod.current_stacks)
+                    target_stats[mod.attribute] *= (1 + mod.value * stacks)
                 else:
-                    target_stats[mod.attribute] -= mod.value * mod.current_stacks
-            
-            # Incrementa pilhas
-            mod.current_stacks += 1
-            
-            # Aplica novo valor
+                    target_stats[mod.attribute] += mod.value * stacks
+    
+    def _remove_modifiers(self, instance: EffectInstance, target_stats: Dict[str, float]) -> None:
+        """Reverte os modificadores aplicados por ``_apply_modifiers``."""
+        if isinstance(target_stats, StatBlock):
+            for token in self._modifier_tokens.pop(instance.name, ()):
+                target_stats.remove_modifier(token)
+            return
+        stacks = instance.stacks
+        for mod in instance.template.modifiers.values():
             if mod.attribute in target_stats:
                 if mod.is_percentage:
-                    target_stats[mod.attribute] *= (1 + mod.value * mod.current_stacks)
+                    target_stats[mod.attribute] /= (1 + mod.value * stacks)
                 else:
-                    target_stats[mod.attribute] += mod.value * mod.current_stacks
-        
-        return True
+                    target_stats[mod.attribute] -= mod.value * stacks
     
     def clear_effects(self, target_stats: Dict[str, float],
                       type_filter: Optional[StatusType] = None,
                       category_filter: Optional[StatusCategory] = None) -> int:
         """Remove todos os efeitos que correspondam aos filtros."""
         effects_to_remove = [
-            name for name, effect in self.active_effects.items()
-            if (not type_filter or effect.status_type == type_filter) and
-               (not category_filter or effect.category == category_filter) and
-               effect.can_be_dispelled
+            name for name, instance in self.active_effects.items()
+            if (not type_filter or instance.template.status_type == type_filter) and
+               (not category_filter or instance.template.category == category_filter) and
+               instance.template.can_be_dispelled
         ]
         
         count = 0
@@ -253,13 +333,12 @@ class StatusEffectManager:
         return count
     
     def get_active_effects(self, type_filter: Optional[StatusType] = None,
-                          category_filter: Optional[StatusCategory] = None) -> List[StatusEffect]:
+                          category_filter: Optional[StatusCategory] = None) -> List[EffectInstance]:
         """Retorna lista de efeitos ativos com filtros opcionais."""
         return [
-            effect for effect in self.active_effects.values()
-            if effect.is_active and
-               (not type_filter or effect.status_type == type_filter) and
-               (not category_filter or effect.category == category_filter)
+            instance for instance in self.active_effects.values()
+            if (not type_filter or instance.template.status_type == type_filter) and
+               (not category_filter or instance.template.category == category_filter)
         ]
     
     def add_immunity(self, effect_name: str) -> None:
@@ -278,34 +357,39 @@ class StatusEffectManager:
     
     def get_effect_duration(self, name: str) -> Optional[int]:
         """Retorna a duração restante de um efeito."""
-        effect = self.active_effects.get(name)
-        return effect.remaining_duration if effect else None
+        instance = self.active_effects.get(name)
+        return instance.remaining if instance else None
     
     def extend_duration(self, name: str, additional_duration: int) -> bool:
         """Estende a duração de um efeito."""
-        if name not in self.active_effects:
+        instance = self.active_effects.get(name)
+        if instance is None or instance.remaining is None:
             return False
         
-        effect = self.active_effects[name]
-        if effect.duration is not None and effect.remaining_duration is not None:
-            effect.remaining_duration += additional_duration
-            return True
-        
-        return False
+        instance.remaining += additional_duration
+        return True
     
-    def get_effect_history(self, limit: Optional[int] = None) -> List[StatusEffect]:
-        """Retorna histórico de efeitos aplicados."""
-        if limit:
-            return self.effect_history[-limit:]
-        return self.effect_history
+    def get_effect_history(self, limit: Optional[int] = None) -> List[EffectRecord]:
+        """Retorna os registros mais recentes do histórico de efeitos encerrados."""
+        return self.effect_history.recent(limit)
+    
+    def close(self) -> None:
+        """Encerra o gerenciador, gravando os registros do histórico ainda pendentes."""
+        self.effect_history.close()
+
+    def __enter__(self) -> 'StatusEffectManager':
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
     
     def export_to_markdown(self) -> str:
-        """Exporta todos os efeitos em formato markdown."""
+        """Exporta todos os efeitos do catálogo em formato markdown."""
         output = ["# Efeitos de Status\n\n"]
         
         # Organiza por tipo
         effects_by_type = {}
-        for effect in self.active_effects.values():
+        for effect in _TEMPLATES.values():
             if effect.status_type not in effects_by_type:
                 effects_by_type[effect.status_type] = []
             effects_by_type[effect.status_type].append(effect)
@@ -0,0 +1,255 @@
+from typing import Dict, List, Optional, Tuple, Callable, NamedTuple, Any, Mapping, Union
+from itertools import count
+import numpy as np
+from .character import CharacterRef, character_id
+from .stats import ModifierLayer, StatBlock
+from .status_effect import EffectInstance, StatusEffect, StatusModifier
+
+# Duração restante de efeitos permanentes
+PERMANENT = -1
+# Duração restante de linhas removidas, descartadas na próxima compactação
+REMOVED = -2
+
+class StatusTick(NamedTuple):
+    """Resultado agregado de um tick do ``StatusEngine``."""
+    owners: np.ndarray                 # IDs dos donos com resultado de tick
+    totals: np.ndarray                 # (donos × kinds) somas dos ticks
+    kinds: Tuple[str, ...]             # colunas de ``totals`` ("damage", "heal"...)
+    callbacks: Dict[int, List[dict]]   # resultados dos efeitos com callback, por dono
+    expired: List[Tuple[int, str]]     # (dono, efeito) que expiraram neste tick
+
+    def as_dict(self) -> Dict[int, Dict[str, float]]:
+        """Totais por dono, incluindo os resultados dos callbacks."""
+        result: Dict[int, Dict[str, float]] = {}
+        for owner, row in zip(self.owners.tolist(), self.totals.tolist()):
+            result[owner] = {kind: value for kind, value in zip(self.kinds, row) if value}
+        for owner, results in self.callbacks.items():
+            totals = result.setdefault(owner, {})
+            for tick in results:
+                for kind, value in tick.items():
+                    totals[kind] = totals.get(kind, 0) + value
+        return result
+
+class StatusEngine:
+    """Efeitos de status de todos os personagens do mundo, em colunas NumPy.
+
+    Cada efeito ativo é uma linha: dono, efeito, duração restante, quantias de
+    tick por tipo (``damage``, ``heal``...) e um multiplicador (pilhas,
+    potência). ``tick`` avança todas as durações e soma os ticks por dono numa
+    única passada vetorizada. Efeitos com ``tick_effect`` (callback) seguem um
+    caminho lento, chamado só para as suas linhas. Modificadores de atributo
+    entram na camada STATUS do ``StatBlock`` do dono e saem quando o efeito
+    expira.
+    """
+
+    def __init__(self) -> None:
+        self._ids: np.ndarray = np.empty(0, dtype=np.int64)
+        self._owners: np.ndarray = np.empty(0, dtype=np.int64)
+        self._effects: np.ndarray = np.empty(0, dtype=np.int32)
+        self._remaining: np.ndarray = np.empty(0, dtype=np.int32)
+        self._multipliers: np.ndarray = np.empty(0, dtype=np.float64)
+        self._ticks: np.ndarray = np.empty((0, 0), dtype=np.float64)
+        self._has_callback: np.ndarray = np.empty(0, dtype=bool)
+        # Linhas adicionadas desde o último flush
+        self._pending: List[tuple] = []
+        self._names: List[str] = []
+        self._name_codes: Dict[str, int] = {}
+        self.kinds: List[str] = []
+        self._kind_codes: Dict[str, int] = {}
+        # Dados por linha que não cabem em colunas, pelo ID do efeito
+        self._callbacks: Dict[int, Callable[[], Optional[dict]]] = {}
+        self._removal: Dict[int, Callable[[], Any]] = {}
+        self._tokens: Dict[int, Tuple[StatBlock, List[int]]] = {}
+        self._next_id = count(1).__next__
+        # Linhas marcadas como REMOVED ainda presentes nas colunas
+        self._tombstones = 0
+
+    def __len__(self) -> int:
+        return len(self._ids) + len(self._pending) - self._tombstones
+
+    def add_effect(self, owner: CharacterRef, name: str, duration: Optional[int] = None,
+                   ticks: Optional[Mapping[str, float]] = None, multiplier: float = 1.0,
+                   tick_effect: Optional[Callable[[], Optional[dict]]] = None,
+                   removal_effect: Optional[Callable[[], Any]] = None,
+                   modifiers: Optional[Mapping[str, StatusModifier]] = None,
+                   stats: Optional[StatBlock] = None) -> int:
+        """Adiciona um efeito a ``owner``; retorna o ID do efeito.
+
+        ``duration`` None é permanente; 0 expira no próximo tick, como no
+        ``StatusEffectManager``. ``ticks`` são as quantias somadas a cada tick
+        e ``modifiers`` são aplicados a ``stats`` enquanto o efeito durar,
+        ambos vezes ``multiplier``.
+        """
+        if duration is not None and duration < 0:
+            raise ValueError(f"Duração negativa para o efeito {name}: {duration}")
+        effect_id = self._next_id()
+        code = self._name_codes.get(name)
+        if code is None:
+            code = self._name_codes[name] = len(self._names)
+            self._names.append(name)
+        tick_row = {self._kind_code(kind): amount for kind, amount in (ticks or {}).items()}
+        remaining = PERMANENT if duration is None else duration
+        self._pending.append((effect_id, character_id(owner), code, remaining, multiplier,
+                              tick_row, tick_effect is not None))
+        if tick_effect is not None:
+            self._callbacks[effect_id] = tick_effect
+        if removal_effect is not None:
+            self._removal[effect_id] = removal_effect
+        if modifiers and stats is not None:
+            self._tokens[effect_id] = (stats, [
+                stats.add_modifier(mod.attribute, mod.value * multiplier,
+                                   ModifierLayer.STATUS, mod.is_percentage)
+                for mod in modifiers.values() if mod.attribute in stats
+            ])
+        return effect_id
+
+    def add_status_effect(self, owner: CharacterRef,
+                          effect: Union[StatusEffect, EffectInstance],
+                          stats: Optional[StatBlock] = None) -> int:
+        """Adiciona a ``owner`` um modelo do catálogo ou uma instância (pilhas e duração)."""
+        if isinstance(effect, EffectInstance):
+            template, duration, stacks = effect.template, effect.remaining, effect.stacks
+        else:
+            template, duration, stacks = effect, effect.duration, 1
+        return self.add_effect(owner, template.name, duration, template.tick_amounts, stacks,
+                               tick_effect=template.tick_effect,
+                               removal_effect=template.removal_effect,
+                               modifiers=template.modifiers, stats=stats)
+
+    def remove_effect(self, effect_id: int) -> bool:
+        """Remove um efeito antes de expirar (sem chamar ``removal_effect``).
+
+        As linhas ficam em ordem de ID, então a busca é binária; a linha só é
+        marcada como removida e sai das colunas na próxima compactação.
+        """
+        self._flush()
+        row = int(np.searchsorted(self._ids, effect_id))
+        if (row == len(self._ids) or self._ids[row] != effect_id
+                or self._remaining[row] == REMOVED):
+            return False
+        self._tombstone(np.array([row]))
+        return True
+
+    def remove_owner(self, owner: CharacterRef) -> int:
+        """Remove todos os efeitos de um personagem; retorna quantos foram removidos."""
+        self._flush()
+        rows = np.flatnonzero((self._owners == character_id(owner))
+                              & (self._remaining != REMOVED))
+        if len(rows):
+            self._tombstone(rows)
+        return len(rows)
+
+    def get_effects(self, owner: CharacterRef) -> Dict[str, int]:
+        """Efeitos ativos de um personagem: nome -> duração restante (-1 = permanente)."""
+        self._flush()
+        rows = np.flatnonzero((self._owners == character_id(owner))
+                              & (self._remaining != REMOVED))
+        return {self._names[code]: remaining for code, remaining in
+                zip(self._effects[rows].tolist(), self._remaining[rows].tolist())}
+
+    def tick(self) -> StatusTick:
+        """Avança todos os efeitos um turno e retorna os ticks agregados por dono.
+
+        Como em ``StatusEffectManager.update_effects``: a duração diminui antes
+        e quem chega a zero expira sem causar o tick desse turno.
+        """
+        self._flush()
+        remaining = self._remaining
+        removed = remaining == REMOVED
+        timed = remaining >= 0
+        remaining -= timed
+        expired = timed & (remaining <= 0)
+        active = ~(expired | removed)
+
+        ticking = active & (self._ticks != 0).any(axis=1)
+        owners = self._owners[ticking]
+        unique, inverse = np.unique(owners, return_inverse=True)
+        weights = self._ticks[ticking] * self._multipliers[ticking, None]
+        totals = np.zeros((len(unique), len(self.kinds)))
+        for column in range(len(self.kinds)):
+            totals[:, column] = np.bincount(inverse, weights=weights[:, column],
+                                            minlength=len(unique))
+
+        callbacks: Dict[int, List[dict]] = {}
+        if self._callbacks:
+            rows = np.flatnonzero(active & self._has_callback)
+            for effect_id, owner in zip(self._ids[rows].tolist(), self._owners[rows].tolist()):
+                result = self._callbacks[effect_id]()
+                if result:
+                    callbacks.setdefault(owner, []).append(result)
+
+        expired_effects: List[Tuple[int, str]] = []
+        if expired.any():
+            rows = np.flatnonzero(expired)
+            expired_effects = [(owner, self._names[code]) for owner, code in
+                               zip(self._owners[rows].tolist(), self._effects[rows].tolist())]
+            self._discard(rows, expired=True)
+            self._keep(active)
+        elif self._tombstones:
+            self._keep(active)
+        return StatusTick(unique, totals, tuple(self.kinds), callbacks, expired_effects)
+
+    def _kind_code(self, kind: str) -> int:
+        code = self._kind_codes.get(kind)
+        if code is None:
+            code = self._kind_codes[kind] = len(self.kinds)
+            self.kinds.append(kind)
+        return code
+
+    def _flush(self) -> None:
+        """Anexa às colunas as linhas adicionadas desde o último flush."""
+        kinds = len(self.kinds)
+        if self._ticks.shape[1] < kinds:
+            grown = np.zeros((len(self._ticks), kinds))
+            grown[:, :self._ticks.shape[1]] = self._ticks
+            self._ticks = grown
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+        ids, owners, codes, remaining, multipliers, tick_rows, has_callback = zip(*pending)
+        ticks = np.zeros((len(pending), kinds))
+        for row, tick_row in enumerate(tick_rows):
+            for column, amount in tick_row.items():
+                ticks[row, column] = amount
+        self._ids = np.concatenate((self._ids, np.asarray(ids, dtype=np.int64)))
+        self._owners = np.concatenate((self._owners, np.asarray(owners, dtype=np.int64)))
+        self._effects = np.concatenate((self._effects, np.asarray(codes, dtype=np.int32)))
+        self._remaining = np.concatenate((self._remaining,
+                                          np.asarray(remaining, dtype=np.int32)))
+        self._multipliers = np.concatenate((self._multipliers,
+                                            np.asarray(multipliers, dtype=np.float64)))
+        self._ticks = np.concatenate((self._ticks, ticks))
+        self._has_callback = np.concatenate((self._has_callback,
+                                             np.asarray(has_callback, dtype=bool)))
+
+    def _tombstone(self, rows: np.ndarray) -> None:
+        """Marca linhas como removidas; compacta quando elas passam de metade das colunas."""
+        self._discard(rows, expired=False)
+        self._remaining[rows] = REMOVED
+        self._tombstones += len(rows)
+        if self._tombstones * 2 > len(self._ids):
+            self._keep(self._remaining != REMOVED)
+
+    def _keep(self, mask: np.ndarray) -> None:
+        """Compacta as colunas mantendo só as linhas de ``mask`` (sem linhas removidas)."""
+        self._tombstones = 0
+        self._ids = self._ids[mask]
+        self._owners = self._owners[mask]
+        self._effects = self._effects[mask]
+        self._remaining = self._remaining[mask]
+        self._multipliers = self._multipliers[mask]
+        self._ticks = self._ticks[mask]
+        self._has_callback = self._has_callback[mask]
+
+    def _discard(self, rows: np.ndarray, expired: bool) -> None:
+        """Libera os dados por linha; efeitos expirados chamam ``removal_effect``."""
+        for effect_id in self._ids[rows].tolist():
+            self._callbacks.pop(effect_id, None)
+            removal = self._removal.pop(effect_id, None)
+            if removal is not None and expired:
+                removal()
+            tokens = self._tokens.pop(effect_id, None)
+            if tokens is not None:
+                stats, modifier_tokens = tokens
+                for token in modifier_tokens:
+                    stats.remove_modifier(token)
@@ -1,9 +1,11 @@
-from typing import List, Dict, Optional, Callable
+from typing import List, Dict, Optional, Callable, Tuple, Iterable, Sequence
 from dataclasses import dataclass
 from enum import Enum, auto
-from ..character.character import Character
-from .condition import Condition, ConditionType
-from .damage_type import DamageType
+from ..character.character import Character, CharacterRef, character_id
+from ..character.stats import ModifierLayer
+from .condition import Condition, ConditionType, ConditionManager
+from .damage_type import DamageType, DamageTypeManager
+from .expiration import ExpirationScheduler, ScheduledExpiration
 
 class EffectType(Enum):
     DAMAGE = auto()
@@ -14,15 +16,28 @@ class EffectType(Enum):
     AREA = auto()
     MOVEMENT = auto()
 
+class AreaShape(Enum):
+    RADIUS = auto()
+    CONE = auto()
+    LINE = auto()
+
 @dataclass
 class EffectTarget:
-    """Define o alvo do efeito."""
+    """Define o alvo do efeito.
+
+    Para áreas, ``area_radius`` é o raio do círculo ou o comprimento do cone e
+    da linha; ``area_angle`` é a abertura do cone (graus) e ``area_width`` a
+    largura da linha.
+    """
     single_target: bool = True
     area_of_effect: bool = False
     area_radius: int = 0
     affects_allies: bool = False
     affects_enemies: bool = True
     self_target: bool = False
+    area_shape: AreaShape = AreaShape.RADIUS
+    area_angle: float = 90.0
+    area_width: float = 5.0
 
 @dataclass
 class EffectDuration:
@@ -67,58 +82,213 @@ class AbilityEffect:
         """Define um efeito customizado."""
         self.custom_effect = effect_func
 
+# Abaixo deste número de acertos o cálculo escalar é mais rápido que o NumPy
+_BATCH_THRESHOLD = 16
+
 class AbilityEffectManager:
-    def __init__(self):
-        self.active_effects: Dict[Character, List[AbilityEffect]] = {}
+    def __init__(self, scheduler: Optional[ExpirationScheduler] = None,
+                 damage_manager: Optional[DamageTypeManager] = None,
+                 condition_manager: Optional[ConditionManager] = None):
+        self.active_effects: Dict[int, List[AbilityEffect]] = {}
+        self.scheduler = scheduler if scheduler is not None else ExpirationScheduler()
+        # Só avança o relógio do agendador se ele for deste gerenciador
+        self._owns_scheduler = scheduler is None
+        self.damage_manager = damage_manager
+        self.condition_manager = condition_manager
+        # Expirações agendadas por (personagem, efeito)
+        self._expirations: Dict[Tuple[int, int], List[ScheduledExpiration]] = {}
+        # Tokens dos modificadores de cada aplicação, por (personagem, efeito)
+        self._modifiers: Dict[Tuple[int, int], List[Tuple[int, ...]]] = {}
         
-    def apply_effect(self, effect: AbilityEffect, target: Character) -> None:
+    def apply_effect(self, effect: AbilityEffect, target: Character) -> Dict[int, int]:
         """Aplica um efeito a um alvo."""
-        # Aplica dano
-        for damage_type, amount in effect.damage.items():
-            # Aqui integraria com o sistema de dano
-            pass
-            
-        # Aplica condições
-        for condition in effect.conditions:
-            # Aqui integraria com o sistema de condições
-            pass
-            
-        # Aplica modificadores de atributo
-        for stat, modifier in effect.stat_modifiers.items():
-            target.modify_stat(stat, modifier)
-            
-        # Aplica efeito customizado
-        if effect.custom_effect:
-            effect.custom_effect(target)
+        return self.apply_effects([(effect, [target])])
+        
+    def apply_effects(self, batch: Iterable[Tuple[AbilityEffect, Sequence[Character]]]
+                      ) -> Dict[int, int]:
+        """Aplica vários efeitos, cada um a seus alvos, em estágios.
+
+        1. Resolve os pares (efeito, alvo)
+        2. Calcula todo o dano de uma vez contra as resistências dos alvos
+        3. Aplica as condições
+        4. Aplica modificadores de atributo, efeitos customizados e registra
+           os efeitos com duração
+
+        Sem ``damage_manager`` o dano ignora resistências; sem
+        ``condition_manager`` as condições não são aplicadas. Retorna o dano
+        total causado a cada personagem (por ID).
+        """
+        pairs = [(effect, target) for effect, targets in batch for target in targets]
+        damage_dealt = self._apply_damage(pairs)
+        
+        if self.condition_manager is not None:
+            for effect, target in pairs:
+                for condition in effect.conditions:
+                    # Cada alvo recebe sua própria instância da condição
+                    self.condition_manager.add_condition(
+                        target, Condition(condition.type, condition.duration)
+                    )
+                    
+        for effect, target in pairs:
+            if effect.duration.instant:
+                # Efeitos instantâneos alteram o valor base permanentemente
+                for stat, modifier in effect.stat_modifiers.items():
+                    target.modify_stat(stat, modifier)
+            else:
+                self._add_modifiers(effect, target)
+            if effect.custom_effect:
+                effect.custom_effect(target)
+            # Registra efeito se não for instantâneo
+            if not effect.duration.instant:
+                if target.id not in self.active_effects:
+                    self.active_effects[target.id] = []
+                self.active_effects[target.id].append(effect)
+                if effect.duration.turns > 0 and not effect.duration.until_dispelled:
+                    self._schedule_expiration(effect, target, effect.duration.turns)
+        return damage_dealt
+        
+    def _apply_damage(self, pairs: List[Tuple[AbilityEffect, Character]]) -> Dict[int, int]:
+        """Calcula e aplica o dano de todos os pares; retorna o total por alvo."""
+        amounts: List[int] = []
+        damage_types: List[DamageType] = []
+        targets: List[Character] = []
+        for effect, target in pairs:
+            for damage_type, amount in effect.damage.items():
+                amounts.append(amount)
+                damage_types.append(damage_type)
+                targets.append(target)
+        if not targets:
+            return {}
+        
+        manager = self.damage_manager
+        if manager is None:
+            final = amounts
+        elif len(targets) < _BATCH_THRESHOLD:
+            final = [manager.calculate_damage(amount, damage_type, target)
+                     for amount, damage_type, target in zip(amounts, damage_types, targets)]
+        else:
+            final = manager.calculate_damage_batch(amounts, damage_types, targets).tolist()
             
-        # Registra efeito se não for instantâneo
-        if not effect.duration.instant:
-            if target not in self.active_effects:
-                self.active_effects[target] = []
-            self.active_effects[target].append(effect)
+        totals: Dict[int, int] = {}
+        characters: Dict[int, Character] = {}
+        for target, damage in zip(targets, final):
+            totals[target.id] = totals.get(target.id, 0) + damage
+            characters[target.id] = target
+        for key, damage in totals.items():
+            characters[key].take_damage(damage)
+        return totals
             
     def update_effects(self, character: Character) -> None:
-        """Atualiza os efeitos ativos em um personagem."""
-        if character not in self.active_effects:
-            return
-            
-        effects = self.active_effects[character]
-        for effect in effects[:]:
-            if effect.duration.turns > 0:
-                effect.duration.turns -= 1
-                if effect.duration.turns <= 0 and not effect.duration.until_dispelled:
-                    self.remove_effect(effect, character)
+        """Remove os efeitos expirados do personagem.
+
+        A duração do efeito não é alterada; o tempo restante fica no agendador
+        (ver ``get_remaining_turns``). Como em ``ConditionManager``, só avança o
+        turno do personagem se o agendador for deste gerenciador.
+        """
+        if self._owns_scheduler:
+            self.scheduler.advance(character.id)
+        else:
+            self.scheduler.expire_due(character.id)
                     
     def remove_effect(self, effect: AbilityEffect, character: Character) -> None:
         """Remove um efeito de um personagem."""
-        if character in self.active_effects:
-            if effect in self.active_effects[character]:
-                # Remove modificadores de atributo
-                for stat, modifier in effect.stat_modifiers.items():
-                    character.modify_stat(stat, -modifier)
-                
-                self.active_effects[character].remove(effect)
+        effects = self.active_effects.get(character.id)
+        if effects is not None:
+            if effect in effects:
+                key = (character.id, id(effect))
+                expirations = self._expirations.get(key)
+                if expirations:
+                    expirations.pop(0).cancel()
+                    if not expirations:
+                        del self._expirations[key]
+                self._detach_effect(effect, character)
                 
-    def get_active_effects(self, character: Character) -> List[AbilityEffect]:
+    def get_active_effects(self, character: CharacterRef) -> List[AbilityEffect]:
         """Retorna todos os efeitos ativos em um personagem."""
-        return self.active_effects.get(character, [])
\ No newline at end of file
+        return self.active_effects.get(character_id(character), [])
+        
+    def get_remaining_turns(self, effect: AbilityEffect, character: CharacterRef) -> Optional[int]:
+        """Retorna os turnos restantes de um efeito, ou None se ele não expira."""
+        expirations = self._expirations.get((character_id(character), id(effect)))
+        if not expirations:
+            return None
+        return expirations[0].remaining()
+        
+    def snapshot(self) -> tuple:
+        """Retorna os efeitos ativos como tupla imutável de (ID, ((efeito, turnos, tokens), ...)).
+
+        Os objetos ``AbilityEffect`` são compartilhados, não copiados; turnos é
+        ``None`` para efeitos sem expiração e tokens são os modificadores que a
+        aplicação criou na camada de efeitos.
+        """
+        snapshot = []
+        for key, effects in self.active_effects.items():
+            if not effects:
+                continue
+            seen: Dict[int, int] = {}
+            entries = []
+            for effect in effects:
+                expirations = self._expirations.get((key, id(effect)), ())
+                applications = self._modifiers.get((key, id(effect)), ())
+                index = seen.get(id(effect), 0)
+                seen[id(effect)] = index + 1
+                remaining = expirations[index].remaining() if index < len(expirations) else None
+                tokens = applications[index] if index < len(applications) else ()
+                entries.append((effect, remaining, tokens))
+            snapshot.append((key, tuple(entries)))
+        return tuple(snapshot)
+        
+    def restore(self, snapshot: tuple, characters: Dict[int, Character]) -> None:
+        """Restaura os efeitos de ``snapshot``.
+
+        Os atributos dos personagens são restaurados antes, e com eles os
+        modificadores que os efeitos tinham no snapshot: aqui só se retomam os
+        tokens registrados, sem mexer em outros modificadores da camada de
+        efeitos. O agendador também deve ter sido restaurado antes.
+        """
+        self.active_effects = {}
+        self._expirations = {}
+        self._modifiers = {}
+        for key, entries in snapshot:
+            character = characters.get(key)
+            if character is None:
+                continue
+            self.active_effects[key] = [effect for effect, _, _ in entries]
+            for effect, remaining, tokens in entries:
+                if tokens:
+                    self._modifiers.setdefault((key, id(effect)), []).append(tokens)
+                if remaining is not None:
+                    self._schedule_expiration(effect, character, remaining)
+        
+    def _schedule_expiration(self, effect: AbilityEffect, target: Character, turns: int) -> None:
+        key = (target.id, id(effect))
+        expirations = self._expirations.setdefault(key, [])
+
+        def expire() -> None:
+            expirations.remove(entry)
+            if not expirations:
+                del self._expirations[key]
+            self._detach_effect(effect, target)
+
+        entry = self.scheduler.schedule(target.id, turns, expire)
+        expirations.append(entry)
+        
+    def _add_modifiers(self, effect: AbilityEffect, target: Character) -> None:
+        """Adiciona os modificadores de uma aplicação do efeito na camada de efeitos."""
+        if effect.stat_modifiers:
+            self._modifiers.setdefault((target.id, id(effect)), []).append(tuple(
+                target.add_modifier(stat, modifier, ModifierLayer.EFFECTS)
+                for stat, modifier in effect.stat_modifiers.items()
+            ))
+        
+    def _detach_effect(self, effect: AbilityEffect, character: Character) -> None:
+        """Retira o efeito do personagem e remove seus modificadores."""
+        key = (character.id, id(effect))
+        applications = self._modifiers.get(key)
+        if applications:
+            for token in applications.pop(0):
+                character.remove_modifier(token)
+            if not applications:
+                del self._modifiers[key]
+        
+        self.active_effects[character.id].remove(effect)
@@ -0,0 +1,272 @@
+from typing import List, Dict, Optional, Iterator, Iterable, NamedTuple, BinaryIO, Any
+from typing import TYPE_CHECKING
+from array import array
+import struct
+import sys
+from ..character.character import Character
+
+if TYPE_CHECKING:
+    from .combat_state import CombatState
+
+# Colunas do log e seus typecodes de array
+EVENT_COLUMNS = (
+    ('actor_id', 'q'),
+    ('target_id', 'q'),
+    ('action_type', 'H'),
+    ('damage_type', 'H'),
+    ('amount', 'i'),
+    ('round', 'I'),
+    ('turn', 'I'),
+)
+
+NO_TARGET = -1
+
+# Tipos de ação com tratamento próprio no replay; os demais aplicam ``amount`` como dano
+INITIATIVE_ACTION = 'initiative'  # amount = rolagem de iniciativa do ator
+HEAL_ACTION = 'heal'              # amount = pontos de vida curados no alvo
+CONDITION_ACTION = 'condition'    # damage_type = ConditionType, amount = duração
+
+_CHUNK_MAGIC = b'DKCL'
+_CHUNK_VERSION = 1
+_CHUNK_HEADER = struct.Struct('<4sHII')
+_STRING_LENGTH = struct.Struct('<H')
+
+class CombatEvent(NamedTuple):
+    """Linha do log de combate."""
+    actor_id: int
+    target_id: Optional[int]
+    action_type: str
+    damage_type: Optional[str]
+    amount: int
+    round: int
+    turn: int
+
+class CombatEventLog:
+    """Log de eventos de combate em colunas, apenas de inserção.
+
+    Cada coluna é um ``array`` tipado; tipos de ação e de dano são guardados
+    como códigos de uma tabela de strings (o código 0 representa ``None``).
+    Com ``path`` definido, o log é descarregado em blocos binários no disco a
+    cada ``chunk_size`` eventos.
+    """
+
+    def __init__(self, path: Optional[str] = None, chunk_size: int = 4096):
+        self.path = path
+        self.chunk_size = chunk_size
+        self.columns: Dict[str, array] = {name: array(code) for name, code in EVENT_COLUMNS}
+        self.strings: List[Optional[str]] = [None]
+        self._string_codes: Dict[str, int] = {}
+        self._flushed_strings = 1
+        self.flushed_events = 0
+
+    def __len__(self) -> int:
+        return len(self.columns['actor_id'])
+
+    def append(self, actor_id: int, target_id: Optional[int], action_type: str,
+               damage_type: Optional[str], amount: int, round_number: int,
+               turn_number: int) -> None:
+        """Adiciona um evento ao log."""
+        columns = self.columns
+        columns['actor_id'].append(actor_id)
+        columns['target_id'].append(NO_TARGET if target_id is None else target_id)
+        columns['action_type'].append(self._intern(action_type))
+        columns['damage_type'].append(self._intern(damage_type))
+        columns['amount'].append(amount)
+        columns['round'].append(round_number)
+        columns['turn'].append(turn_number)
+        if self.path is not None and len(self) >= self.chunk_size:
+            self.flush()
+
+    def append_action(self, action: Any, round_number: int, turn_number: int) -> None:
+        """Adiciona um ``CombatAction`` ao log."""
+        damage_type = action.damage_type
+        if damage_type is not None and not isinstance(damage_type, str):
+            damage_type = damage_type.name
+        self.append(
+            action.actor.id,
+            action.target.id if action.target is not None else None,
+            action.action_type,
+            damage_type,
+            action.damage_amount,
+            round_number,
+            turn_number
+        )
+
+    def events(self) -> Iterator[CombatEvent]:
+        """Itera sobre os eventos em memória."""
+        strings = self.strings
+        for actor, target, action, damage, amount, round_number, turn in zip(
+                *(self.columns[name] for name, _ in EVENT_COLUMNS)):
+            yield CombatEvent(actor, None if target == NO_TARGET else target,
+                              strings[action], strings[damage], amount, round_number, turn)
+
+    def to_dict(self) -> Dict[str, list]:
+        """Exporta as colunas em memória como listas (tipos decodificados)."""
+        strings = self.strings
+        data = {name: self.columns[name].tolist() for name, _ in EVENT_COLUMNS}
+        data['action_type'] = [strings[code] for code in data['action_type']]
+        data['damage_type'] = [strings[code] for code in data['damage_type']]
+        return data
+
+    def clear(self) -> None:
+        """Descarta os eventos em memória (a tabela de strings é mantida)."""
+        for column in self.columns.values():
+            del column[:]
+
+    def truncate(self, total_events: int) -> None:
+        """Descarta os eventos além de ``total_events`` que ainda estão em memória."""
+        keep = max(0, total_events - self.flushed_events)
+        if keep < len(self):
+            for column in self.columns.values():
+                del column[keep:]
+
+    def flush(self, path: Optional[str] = None) -> int:
+        """Grava os eventos em memória como um bloco no fim do arquivo e os descarta.
+
+        Retorna o número de eventos gravados.
+        """
+        path = path or self.path
+        if path is None:
+            raise ValueError("Nenhum arquivo definido para o log de combate")
+        rows = len(self)
+        if rows == 0:
+            return 0
+        with open(path, 'ab') as stream:
+            self._write_chunk(stream, rows)
+        self.flushed_events += rows
+        self.clear()
+        return rows
+
+    def _write_chunk(self, stream: BinaryIO, rows: int) -> None:
+        new_strings = self.strings[self._flushed_strings:]
+        stream.write(_CHUNK_HEADER.pack(_CHUNK_MAGIC, _CHUNK_VERSION, rows, len(new_strings)))
+        for value in new_strings:
+            # Só a posição 0 (None) fica fora dos chunks; ela nunca é escrita
+            encoded = (value or '').encode('utf-8')
+            stream.write(_STRING_LENGTH.pack(len(encoded)))
+            stream.write(encoded)
+        for name, _ in EVENT_COLUMNS:
+            column = self.columns[name]
+            if sys.byteorder == 'big':
+                column = array(column.typecode, column)
+                column.byteswap()
+            stream.write(column.tobytes())
+        self._flushed_strings = len(self.strings)
+
+    def _intern(self, value: Optional[str]) -> int:
+        if value is None:
+            return 0
+        code = self._string_codes.get(value)
+        if code is None:
+            code = len(self.strings)
+            self.strings.append(value)
+            self._string_codes[value] = code
+        return code
+
+    @staticmethod
+    def iter_chunks(path: str) -> Iterator['CombatEventLog']:
+        """Lê um arquivo de log bloco a bloco, sem carregar tudo na memória."""
+        strings: List[Optional[str]] = [None]
+        with open(path, 'rb') as stream:
+            while True:
+                header = stream.read(_CHUNK_HEADER.size)
+                if not header:
+                    return
+                magic, version, rows, string_count = _CHUNK_HEADER.unpack(header)
+                if magic != _CHUNK_MAGIC or version != _CHUNK_VERSION:
+                    raise ValueError(f"Bloco de log de combate inválido em {path}")
+                for _ in range(string_count):
+                    (length,) = _STRING_LENGTH.unpack(stream.read(_STRING_LENGTH.size))
+                    strings.append(stream.read(length).decode('utf-8'))
+
+                chunk = CombatEventLog()
+                chunk.strings = list(strings)
+                chunk._string_codes = {s: i for i, s in enumerate(strings) if s is not None}
+                for name, _ in EVENT_COLUMNS:
+                    column = chunk.columns[name]
+                    column.frombytes(stream.read(rows * column.itemsize))
+                    if sys.byteorder == 'big':
+                        column.byteswap()
+                yield chunk
+
+    @classmethod
+    def load(cls, path: str) -> 'CombatEventLog':
+        """Carrega todos os blocos de um arquivo num único log em memória."""
+        log = cls()
+        for chunk in cls.iter_chunks(path):
+            log.strings = chunk.strings
+            log._string_codes = chunk._string_codes
+            for name, _ in EVENT_COLUMNS:
+                log.columns[name].extend(chunk.columns[name])
+        log._flushed_strings = len(log.strings)
+        return log
+
+def replay(events: Iterable[CombatEvent], participants: List[Character],
+           apply_damage: bool = True) -> 'CombatState':
+    """Reconstrói um CombatState a partir de eventos do log.
+
+    Os participantes devem estar no estado do início do combate. A ordem de
+    iniciativa vem dos eventos de iniciativa registrados (sem rolar de novo) e
+    os turnos avançam com ``next_turn`` até o turno de cada evento, então
+    rounds e expirações seguem o combate original;
+    com ``apply_damage``, dano, cura e condições registrados são aplicados aos
+    alvos conforme o tipo de ação.
+    """
+    from .combat_state import CombatState, CombatAction
+
+    by_id = {participant.id: participant for participant in participants}
+    state = CombatState()
+    rolls: Dict[int, int] = {}
+    started = False
+    for event in events:
+        if event.action_type == INITIATIVE_ACTION:
+            if not started:
+                rolls[event.actor_id] = event.amount
+            else:
+                _advance_to(state, event.turn)
+                state.add_participant(by_id[event.actor_id], event.amount)
+            continue
+        if not started:
+            _start_replay(state, participants, by_id, rolls)
+            started = True
+        _advance_to(state, event.turn)
+        target = by_id.get(event.target_id) if event.target_id is not None else None
+        action = CombatAction(
+            actor=by_id[event.actor_id],
+            target=target,
+            action_type=event.action_type,
+            damage_type=event.damage_type,
+            damage_amount=event.amount
+        )
+        state.record_action(action)
+        if apply_damage and target is not None:
+            _apply_event(state, event, target)
+    if not started:
+        _start_replay(state, participants, by_id, rolls)
+    return state
+
+def _start_replay(state: 'CombatState', participants: List[Character],
+                  by_id: Dict[int, Character], rolls: Dict[int, int]) -> None:
+    """Inicia o combate do replay com as rolagens registradas."""
+    if rolls:
+        state.start_combat([by_id[cid] for cid in rolls], rolls)
+    else:
+        # Log sem iniciativa registrada: mantém a ordem dos participantes
+        state.start_combat(list(participants), {p.id: 0 for p in participants})
+
+def _advance_to(state: 'CombatState', turn: int) -> None:
+    """Avança os turnos do replay até ``turn``, expirando condições e efeitos no caminho."""
+    while state.turn_number < turn:
+        state.next_turn()
+
+def _apply_event(state: 'CombatState', event: CombatEvent, target: Character) -> None:
+    """Aplica ao alvo o efeito de um evento, conforme o tipo de ação."""
+    if event.action_type == HEAL_ACTION:
+        target.heal(event.amount)
+    elif event.action_type == CONDITION_ACTION:
+        from .condition import Condition, ConditionType
+        if event.damage_type is not None:
+            condition = Condition(ConditionType[event.damage_type], event.amount)
+            state.condition_manager.add_condition(target, condition)
+    elif event.amount > 0:
+        target.take_damage(event.amount)
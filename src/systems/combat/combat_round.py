@@ -1,8 +1,10 @@
-from typing import List, Dict, Optional, Set
-from dataclasses import dataclass
-from enum import Enum, auto
-from ..character.character import Character
-from .combat_state import CombatState, CombatAction
+from typing import List, Dict, Optional, Set, Union, Callable
+from dataclasses import replace
+import random
+from enum import Enum, IntFlag, auto
+from ..character.character import Character, CharacterRef, character_id
+from .combat_state import CombatState, CombatAction, CombatSnapshot
+from .condition import ConditionFlag
 
 class ActionType(Enum):
     STANDARD = auto()
@@ -11,20 +13,76 @@ class ActionType(Enum):
     MOVEMENT = auto()
     FREE = auto()
 
-@dataclass
-class ActionUsage:
-    """Controla o uso de ações em um turno."""
-    standard_action: bool = False
-    bonus_action: bool = False
-    reaction: bool = False
-    movement: bool = False
+class ActionUsage(IntFlag):
+    """Ações usadas em um turno, como bits de uma máscara."""
+    NONE = 0
+    STANDARD = auto()
+    BONUS = auto()
+    REACTION = auto()
+    MOVEMENT = auto()
+
+# Bit de cada tipo de ação; ações livres não têm bit e estão sempre disponíveis
+ACTION_BITS: Dict[ActionType, int] = {
+    ActionType.STANDARD: ActionUsage.STANDARD.value,
+    ActionType.BONUS: ActionUsage.BONUS.value,
+    ActionType.REACTION: ActionUsage.REACTION.value,
+    ActionType.MOVEMENT: ActionUsage.MOVEMENT.value,
+    ActionType.FREE: 0,
+}
+
+_REACTION = ActionUsage.REACTION.value
+# Bits baixos do registro de uso guardam a máscara; os altos, a geração (round)
+_STAMP_SHIFT = 8
+_USAGE_MASK = (1 << _STAMP_SHIFT) - 1
+_TURN_COMPLETE = ActionUsage.STANDARD.value | ActionUsage.MOVEMENT.value
+_ALL_ACTIONS = sum(ACTION_BITS.values())
+_CANT_MOVE = ConditionFlag.CANT_MOVE.value
+_CANT_ATTACK = ConditionFlag.CANT_ATTACK.value
+_CANT_CAST = ConditionFlag.CANT_CAST.value
+_RESTRICTION_FLAGS = _CANT_MOVE | _CANT_ATTACK | _CANT_CAST
+
+# Ações disponíveis para cada máscara de ações bloqueadas
+_AVAILABLE_ACTIONS = tuple(
+    tuple(action for action, bit in ACTION_BITS.items() if not mask & bit)
+    for mask in range(_ALL_ACTIONS + 1)
+)
+
+def _restrictions(condition_flags: int) -> int:
+    blocked = 0
+    if condition_flags & _CANT_MOVE:
+        blocked |= ActionUsage.MOVEMENT.value
+    if condition_flags & _CANT_ATTACK:
+        # Sem ataques, inclusive os de oportunidade
+        blocked |= ActionUsage.STANDARD.value | _REACTION
+        if condition_flags & _CANT_CAST:
+            # Incapacitado (atordoado): nem ataca nem conjura, só ações livres
+            blocked |= ActionUsage.BONUS.value
+    return blocked
+
+# Ações impedidas para cada combinação de restrições de condições
+_RESTRICTED_ACTIONS = tuple(_restrictions(flags) for flags in range(_RESTRICTION_FLAGS + 1))
+
+def restricted_actions(condition_flags: int) -> int:
+    """Converte uma máscara de ``ConditionFlag`` nas ações que ela impede.
+
+    ``CANT_MOVE`` impede o movimento e ``CANT_ATTACK`` as ações padrão e as
+    reações; com ``CANT_CAST`` também, sobram apenas as ações livres. Só
+    ``CANT_CAST`` não impede nenhum tipo de ação: a ação padrão ainda serve
+    para atacar.
+    """
+    return _RESTRICTED_ACTIONS[condition_flags & _RESTRICTION_FLAGS]
 
 class CombatRound:
     def __init__(self, combat_state: CombatState):
         self.combat_state = combat_state
         self.round_number = 0
-        self.action_usage: Dict[Character, ActionUsage] = {}
-        self.reaction_opportunities: Dict[Character, Set[str]] = {}
+        # Registro de uso por personagem: geração << _STAMP_SHIFT | máscara de ActionUsage.
+        # Registros de gerações anteriores valem como vazios.
+        self._usage: Dict[int, int] = {}
+        self._stamp = 0
+        self.reaction_opportunities: Dict[int, Set[str]] = {}
+        # Índice invertido: gatilho -> IDs que registraram o gatilho e ainda têm reação
+        self.reactors: Dict[str, Set[int]] = {}
         
     def start_round(self) -> None:
         """Inicia um novo round de combate."""
@@ -32,60 +90,86 @@ class CombatRound:
         self.reset_actions()
         
     def reset_actions(self) -> None:
-        """Reseta o uso de ações para todos os participantes."""
-        self.action_usage.clear()
-        for participant in self.combat_state.participants:
-            self.action_usage[participant] = ActionUsage()
-        self.reaction_opportunities.clear()
+        """Reseta o uso de ações para todos os participantes.
+
+        Custo O(1): apenas a geração avança, e os registros antigos passam a
+        ser ignorados.
+        """
+        self._stamp += 1 << _STAMP_SHIFT
+        self.reaction_opportunities = {}
+        self.reactors = {}
+        
+    @property
+    def action_usage(self) -> Dict[int, int]:
+        """Máscara de ActionUsage de quem usou ações neste round (cópia)."""
+        stamp = self._stamp
+        return {key: value & _USAGE_MASK for key, value in self._usage.items() if value >= stamp}
+        
+    def _used_actions(self, key: int) -> int:
+        """Máscara das ações usadas neste round."""
+        value = self._usage.get(key, 0)
+        return value & _USAGE_MASK if value >= self._stamp else 0
+        
+    def _blocked_actions(self, key: int) -> int:
+        """Máscara das ações já usadas ou impedidas por condições."""
+        flags = self.combat_state.condition_manager.flags.get(key, 0)
+        return self._used_actions(key) | restricted_actions(flags)
         
-    def can_take_action(self, character: Character, action_type: ActionType) -> bool:
+    def can_take_action(self, character: CharacterRef, action_type: ActionType) -> bool:
         """Verifica se um personagem pode realizar uma ação específica."""
-        if character not in self.action_usage:
-            self.action_usage[character] = ActionUsage()
-            
-        usage = self.action_usage[character]
-        
-        if action_type == ActionType.STANDARD:
-            return not usage.standard_action
-        elif action_type == ActionType.BONUS:
-            return not usage.bonus_action
-        elif action_type == ActionType.REACTION:
-            return not usage.reaction
-        elif action_type == ActionType.MOVEMENT:
-            return not usage.movement
-        return True
+        return not self._blocked_actions(character_id(character)) & ACTION_BITS[action_type]
         
-    def use_action(self, character: Character, action_type: ActionType) -> bool:
+    def use_action(self, character: CharacterRef, action_type: ActionType) -> bool:
         """Marca uma ação como usada."""
-        if not self.can_take_action(character, action_type):
+        key = character_id(character)
+        bit = ACTION_BITS[action_type]
+        if self._blocked_actions(key) & bit:
             return False
-            
-        usage = self.action_usage[character]
-        
-        if action_type == ActionType.STANDARD:
-            usage.standard_action = True
-        elif action_type == ActionType.BONUS:
-            usage.bonus_action = True
-        elif action_type == ActionType.REACTION:
-            usage.reaction = True
-        elif action_type == ActionType.MOVEMENT:
-            usage.movement = True
-            
+        self._usage[key] = self._stamp | self._used_actions(key) | bit
+        if bit == _REACTION:
+            self._drop_reactor(key)
         return True
         
-    def register_reaction_opportunity(self, character: Character, trigger: str) -> None:
+    def register_reaction_opportunity(self, character: CharacterRef, trigger: str) -> None:
         """Registra uma oportunidade de reação para um personagem."""
-        if character not in self.reaction_opportunities:
-            self.reaction_opportunities[character] = set()
-        self.reaction_opportunities[character].add(trigger)
+        key = character_id(character)
+        if key not in self.reaction_opportunities:
+            self.reaction_opportunities[key] = set()
+        self.reaction_opportunities[key].add(trigger)
+        if not self._used_actions(key) & _REACTION:
+            self.reactors.setdefault(trigger, set()).add(key)
         
-    def can_react_to(self, character: Character, trigger: str) -> bool:
+    def _drop_reactor(self, key: int) -> None:
+        """Retira do índice um personagem que usou sua reação."""
+        for trigger in self.reaction_opportunities.get(key, ()):
+            reactors = self.reactors.get(trigger)
+            if reactors is not None:
+                reactors.discard(key)
+                if not reactors:
+                    del self.reactors[trigger]
+        
+    def get_reactors(self, trigger: str) -> List[Character]:
+        """Personagens que podem reagir a ``trigger`` agora, em ordem de iniciativa.
+
+        Usa o índice invertido: o custo depende de quantos registraram o
+        gatilho, não do número de participantes.
+        """
+        reactors = self.reactors.get(trigger)
+        if not reactors:
+            return []
+        blocked = self._blocked_actions
+        return self.combat_state.initiative.order_participants(
+            key for key in reactors if not blocked(key) & _REACTION
+        )
+        
+    def can_react_to(self, character: CharacterRef, trigger: str) -> bool:
         """Verifica se um personagem pode reagir a um gatilho específico."""
         if not self.can_take_action(character, ActionType.REACTION):
             return False
-        return character in self.reaction_opportunities and trigger in self.reaction_opportunities[character]
+        triggers = self.reaction_opportunities.get(character_id(character))
+        return triggers is not None and trigger in triggers
         
-    def process_reaction(self, character: Character, trigger: str, action: CombatAction) -> bool:
+    def process_reaction(self, character: CharacterRef, trigger: str, action: CombatAction) -> bool:
         """Processa uma reação de um personagem."""
         if not self.can_react_to(character, trigger):
             return False
@@ -94,17 +178,70 @@ class CombatRound:
         self.combat_state.record_action(action)
         return True
         
-    def get_available_actions(self, character: Character) -> List[ActionType]:
+    def dispatch_trigger(self, trigger: str,
+                         action: Union[CombatAction,
+                                       Callable[[Character], Optional[CombatAction]]]
+                         ) -> List[Character]:
+        """Processa as reações de todos que podem reagir a ``trigger``, em ordem de iniciativa.
+
+        ``action`` é um ``CombatAction`` usado como modelo (o ator passa a ser
+        quem reage) ou uma função que recebe quem reage e retorna a ação, ou
+        None para abrir mão da reação. Retorna os personagens que reagiram.
+        """
+        reacted = []
+        for reactor in self.get_reactors(trigger):
+            reaction: Optional[CombatAction]
+            if isinstance(action, CombatAction):
+                reaction = replace(action, actor=reactor)
+            else:
+                reaction = action(reactor)
+            if reaction is not None and self.process_reaction(reactor, trigger, reaction):
+                reacted.append(reactor)
+        return reacted
+        
+    def get_available_actions(self, character: CharacterRef) -> List[ActionType]:
         """Retorna a lista de ações disponíveis para um personagem."""
-        available = []
-        for action_type in ActionType:
-            if self.can_take_action(character, action_type):
-                available.append(action_type)
-        return available
+        return list(_AVAILABLE_ACTIONS[self._blocked_actions(character_id(character))])
         
-    def is_turn_complete(self, character: Character) -> bool:
+    def is_turn_complete(self, character: CharacterRef) -> bool:
         """Verifica se um personagem completou todas as ações principais do turno."""
-        if character not in self.action_usage:
-            return False
-        usage = self.action_usage[character]
-        return usage.standard_action and usage.movement
\ No newline at end of file
+        usage = self._used_actions(character_id(character))
+        return usage & _TURN_COMPLETE == _TURN_COMPLETE
+        
+    def snapshot_actions(self) -> tuple:
+        """Retorna o uso de ações e as oportunidades de reação como tupla imutável."""
+        return (
+            self.round_number,
+            tuple(self.action_usage.items()),
+            tuple((key, frozenset(triggers))
+                  for key, triggers in self.reaction_opportunities.items())
+        )
+        
+    def restore_actions(self, snapshot: tuple) -> None:
+        """Restaura um estado salvo por ``snapshot_actions``."""
+        self.round_number, usage, reactions = snapshot
+        self._usage = {key: self._stamp | mask for key, mask in usage}
+        self.reaction_opportunities = {key: set(triggers) for key, triggers in reactions}
+        self.reactors = {}
+        for key, triggers in self.reaction_opportunities.items():
+            if not self._used_actions(key) & _REACTION:
+                for trigger in triggers:
+                    self.reactors.setdefault(trigger, set()).add(key)
+        
+    def snapshot(self) -> CombatSnapshot:
+        """Captura o estado completo do combate, incluindo este round."""
+        return self.combat_state.snapshot(self)
+        
+    def restore(self, snapshot: CombatSnapshot) -> None:
+        """Restaura o combate e o round para ``snapshot``."""
+        self.combat_state.restore(snapshot)
+        if snapshot.combat_round is not None:
+            self.restore_actions(snapshot.combat_round)
+            
+    def fork(self, rng: Optional[random.Random] = None) -> 'CombatRound':
+        """Cria uma cópia independente do round e do combate, para busca."""
+        snapshot = self.snapshot()
+        fork = CombatRound(self.combat_state.fork_from(snapshot, rng))
+        if snapshot.combat_round is not None:
+            fork.restore_actions(snapshot.combat_round)
+        return fork
\ No newline at end of file
@@ -1,11 +1,16 @@
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple, Any, Collection, Mapping
+import random
+from hashlib import blake2b
 from enum import Enum, auto
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass
 from ..character.character import Character
 from .initiative import Initiative
 from .condition import ConditionManager
 from .damage_type import DamageTypeManager
-from .ability_effect import AbilityEffectManager
+from .ability_effect import AbilityEffect, AbilityEffectManager
+from .expiration import ExpirationScheduler
+from .combat_log import CombatEventLog, INITIATIVE_ACTION
+from .spatial import SpatialIndex, Point
 
 class CombatPhase(Enum):
     NOT_STARTED = auto()
@@ -23,22 +28,71 @@ class CombatAction:
     damage_amount: int = 0
     ability_name: Optional[str] = None
 
+@dataclass(frozen=True)
+class CombatSnapshot:
+    """Estado completo e imutável de um combate.
+
+    Criado por ``CombatState.snapshot``/``CombatRound.snapshot``. As partes
+    que não mudam durante o combate (efeitos, condições, resistências) são
+    compartilhadas em vez de copiadas.
+    """
+    phase: CombatPhase
+    round_number: int
+    turn_number: int
+    participants: Tuple[Character, ...]
+    stats: Tuple[tuple, ...]
+    history_length: int
+    event_count: int
+    initiative: tuple
+    scheduler: tuple
+    conditions: tuple
+    resistances: tuple
+    effects: tuple
+    combat_round: Optional[tuple] = None
+    positions: tuple = ()
+    rng_state: Optional[Any] = None
+
+def _effect_key(effect: AbilityEffect) -> tuple:
+    """Identidade de um efeito pelo conteúdo, independente do endereço em memória."""
+    custom = effect.custom_effect
+    return (
+        effect.effect_type.name, astuple(effect.target), astuple(effect.duration),
+        tuple(sorted((kind.name, amount) for kind, amount in effect.damage.items())),
+        tuple(sorted(effect.stat_modifiers.items())),
+        tuple((condition.type.name, condition.duration) for condition in effect.conditions),
+        getattr(custom, '__qualname__', None)
+    )
+
 class CombatState:
-    def __init__(self):
+    def __init__(self, rng: Optional[random.Random] = None):
         self.phase = CombatPhase.NOT_STARTED
         self.round_number = 0
-        self.initiative = Initiative()
-        self.condition_manager = ConditionManager()
+        self.turn_number = 0
+        self.initiative = Initiative(rng)
+        # Agendador compartilhado de expirações de condições e efeitos
+        self.scheduler = ExpirationScheduler()
+        self.condition_manager = ConditionManager(self.scheduler)
         self.damage_type_manager = DamageTypeManager()
-        self.effect_manager = AbilityEffectManager()
+        self.effect_manager = AbilityEffectManager(self.scheduler, self.damage_type_manager,
+                                                   self.condition_manager)
         self.participants: List[Character] = []
         self.action_history: List[CombatAction] = []
+        self.event_log = CombatEventLog()
+        # Posições dos combatentes, para efeitos de área
+        self.spatial_index = SpatialIndex()
         
-    def start_combat(self, participants: List[Character]) -> None:
-        """Inicia o combate com os participantes especificados."""
+    def start_combat(self, participants: List[Character],
+                     rolls: Optional[Mapping[int, int]] = None) -> None:
+        """Inicia o combate com os participantes especificados.
+
+        As rolagens de iniciativa (ou as de ``rolls``) são registradas no log de
+        eventos, para que ``replay`` reconstrua a mesma ordem.
+        """
         self.participants = participants
         self.phase = CombatPhase.INITIATIVE
-        self.initiative.roll_initiative(participants)
+        self.initiative.roll_initiative(participants, rolls)
+        for participant in self.initiative.get_initiative_order():
+            self._record_initiative(participant)
         self.round_number = 1
         self.phase = CombatPhase.COMBAT
         
@@ -47,14 +101,22 @@ class CombatState:
         self.phase = CombatPhase.ENDED
         self.participants.clear()
         self.action_history.clear()
+        if self.event_log.path is not None:
+            # O último bloco incompleto também vai para o disco
+            self.event_log.flush()
+        self.event_log.clear()
+        self.spatial_index.clear()
         
-    def next_turn(self) -> Character:
+    def next_turn(self) -> Optional[Character]:
         """Avança para o próximo turno e retorna o personagem atual."""
         current_character = self.initiative.next_turn()
+        self.turn_number += 1
+        # Voltar ao início da ordem de iniciativa abre um novo round
+        if current_character and self.initiative.wrapped:
+            self.round_number += 1
         if current_character:
-            # Atualiza efeitos e condições
-            self.effect_manager.update_effects(current_character)
-            self.condition_manager.update_conditions(current_character)
+            # Expira efeitos e condições que vencem neste turno
+            self.scheduler.advance(current_character.id)
         return current_character
         
     def get_current_character(self) -> Optional[Character]:
@@ -62,8 +124,9 @@ class CombatState:
         return self.initiative.get_current_character()
         
     def record_action(self, action: CombatAction) -> None:
-        """Registra uma ação no histórico de combate."""
+        """Registra uma ação no histórico e no log de eventos do combate."""
         self.action_history.append(action)
+        self.event_log.append_action(action, self.round_number, self.turn_number)
         
     def get_action_history(self) -> List[CombatAction]:
         """Retorna o histórico de ações do combate."""
@@ -82,24 +145,166 @@ class CombatState:
         if character in self.participants:
             self.participants.remove(character)
             self.initiative.remove_participant(character)
+            self.spatial_index.remove(character)
             
-    def add_participant(self, character: Character) -> None:
+    def add_participant(self, character: Character, roll: Optional[int] = None) -> None:
         """Adiciona um novo participante ao combate."""
         if character not in self.participants:
             self.participants.append(character)
-            self.initiative.add_participant(character)
+            self.initiative.add_participant(character, roll)
+            self._record_initiative(character)
+
+    def _record_initiative(self, character: Character) -> None:
+        roll = self.initiative.get_initiative(character)
+        if roll is not None:
+            self.event_log.append(character.id, None, INITIATIVE_ACTION, None, roll,
+                                  self.round_number, self.turn_number)
             
+    def move_participant(self, character: Character, x: float, y: float) -> None:
+        """Coloca ou move um participante para a posição ``(x, y)``."""
+        self.spatial_index.place(character, x, y)
+        
+    def get_area_targets(self, effect: AbilityEffect, origin: Point,
+                         direction: Optional[Point] = None,
+                         caster: Optional[Character] = None,
+                         allies: Optional[Collection[int]] = None) -> List[Character]:
+        """Resolve os personagens atingidos por um efeito de área.
+
+        A forma vem de ``effect.target`` (raio, cone ou linha); cones e linhas
+        precisam de ``direction``. O conjurador só é incluído com
+        ``self_target``, e com ``allies`` (IDs dos aliados do conjurador) os
+        alvos são filtrados por ``affects_allies``/``affects_enemies``.
+        """
+        target = effect.target
+        targets = self.spatial_index.query_area(target, origin, direction)
+        if caster is not None and not target.self_target:
+            targets = [t for t in targets if t.id != caster.id]
+        if allies is not None:
+            targets = [
+                t for t in targets
+                if (target.affects_allies if t.id in allies else target.affects_enemies)
+            ]
+        return targets
+        
     def save_state(self) -> Dict:
         """Salva o estado atual do combate."""
         return {
             'phase': self.phase.name,
             'round_number': self.round_number,
+            'turn_number': self.turn_number,
             'participants': [p.name for p in self.participants],
-            'action_history': [(a.actor.name, a.action_type) for a in self.action_history]
+            'action_history': [(a.actor.name, a.action_type) for a in self.action_history],
+            'event_log': self.event_log.to_dict()
         }
         
+    def snapshot(self, combat_round: Optional[Any] = None) -> CombatSnapshot:
+        """Captura o estado completo do combate (e do round, se informado)."""
+        return CombatSnapshot(
+            phase=self.phase,
+            round_number=self.round_number,
+            turn_number=self.turn_number,
+            participants=tuple(self.participants),
+            stats=tuple(p.snapshot_stats() for p in self.participants),
+            history_length=len(self.action_history),
+            event_count=self.event_log.flushed_events + len(self.event_log),
+            initiative=self.initiative.snapshot(),
+            scheduler=self.scheduler.snapshot(),
+            conditions=self.condition_manager.snapshot(),
+            resistances=self.damage_type_manager.snapshot(),
+            effects=self.effect_manager.snapshot(),
+            combat_round=combat_round.snapshot_actions() if combat_round is not None else None,
+            positions=self.spatial_index.snapshot(),
+            rng_state=self.initiative.rng.getstate()
+        )
+        
+    def restore(self, snapshot: CombatSnapshot,
+                characters: Optional[Dict[int, Character]] = None,
+                restore_rng: bool = True) -> None:
+        """Restaura o combate para ``snapshot``.
+
+        Sem ``characters``, os próprios personagens do snapshot têm seus
+        atributos restaurados; com ``characters`` (ID -> personagem), o estado
+        é aplicado a esses personagens, como em ``fork``. Com ``restore_rng``,
+        o gerador aleatório volta à posição do snapshot e as próximas rolagens
+        se repetem.
+        """
+        if characters is None:
+            characters = {p.id: p for p in snapshot.participants}
+        participants = [characters[p.id] for p in snapshot.participants]
+        for participant, stats in zip(participants, snapshot.stats):
+            participant.restore_stats(stats)
+
+        self.phase = snapshot.phase
+        self.round_number = snapshot.round_number
+        self.turn_number = snapshot.turn_number
+        self.participants = participants
+        del self.action_history[snapshot.history_length:]
+        self.event_log.truncate(snapshot.event_count)
+        self.initiative.restore(snapshot.initiative, characters)
+        self.scheduler.restore(snapshot.scheduler)
+        self.condition_manager.restore(snapshot.conditions, characters)
+        self.damage_type_manager.restore(snapshot.resistances)
+        self.effect_manager.restore(snapshot.effects, characters)
+        self.spatial_index.restore(snapshot.positions, characters)
+        if restore_rng and snapshot.rng_state is not None:
+            self.initiative.rng.setstate(snapshot.rng_state)
+        
+    def state_hash(self, combat_round: Optional[Any] = None) -> int:
+        """Hash do estado de jogo, para tabelas de transposição da IA.
+
+        Considera atributos, cursor da iniciativa, condições, efeitos ativos,
+        posições e o uso de ações do round; ignora histórico, contadores e
+        resistências. É um blake2b sobre uma codificação canônica (IDs, nomes
+        de enums e números), então o valor é o mesmo em qualquer processo.
+        """
+        conditions = tuple(
+            (key, tuple((kind.name, duration) for kind, duration in entries))
+            for key, entries in self.condition_manager.snapshot()
+        )
+        effects = tuple(
+            (key, tuple((_effect_key(effect), turns) for effect, turns, _ in entries))
+            for key, entries in self.effect_manager.snapshot()
+        )
+        actions = None
+        if combat_round is not None:
+            _, usage, reactions = combat_round.snapshot_actions()
+            actions = (tuple(sorted(usage)),
+                       tuple(sorted((key, tuple(sorted(triggers))) for key, triggers in reactions)))
+        encoded = repr((
+            self.initiative.current_index,
+            tuple(tuple(sorted(p.stats.items())) for p in self.participants),
+            conditions,
+            effects,
+            actions,
+            self.spatial_index.snapshot()
+        )).encode()
+        return int.from_bytes(blake2b(encoded, digest_size=8).digest(), 'big')
+        
+    def fork(self, rng: Optional[random.Random] = None) -> 'CombatState':
+        """Cria um combate independente a partir do estado atual, para busca.
+
+        Os participantes são clonados (apenas atributos são copiados) e o
+        histórico de ações não é levado para o novo combate. Sem ``rng``, o
+        fork ganha um gerador próprio na posição do snapshot.
+        """
+        return self.fork_from(self.snapshot(), rng)
+        
+    def fork_from(self, snapshot: CombatSnapshot,
+                  rng: Optional[random.Random] = None) -> 'CombatState':
+        """Cria um combate independente a partir de ``snapshot``."""
+        if rng is None:
+            # Gerador do mesmo tipo, restaurado abaixo para a posição do snapshot
+            state = CombatState(type(self.initiative.rng)())
+        else:
+            state = CombatState(rng)
+        state.restore(snapshot, {p.id: p.clone() for p in snapshot.participants},
+                      restore_rng=rng is None)
+        return state
+        
     def load_state(self, state: Dict) -> None:
         """Carrega um estado salvo do combate."""
         self.phase = CombatPhase[state['phase']]
         self.round_number = state['round_number']
-        # Outros dados precisariam ser reconstruídos com referências aos objetos reais
\ No newline at end of file
+        self.turn_number = state.get('turn_number', 0)
+        # O dicionário guarda só nomes; participantes, iniciativa, condições e
+        # efeitos exigem os objetos reais e são restaurados por ``restore``
\ No newline at end of file
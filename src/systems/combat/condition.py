@@ -1,7 +1,10 @@
-from typing import Dict, List, Optional
-from enum import Enum, auto
-from dataclasses import dataclass
-from ..character.character import Character
+from typing import Dict, List, Optional, Mapping, Tuple
+from types import MappingProxyType
+from enum import Enum, IntFlag, auto
+from dataclasses import dataclass, field
+from ..character.character import Character, CharacterRef, character_id
+from ..character.stats import ModifierLayer
+from .expiration import ExpirationScheduler, ScheduledExpiration
 
 class ConditionType(Enum):
     STUNNED = auto()
@@ -15,94 +18,242 @@ class ConditionType(Enum):
     SILENCED = auto()
     INVISIBLE = auto()
 
-@dataclass
+class ConditionFlag(IntFlag):
+    """Restrições e modificadores de uma condição, como bits de uma máscara."""
+    NONE = 0
+    CANT_MOVE = auto()
+    CANT_ATTACK = auto()
+    CANT_CAST = auto()
+    DISADVANTAGE_ON_ATTACKS = auto()
+    DISADVANTAGE_ON_SAVES = auto()
+    ADVANTAGE_AGAINST = auto()
+    ADVANTAGE_ON_ATTACKS = auto()
+    DISADVANTAGE_AGAINST = auto()
+
+@dataclass(frozen=True)
 class ConditionEffect:
-    """Efeitos de uma condição em um personagem."""
-    stat_modifiers: Dict[str, int] = None
+    """Efeitos de uma condição em um personagem (imutável e compartilhado)."""
+    stat_modifiers: Optional[Mapping[str, int]] = None
     cant_move: bool = False
     cant_attack: bool = False
     cant_cast: bool = False
     disadvantage_on_attacks: bool = False
     disadvantage_on_saves: bool = False
     advantage_against: bool = False
+    advantage_on_attacks: bool = False
+    disadvantage_against: bool = False
+    flags: int = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        if self.stat_modifiers is not None:
+            object.__setattr__(self, 'stat_modifiers',
+                               MappingProxyType(dict(self.stat_modifiers)))
+        # Máscara de ConditionFlag equivalente aos campos booleanos
+        flags = 0
+        for name, flag in ConditionFlag.__members__.items():
+            if flag and getattr(self, name.lower()):
+                flags |= flag.value
+        object.__setattr__(self, 'flags', flags)
+
+# Efeitos de cada tipo de condição, criados uma única vez e compartilhados
+CONDITION_EFFECTS: Mapping[ConditionType, ConditionEffect] = MappingProxyType({
+    ConditionType.STUNNED: ConditionEffect(
+        cant_move=True,
+        cant_attack=True,
+        cant_cast=True,
+        advantage_against=True
+    ),
+    ConditionType.POISONED: ConditionEffect(
+        stat_modifiers={'strength': -2, 'dexterity': -2},
+        disadvantage_on_attacks=True,
+        disadvantage_on_saves=True
+    ),
+    ConditionType.PARALYZED: ConditionEffect(
+        cant_move=True,
+        cant_attack=True,
+        advantage_against=True
+    ),
+    ConditionType.BLINDED: ConditionEffect(
+        disadvantage_on_attacks=True,
+        advantage_against=True
+    ),
+    # A proibição de atacar quem o enfeitiçou depende do alvo e fica fora da tabela
+    ConditionType.CHARMED: ConditionEffect(),
+    ConditionType.FRIGHTENED: ConditionEffect(
+        disadvantage_on_attacks=True
+    ),
+    ConditionType.PRONE: ConditionEffect(
+        disadvantage_on_attacks=True,
+        advantage_against=True
+    ),
+    ConditionType.RESTRAINED: ConditionEffect(
+        cant_move=True,
+        disadvantage_on_attacks=True,
+        disadvantage_on_saves=True,
+        advantage_against=True
+    ),
+    ConditionType.SILENCED: ConditionEffect(
+        cant_cast=True
+    ),
+    ConditionType.INVISIBLE: ConditionEffect(
+        advantage_on_attacks=True,
+        disadvantage_against=True
+    ),
+})
 
 class Condition:
+    __slots__ = ('type', '_duration', '_expiration', '_index', '_modifiers', 'effects', 'flags')
+
     def __init__(self, condition_type: ConditionType, duration: int = 1):
         self.type = condition_type
-        self.duration = duration
-        self.effects = self._get_condition_effects()
+        self._duration = duration
+        self._expiration: Optional[ScheduledExpiration] = None
+        self._index = -1  # posição na lista de condições do personagem
+        self._modifiers: Tuple[int, ...] = ()  # tokens dos modificadores aplicados
+        self.effects = CONDITION_EFFECTS[condition_type]
+        self.flags = self.effects.flags
+        
+    @property
+    def duration(self) -> int:
+        """Turnos restantes; calculado pelo agendador quando a condição está ativa."""
+        if self._expiration is not None:
+            return self._expiration.remaining()
+        return self._duration
         
-    def _get_condition_effects(self) -> ConditionEffect:
-        """Retorna os efeitos baseados no tipo da condição."""
-        effects = {
-            ConditionType.STUNNED: ConditionEffect(
-                cant_move=True,
-                cant_attack=True,
-                cant_cast=True,
-                advantage_against=True
-            ),
-            ConditionType.POISONED: ConditionEffect(
-                stat_modifiers={'strength': -2, 'dexterity': -2},
-                disadvantage_on_attacks=True,
-                disadvantage_on_saves=True
-            ),
-            ConditionType.PARALYZED: ConditionEffect(
-                cant_move=True,
-                cant_attack=True,
-                advantage_against=True
-            ),
-            ConditionType.BLINDED: ConditionEffect(
-                disadvantage_on_attacks=True,
-                advantage_against=True
-            ),
-            # Adicionar outros efeitos para cada tipo de condição
-        }
-        return effects.get(self.type, ConditionEffect())
+    @duration.setter
+    def duration(self, value: int) -> None:
+        if self._expiration is not None:
+            self._expiration = self._expiration.scheduler.reschedule(self._expiration, value)
+        self._duration = value
 
 class ConditionManager:
-    def __init__(self):
-        self.conditions: Dict[Character, List[Condition]] = {}
+    def __init__(self, scheduler: Optional[ExpirationScheduler] = None):
+        self.conditions: Dict[int, List[Condition]] = {}
+        # Máscara de ConditionFlag agregada por personagem
+        self.flags: Dict[int, int] = {}
+        self.scheduler = scheduler if scheduler is not None else ExpirationScheduler()
+        # Só avança o relógio do agendador se ele for deste gerenciador
+        self._owns_scheduler = scheduler is None
         
     def add_condition(self, character: Character, condition: Condition) -> None:
         """Adiciona uma condição a um personagem."""
-        if character not in self.conditions:
-            self.conditions[character] = []
-        self.conditions[character].append(condition)
+        key = character.id
+        if key not in self.conditions:
+            self.conditions[key] = []
+        condition._index = len(self.conditions[key])
+        self.conditions[key].append(condition)
+        self.flags[key] = self.flags.get(key, 0) | condition.flags
         self._apply_condition_effects(character, condition)
+        self._schedule_expiration(character, condition)
         
     def remove_condition(self, character: Character, condition_type: ConditionType) -> None:
         """Remove uma condição de um personagem."""
-        if character in self.conditions:
-            conditions = self.conditions[character]
+        key = character.id
+        if key in self.conditions:
+            conditions = self.conditions[key]
             for condition in conditions[:]:
                 if condition.type == condition_type:
-                    conditions.remove(condition)
-                    self._remove_condition_effects(character, condition)
+                    self._detach_condition(character, condition)
                     
-    def get_conditions(self, character: Character) -> List[Condition]:
+    def get_conditions(self, character: CharacterRef) -> List[Condition]:
         """Retorna todas as condições ativas em um personagem."""
-        return self.conditions.get(character, [])
+        return self.conditions.get(character_id(character), [])
+        
+    def get_flags(self, character: CharacterRef) -> int:
+        """Retorna a máscara de ``ConditionFlag`` de todas as condições do personagem."""
+        return self.flags.get(character_id(character), 0)
+        
+    def has_flag(self, character: CharacterRef, flag: ConditionFlag) -> bool:
+        """Verifica se alguma condição ativa do personagem tem ``flag``."""
+        return bool(self.flags.get(character_id(character), 0) & flag)
         
     def update_conditions(self, character: Character) -> None:
-        """Atualiza a duração das condições e remove as expiradas."""
-        if character in self.conditions:
-            conditions = self.conditions[character]
-            for condition in conditions[:]:
-                condition.duration -= 1
-                if condition.duration <= 0:
-                    conditions.remove(condition)
-                    self._remove_condition_effects(character, condition)
+        """Remove as condições expiradas do personagem.
+
+        Apenas as condições que vencem neste turno são tocadas. Com o agendador
+        próprio, avança também o turno do personagem; um agendador compartilhado
+        é avançado só por quem o possui (``CombatState.next_turn``), e aqui são
+        executadas apenas as expirações já vencidas.
+        """
+        if self._owns_scheduler:
+            self.scheduler.advance(character.id)
+        else:
+            self.scheduler.expire_due(character.id)
+        
+    def snapshot(self) -> tuple:
+        """Retorna as condições ativas como tupla imutável de (ID, ((tipo, duração), ...))."""
+        return tuple(
+            (key, tuple((condition.type, condition.duration) for condition in conditions))
+            for key, conditions in self.conditions.items() if conditions
+        )
+        
+    def restore(self, snapshot: tuple, characters: Dict[int, Character]) -> None:
+        """Restaura as condições de ``snapshot``.
+
+        Os atributos dos personagens são restaurados separadamente; aqui apenas
+        a camada de condições dos personagens do snapshot é refeita. O agendador
+        deve ter sido restaurado antes.
+        """
+        self.conditions = {}
+        self.flags = {}
+        for key, entries in snapshot:
+            character = characters.get(key)
+            if character is None:
+                continue
+            conditions = self.conditions[key] = []
+            flags = 0
+            character.clear_modifiers(ModifierLayer.CONDITIONS)
+            for condition_type, duration in entries:
+                condition = Condition(condition_type, duration)
+                condition._index = len(conditions)
+                conditions.append(condition)
+                flags |= condition.flags
+                self._apply_condition_effects(character, condition)
+                self._schedule_expiration(character, condition)
+            self.flags[key] = flags
+        
+    def _schedule_expiration(self, character: Character, condition: Condition) -> None:
+        condition._expiration = self.scheduler.schedule(
+            character.id, condition._duration, lambda: self._expire_condition(character, condition)
+        )
+        
+    def _expire_condition(self, character: Character, condition: Condition) -> None:
+        """Chamado pelo agendador quando a duração da condição termina."""
+        condition._expiration = None
+        condition._duration = 0
+        self._detach_condition(character, condition)
+        
+    def _detach_condition(self, character: Character, condition: Condition) -> None:
+        """Retira a condição do personagem e reverte seus efeitos."""
+        if condition._expiration is not None:
+            condition._duration = condition._expiration.remaining()
+            condition._expiration.cancel()
+            condition._expiration = None
+        # Remoção O(1): a última condição ocupa a posição liberada
+        conditions = self.conditions[character.id]
+        last = conditions.pop()
+        if last is not condition:
+            conditions[condition._index] = last
+            last._index = condition._index
+        condition._index = -1
+        if condition.flags:
+            flags = 0
+            for remaining in conditions:
+                flags |= remaining.flags
+            self.flags[character.id] = flags
+        self._remove_condition_effects(character, condition)
                     
     def _apply_condition_effects(self, character: Character, condition: Condition) -> None:
         """Aplica os efeitos de uma condição ao personagem."""
         effects = condition.effects
         if effects.stat_modifiers:
-            for stat, modifier in effects.stat_modifiers.items():
-                character.modify_stat(stat, modifier)
+            condition._modifiers = tuple(
+                character.add_modifier(stat, modifier, ModifierLayer.CONDITIONS)
+                for stat, modifier in effects.stat_modifiers.items()
+            )
                 
     def _remove_condition_effects(self, character: Character, condition: Condition) -> None:
         """Remove os efeitos de uma condição do personagem."""
-        effects = condition.effects
-        if effects.stat_modifiers:
-            for stat, modifier in effects.stat_modifiers.items():
-                character.modify_stat(stat, -modifier)  # Reverte o modificador
\ No newline at end of file
+        for token in condition._modifiers:
+            character.remove_modifier(token)
+        condition._modifiers = ()
\ No newline at end of file
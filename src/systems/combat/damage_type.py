@@ -1,6 +1,7 @@
-from typing import Dict, Set
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, Union
 from enum import Enum, auto
-from ..character.character import Character
+import numpy as np
+from ..character.character import CharacterRef, character_id
 
 class DamageType(Enum):
     SLASHING = auto()
@@ -22,23 +23,147 @@ class ResistanceType(Enum):
     VULNERABLE = auto()
     IMMUNE = auto()
 
+# Colunas da matriz de resistências
+DAMAGE_TYPE_INDEX: Dict[DamageType, int] = {
+    damage_type: index for index, damage_type in enumerate(DamageType)
+}
+
+# Fator aproximado de cada resistência (RESISTANT ainda causa no mínimo 1 de dano)
+RESISTANCE_MULTIPLIERS: Dict[ResistanceType, float] = {
+    ResistanceType.NORMAL: 1.0,
+    ResistanceType.RESISTANT: 0.5,
+    ResistanceType.VULNERABLE: 2.0,
+    ResistanceType.IMMUNE: 0.0,
+}
+
+# Perfis internados, pela chave canônica (frozenset das entradas)
+_PROFILES: Dict[frozenset, 'ResistanceProfile'] = {}
+# Tabela (perfis × DamageType) com o valor de ResistanceType; cada perfil tem uma
+# linha, escrita uma única vez na sua criação
+_profile_codes: np.ndarray = np.full((8, len(DamageType)), ResistanceType.NORMAL.value,
+                                     dtype=np.int8)
+
+class ResistanceProfile(Mapping):
+    """Perfil imutável de resistências (DamageType -> ResistanceType).
+
+    Perfis são internados: perfis iguais são o mesmo objeto, então 200 goblins
+    com as mesmas resistências compartilham um único perfil. Entradas NORMAL
+    são descartadas. ``codes`` e ``multipliers`` são vetores pré-calculados,
+    indexados por ``DAMAGE_TYPE_INDEX``.
+    """
+    __slots__ = ('_entries', 'index', 'codes', 'multipliers', '_transitions')
+
+    def __new__(cls, resistances: Optional[Mapping[DamageType, ResistanceType]] = None
+                ) -> 'ResistanceProfile':
+        entries = dict(resistances or {})
+        key = frozenset((t, r) for t, r in entries.items() if r is not ResistanceType.NORMAL)
+        profile = _PROFILES.get(key)
+        if profile is None:
+            profile = super().__new__(cls)
+            profile._init(key)
+            _PROFILES[key] = profile
+        return profile
+
+    def _init(self, key: frozenset) -> None:
+        global _profile_codes
+        entries = dict(key)
+        self._entries: Dict[DamageType, ResistanceType] = {
+            t: entries[t] for t in DamageType if t in entries}
+        self._transitions: Dict[tuple, ResistanceProfile] = {}
+        self.index = len(_PROFILES)
+        if self.index >= len(_profile_codes):
+            grown: np.ndarray = np.full((2 * len(_profile_codes), len(DamageType)),
+                                        ResistanceType.NORMAL.value, dtype=np.int8)
+            grown[:len(_profile_codes)] = _profile_codes
+            _profile_codes = grown
+        codes: np.ndarray = np.full(len(DamageType), ResistanceType.NORMAL.value, dtype=np.int8)
+        multipliers = np.ones(len(DamageType))
+        for damage_type, resistance in self._entries.items():
+            codes[DAMAGE_TYPE_INDEX[damage_type]] = resistance.value
+            multipliers[DAMAGE_TYPE_INDEX[damage_type]] = RESISTANCE_MULTIPLIERS[resistance]
+        _profile_codes[self.index] = codes
+        codes.flags.writeable = False
+        multipliers.flags.writeable = False
+        self.codes: np.ndarray = codes
+        self.multipliers: np.ndarray = multipliers
+
+    def __getitem__(self, damage_type: DamageType) -> ResistanceType:
+        return self._entries[damage_type]
+
+    def get(self, damage_type: DamageType, default: Any = None) -> Any:
+        return self._entries.get(damage_type, default)
+
+    def __iter__(self) -> Iterator[DamageType]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # Perfis iguais são o mesmo objeto
+    __hash__ = object.__hash__
+
+    def __repr__(self) -> str:
+        return f"ResistanceProfile({self._entries!r})"
+
+    def __reduce__(self) -> tuple:
+        # Reinterna o perfil ao ser carregado (ex.: em outro processo)
+        return (ResistanceProfile, (self._entries,))
+
+    def with_resistance(self, damage_type: DamageType,
+                        resistance_type: ResistanceType) -> 'ResistanceProfile':
+        """Perfil igual a este, com ``damage_type`` alterado."""
+        transition = (damage_type, resistance_type)
+        profile = self._transitions.get(transition)
+        if profile is None:
+            entries = dict(self._entries)
+            entries[damage_type] = resistance_type
+            profile = self._transitions[transition] = ResistanceProfile(entries)
+        return profile
+
+# Perfil sem resistências especiais (linha 0 da tabela)
+NO_RESISTANCES = ResistanceProfile()
+
 class DamageTypeManager:
-    def __init__(self):
-        self.resistances: Dict[Character, Dict[DamageType, ResistanceType]] = {}
+    def __init__(self) -> None:
+        # Perfil de resistências de cada personagem. Os perfis são imutáveis e
+        # compartilhados; alterar a resistência de um personagem troca o seu perfil.
+        self.resistances: Dict[int, ResistanceProfile] = {}
+        # O dicionário compartilhado com um snapshot é copiado antes de alterar
+        self._shared = False
         
-    def set_resistance(self, character: Character, damage_type: DamageType, resistance_type: ResistanceType) -> None:
+    def set_resistance(self, character: CharacterRef, damage_type: DamageType,
+                       resistance_type: ResistanceType) -> None:
         """Define a resistência de um personagem a um tipo de dano."""
-        if character not in self.resistances:
-            self.resistances[character] = {}
-        self.resistances[character][damage_type] = resistance_type
+        if self._shared:
+            self._unshare()
+        key = character_id(character)
+        profile = self.resistances.get(key, NO_RESISTANCES)
+        self.resistances[key] = profile.with_resistance(damage_type, resistance_type)
+        
+    def set_profile(self, character: CharacterRef,
+                    profile: Mapping[DamageType, ResistanceType]) -> ResistanceProfile:
+        """Atribui um perfil de resistências (ou um dicionário, que é internado)."""
+        if self._shared:
+            self._unshare()
+        profile = ResistanceProfile(profile)
+        self.resistances[character_id(character)] = profile
+        return profile
+        
+    def get_profile(self, character: CharacterRef) -> ResistanceProfile:
+        """Retorna o perfil de resistências de um personagem."""
+        return self.resistances.get(character_id(character), NO_RESISTANCES)
         
-    def get_resistance(self, character: Character, damage_type: DamageType) -> ResistanceType:
+    def get_resistance(self, character: CharacterRef, damage_type: DamageType) -> ResistanceType:
         """Retorna o tipo de resistência de um personagem a um tipo de dano."""
-        if character in self.resistances and damage_type in self.resistances[character]:
-            return self.resistances[character][damage_type]
-        return ResistanceType.NORMAL
+        profile = self.resistances.get(character_id(character), NO_RESISTANCES)
+        return profile._entries.get(damage_type, ResistanceType.NORMAL)
         
-    def calculate_damage(self, base_damage: int, damage_type: DamageType, target: Character) -> int:
+    def get_multipliers(self, character: CharacterRef) -> np.ndarray:
+        """Vetor (somente leitura) de fatores de dano do personagem, por DamageType."""
+        return self.get_profile(character).multipliers
+        
+    def calculate_damage(self, base_damage: int, damage_type: DamageType,
+                         target: CharacterRef) -> int:
         """Calcula o dano final baseado nas resistências do alvo."""
         resistance = self.get_resistance(target, damage_type)
         
@@ -50,22 +175,74 @@ class DamageTypeManager:
             return 0
         return base_damage
         
-    def add_immunity(self, character: Character, damage_type: DamageType) -> None:
+    def calculate_damage_batch(self, base_damage: Sequence[int],
+                               damage_types: Union[DamageType, Sequence[DamageType]],
+                               targets: Sequence[CharacterRef]) -> np.ndarray:
+        """Calcula o dano final de vários acertos de uma vez.
+
+        Equivalente a chamar ``calculate_damage`` para cada trio
+        (dano base, tipo de dano, alvo). Um único ``DamageType`` vale para
+        todos os acertos.
+        """
+        base = np.asarray(base_damage, dtype=np.int64)
+        rows = self._profile_rows(targets)
+        if isinstance(damage_types, DamageType):
+            columns = DAMAGE_TYPE_INDEX[damage_types]
+        else:
+            columns = np.fromiter((DAMAGE_TYPE_INDEX[t] for t in damage_types),
+                                  dtype=np.intp, count=len(damage_types))
+        codes = _profile_codes[rows, columns]
+
+        damage = np.where(codes == ResistanceType.RESISTANT.value, np.maximum(1, base // 2), base)
+        damage = np.where(codes == ResistanceType.VULNERABLE.value, base * 2, damage)
+        final: np.ndarray = np.where(codes == ResistanceType.IMMUNE.value, 0, damage)
+        return final
+        
+    def get_resistance_matrix(self, characters: Sequence[CharacterRef]) -> np.ndarray:
+        """Retorna a matriz (personagens × DamageType) de valores de ResistanceType."""
+        matrix: np.ndarray = _profile_codes[self._profile_rows(characters)]
+        return matrix
+        
+    def _profile_rows(self, characters: Sequence[CharacterRef]) -> np.ndarray:
+        """Linhas dos perfis dos personagens na tabela de perfis."""
+        resistances = self.resistances
+        rows: np.ndarray = np.fromiter(
+            (resistances.get(character_id(c), NO_RESISTANCES).index for c in characters),
+            dtype=np.intp, count=len(characters)
+        )
+        return rows
+        
+    def snapshot(self) -> tuple:
+        """Retorna o estado das resistências, compartilhado em copy-on-write."""
+        self._shared = True
+        return (self.resistances,)
+        
+    def restore(self, snapshot: tuple) -> None:
+        """Restaura um estado de ``snapshot`` sem copiá-lo até a próxima alteração."""
+        self.resistances, = snapshot
+        self._shared = True
+        
+    def _unshare(self) -> None:
+        # Os perfis são imutáveis: basta uma cópia rasa
+        self.resistances = dict(self.resistances)
+        self._shared = False
+        
+    def add_immunity(self, character: CharacterRef, damage_type: DamageType) -> None:
         """Adiciona imunidade a um tipo de dano."""
         self.set_resistance(character, damage_type, ResistanceType.IMMUNE)
         
-    def add_resistance(self, character: Character, damage_type: DamageType) -> None:
+    def add_resistance(self, character: CharacterRef, damage_type: DamageType) -> None:
         """Adiciona resistência a um tipo de dano."""
         self.set_resistance(character, damage_type, ResistanceType.RESISTANT)
         
-    def add_vulnerability(self, character: Character, damage_type: DamageType) -> None:
+    def add_vulnerability(self, character: CharacterRef, damage_type: DamageType) -> None:
         """Adiciona vulnerabilidade a um tipo de dano."""
         self.set_resistance(character, damage_type, ResistanceType.VULNERABLE)
         
-    def remove_special_resistance(self, character: Character, damage_type: DamageType) -> None:
+    def remove_special_resistance(self, character: CharacterRef, damage_type: DamageType) -> None:
         """Remove qualquer resistência especial, voltando ao normal."""
         self.set_resistance(character, damage_type, ResistanceType.NORMAL)
         
-    def get_all_resistances(self, character: Character) -> Dict[DamageType, ResistanceType]:
-        """Retorna todas as resistências de um personagem."""
-        return self.resistances.get(character, {})
\ No newline at end of file
+    def get_all_resistances(self, character: CharacterRef) -> ResistanceProfile:
+        """Retorna todas as resistências de um personagem (o próprio perfil, sem cópia)."""
+        return self.resistances.get(character_id(character), NO_RESISTANCES)
\ No newline at end of file
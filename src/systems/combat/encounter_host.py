@@ -0,0 +1,272 @@
+from typing import List, Dict, Optional, Tuple, Set, Iterable, Callable
+from dataclasses import dataclass
+import asyncio
+import heapq
+import random
+import time
+from ..character.character import Character, CharacterRef, character_id
+from ..dice.rng import RngService
+from .combat_round import CombatRound
+from .planner import PASS, PlannedAction, available_actions, default_action, execute_action
+from .simulation import CombatantTemplate, setup_combat
+
+# Política de decisão automática (NPCs e turnos AFK): recebe o round e o personagem atual
+TurnPolicy = Callable[[CombatRound, Character], PlannedAction]
+
+@dataclass(frozen=True)
+class TurnPrompt:
+    """Turno de um jogador aguardando decisão."""
+    encounter_id: int
+    actor: Character
+    turn_number: int
+    deadline: float
+    actions: Tuple[PlannedAction, ...]
+
+class Encounter:
+    """Um combate hospedado pelo ``EncounterHost``.
+
+    Os personagens em ``players`` são controlados por jogadores; os demais são
+    NPCs e decidem pela política do encontro (por padrão a mesma da simulação
+    em lote).
+    """
+
+    def __init__(self, encounter_id: int,
+                 combatants: List[Tuple[Character, CombatantTemplate]],
+                 players: Iterable[CharacterRef] = (),
+                 service: Optional[RngService] = None,
+                 max_rounds: int = 100,
+                 policy: Optional[TurnPolicy] = None):
+        service = service or RngService()
+        self.id = encounter_id
+        self.profiles: Dict[int, CombatantTemplate] = {c.id: t for c, t in combatants}
+        self.players: Set[int] = {character_id(player) for player in players}
+        self.rng: random.Random = service.stream("attacks")
+        self.combat_round = setup_combat(combatants, service.stream("initiative"))
+        self.state = self.combat_round.combat_state
+        self.max_rounds = max_rounds
+        self.policy = policy
+        self.finished = False
+        self.winner: Optional[str] = None
+        self.rounds = 0
+        # Turno de jogador pendente e quem aguarda o próximo
+        self.prompt: Optional[TurnPrompt] = None
+        self._waiters: List[asyncio.Future] = []
+
+    def current_actor(self) -> Optional[Character]:
+        """Personagem do turno atual, se estiver vivo."""
+        actor = self.state.get_current_character()
+        return actor if actor is not None and actor.is_alive() else None
+
+    def awaiting_player(self) -> bool:
+        """Verifica se o turno atual é de um jogador."""
+        actor = self.current_actor()
+        return not self.finished and actor is not None and actor.id in self.players
+
+    def auto_action(self) -> PlannedAction:
+        """Decisão automática para o personagem atual."""
+        actor = self.current_actor()
+        if actor is None:
+            return PASS
+        if self.policy is not None:
+            return self.policy(self.combat_round, actor)
+        return default_action(self.combat_round, self.profiles, actor)
+
+    def play(self, action: Optional[PlannedAction] = None) -> None:
+        """Executa o turno atual (com ``action`` ou a decisão automática) e avança."""
+        actor = self.current_actor()
+        if actor is not None:
+            if action is None:
+                action = self.auto_action()
+            execute_action(self.combat_round, self.profiles, actor, action, self.rng)
+        self._advance()
+
+    def _advance(self) -> None:
+        """Passa ao próximo turno, encerrando a luta se restar um time ou acabarem os rounds."""
+        state = self.state
+        surviving = {self.profiles[p.id].team for p in state.participants if p.is_alive()}
+        if len(surviving) <= 1:
+            self._finish(surviving.pop() if surviving else None, state.round_number)
+            return
+        round_number = state.round_number
+        state.next_turn()
+        if state.round_number != round_number:
+            if state.round_number > self.max_rounds:
+                self._finish(None, self.max_rounds)
+                return
+            self.combat_round.start_round()
+
+    def _finish(self, winner: Optional[str], rounds: int) -> None:
+        self.finished = True
+        self.winner = winner
+        self.rounds = rounds
+
+class EncounterHost:
+    """Hospeda muitos combates num único loop asyncio.
+
+    Jogadores aguardam ``next_turn`` e respondem com ``submit_action``; turnos
+    sem resposta em ``turn_timeout`` segundos são resolvidos automaticamente.
+    A cada tick, todos os turnos de NPC prontos, de todos os encontros, são
+    processados de uma vez, sem ceder o loop entre eles. ``run`` executa os
+    ticks; ``tick`` pode ser chamado diretamente (por exemplo, em testes).
+    Encontros encerrados saem de ``encounters`` e ficam em ``results``, que
+    guarda só os ``max_results`` mais recentes.
+    """
+
+    def __init__(self, turn_timeout: float = 30.0, tick_interval: float = 0.01,
+                 max_turns_per_tick: int = 64,
+                 clock: Callable[[], float] = time.monotonic,
+                 max_results: int = 1024):
+        self.turn_timeout = turn_timeout
+        self.tick_interval = tick_interval
+        # Limite de turnos seguidos de um mesmo encontro por tick
+        self.max_turns_per_tick = max_turns_per_tick
+        self.clock = clock
+        self.encounters: Dict[int, Encounter] = {}
+        # Encontros encerrados, do mais antigo ao mais recente
+        self.results: Dict[int, Encounter] = {}
+        self.max_results = max_results
+        self.turns_resolved = 0
+        self._ready: Set[int] = set()
+        # (prazo, encontro, turno) dos turnos de jogador pendentes
+        self._deadlines: List[Tuple[float, int, int]] = []
+        self._next_id = 1
+
+    def add_encounter(self, combatants: List[Tuple[Character, CombatantTemplate]],
+                      players: Iterable[CharacterRef] = (),
+                      seed: Optional[int] = None,
+                      max_rounds: int = 100,
+                      policy: Optional[TurnPolicy] = None) -> Encounter:
+        """Inicia um combate e o coloca sob o controle do host."""
+        encounter = Encounter(self._next_id, combatants, players, RngService(seed),
+                              max_rounds, policy)
+        self._next_id += 1
+        self.encounters[encounter.id] = encounter
+        self._schedule(encounter)
+        return encounter
+
+    def remove_encounter(self, encounter_id: int) -> Optional[Encounter]:
+        """Remove um encontro do host; quem aguarda seus turnos recebe ``None``.
+
+        Encontros já encerrados são removidos de ``results``.
+        """
+        encounter = self.encounters.pop(encounter_id, None)
+        if encounter is None:
+            return self.results.pop(encounter_id, None)
+        self._ready.discard(encounter_id)
+        encounter.prompt = None
+        self._wake(encounter, None)
+        return encounter
+
+    async def next_turn(self, encounter_id: int,
+                        after: Optional[int] = None) -> Optional[TurnPrompt]:
+        """Aguarda o próximo turno de jogador do encontro; ``None`` quando ele acabar.
+
+        Com ``after``, ignora o turno pendente se ele não for posterior ao turno
+        ``after`` (o último que o cliente já viu).
+        """
+        encounter = self.encounters.get(encounter_id)
+        if encounter is None or encounter.finished:
+            return None
+        prompt = encounter.prompt
+        if prompt is not None and (after is None or prompt.turn_number > after):
+            return prompt
+        future: 'asyncio.Future[Optional[TurnPrompt]]' = (
+            asyncio.get_running_loop().create_future())
+        encounter._waiters.append(future)
+        return await future
+
+    def submit_action(self, encounter_id: int, action: PlannedAction,
+                      turn_number: Optional[int] = None) -> bool:
+        """Executa a decisão do jogador do turno pendente.
+
+        Retorna False se não houver turno pendente, se ``turn_number`` não for o
+        do turno pendente (resposta atrasada) ou se a ação não estiver disponível.
+        """
+        encounter = self.encounters.get(encounter_id)
+        if encounter is None:
+            return False
+        prompt = encounter.prompt
+        if prompt is None or (turn_number is not None and turn_number != prompt.turn_number):
+            return False
+        if action not in prompt.actions:
+            return False
+        encounter.prompt = None
+        encounter.play(action)
+        self.turns_resolved += 1
+        self._schedule(encounter)
+        return True
+
+    def tick(self) -> int:
+        """Resolve os turnos AFK vencidos e todos os turnos de NPC prontos.
+
+        Retorna quantos turnos foram resolvidos.
+        """
+        resolved = self.turns_resolved
+        now = self.clock()
+        deadlines = self._deadlines
+        while deadlines and deadlines[0][0] <= now:
+            _, encounter_id, turn_number = heapq.heappop(deadlines)
+            encounter = self.encounters.get(encounter_id)
+            # Entradas de turnos já respondidos são descartadas aqui
+            if (encounter is None or encounter.prompt is None
+                    or encounter.prompt.turn_number != turn_number):
+                continue
+            encounter.prompt = None
+            encounter.play()
+            self.turns_resolved += 1
+            self._schedule(encounter)
+
+        ready, self._ready = self._ready, set()
+        limit = self.max_turns_per_tick
+        for encounter_id in ready:
+            encounter = self.encounters.get(encounter_id)
+            if encounter is None:
+                continue
+            turns = 0
+            while turns < limit and not encounter.finished and not encounter.awaiting_player():
+                encounter.play()
+                turns += 1
+            self.turns_resolved += turns
+            self._schedule(encounter)
+        return self.turns_resolved - resolved
+
+    async def run(self, stop: Optional[asyncio.Event] = None) -> None:
+        """Executa ticks até ``stop`` ser sinalizado (ou para sempre)."""
+        while stop is None or not stop.is_set():
+            self.tick()
+            await asyncio.sleep(self.tick_interval)
+
+    def _schedule(self, encounter: Encounter) -> None:
+        """Decide o que o encontro aguarda: fim, decisão de jogador ou turno de NPC."""
+        actor = encounter.current_actor()
+        if encounter.finished:
+            self._retire(encounter)
+            self._wake(encounter, None)
+        elif actor is not None and encounter.awaiting_player():
+            turn_number = encounter.state.turn_number
+            deadline = self.clock() + self.turn_timeout
+            encounter.prompt = TurnPrompt(
+                encounter.id, actor, turn_number, deadline,
+                tuple(available_actions(encounter.combat_round, encounter.profiles, actor))
+            )
+            heapq.heappush(self._deadlines, (deadline, encounter.id, turn_number))
+            self._wake(encounter, encounter.prompt)
+        else:
+            self._ready.add(encounter.id)
+
+    def _retire(self, encounter: Encounter) -> None:
+        """Move um encontro encerrado de ``encounters`` para ``results``."""
+        if self.encounters.pop(encounter.id, None) is None:
+            return
+        self._ready.discard(encounter.id)
+        results = self.results
+        results[encounter.id] = encounter
+        if len(results) > self.max_results:
+            del results[next(iter(results))]
+
+    @staticmethod
+    def _wake(encounter: Encounter, prompt: Optional[TurnPrompt]) -> None:
+        waiters, encounter._waiters = encounter._waiters, []
+        for future in waiters:
+            if not future.done():
+                future.set_result(prompt)
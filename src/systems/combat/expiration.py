@@ -0,0 +1,105 @@
+from typing import Dict, List, Callable
+import heapq
+
+class ScheduledExpiration:
+    """Expiração agendada para um personagem, com cancelamento preguiçoso."""
+    __slots__ = ('owner', 'expires_at', 'sequence', 'callback', 'cancelled', 'scheduler')
+
+    def __init__(self, scheduler: 'ExpirationScheduler', owner: int, expires_at: int,
+                 sequence: int, callback: Callable[[], None]):
+        self.scheduler = scheduler
+        self.owner = owner
+        self.expires_at = expires_at
+        self.sequence = sequence
+        self.callback = callback
+        self.cancelled = False
+
+    def __lt__(self, other: 'ScheduledExpiration') -> bool:
+        if self.expires_at != other.expires_at:
+            return self.expires_at < other.expires_at
+        return self.sequence < other.sequence
+
+    def remaining(self) -> int:
+        """Retorna quantos turnos do dono faltam para a expiração."""
+        return self.expires_at - self.scheduler.get_turn(self.owner)
+
+    def cancel(self) -> None:
+        """Cancela a expiração; a entrada é descartada quando chegar sua vez."""
+        self.cancelled = True
+
+class ExpirationScheduler:
+    """Agenda expirações pelo número absoluto de turnos de cada personagem.
+
+    Cada personagem tem um relógio de turnos e um heap de expirações. Avançar
+    o turno de um personagem só toca as entradas que vencem naquele turno, em
+    vez de percorrer todas as condições e efeitos ativos.
+    """
+
+    def __init__(self) -> None:
+        self._turns: Dict[int, int] = {}
+        self._queues: Dict[int, List[ScheduledExpiration]] = {}
+        self._sequence = 0
+
+    def get_turn(self, owner: int) -> int:
+        """Retorna quantos turnos o personagem já teve."""
+        return self._turns.get(owner, 0)
+
+    def schedule(self, owner: int, turns: int,
+                 callback: Callable[[], None]) -> ScheduledExpiration:
+        """Agenda ``callback`` para daqui a ``turns`` turnos do personagem (mínimo 1)."""
+        self._sequence += 1
+        entry = ScheduledExpiration(self, owner, self.get_turn(owner) + max(1, turns),
+                                    self._sequence, callback)
+        heapq.heappush(self._queues.setdefault(owner, []), entry)
+        return entry
+
+    def reschedule(self, entry: ScheduledExpiration, turns: int) -> ScheduledExpiration:
+        """Cancela uma expiração e a agenda novamente para daqui a ``turns`` turnos."""
+        entry.cancel()
+        return self.schedule(entry.owner, turns, entry.callback)
+
+    def advance(self, owner: int) -> int:
+        """Avança o relógio do personagem e executa as expirações vencidas.
+
+        Retorna o número de expirações executadas.
+        """
+        self._turns[owner] = self._turns.get(owner, 0) + 1
+        return self.expire_due(owner)
+
+    def expire_due(self, owner: int) -> int:
+        """Executa as expirações já vencidas do personagem, sem avançar o relógio.
+
+        Retorna o número de expirações executadas.
+        """
+        turn = self._turns.get(owner, 0)
+        queue = self._queues.get(owner)
+        expired = 0
+        while queue and queue[0].expires_at <= turn:
+            entry = heapq.heappop(queue)
+            if not entry.cancelled:
+                entry.cancelled = True
+                entry.callback()
+                expired += 1
+        return expired
+
+    def pending(self, owner: int) -> int:
+        """Retorna quantas expirações ainda estão agendadas para o personagem."""
+        return sum(1 for entry in self._queues.get(owner, []) if not entry.cancelled)
+
+    def snapshot(self) -> tuple:
+        """Retorna os relógios de turno; as expirações são salvas pelos gerenciadores."""
+        return tuple(self._turns.items())
+
+    def restore(self, snapshot: tuple) -> None:
+        """Restaura os relógios e descarta todas as expirações agendadas."""
+        for queue in self._queues.values():
+            for entry in queue:
+                entry.cancel()
+        self._turns = dict(snapshot)
+        self._queues = {}
+
+    def clear(self, owner: int) -> None:
+        """Descarta o relógio e todas as expirações de um personagem."""
+        self._turns.pop(owner, None)
+        for entry in self._queues.pop(owner, []):
+            entry.cancel()
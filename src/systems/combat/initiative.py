@@ -1,53 +1,191 @@
-from typing import List, Dict
-from ..character.character import Character
+from typing import List, Dict, Optional, Tuple, Iterable, Mapping
+from bisect import bisect_left
+from ..character.character import Character, CharacterRef, character_id
+from ..dice.rng import roll_die
 import random
 
 class Initiative:
-    def __init__(self):
-        self.order: Dict[Character, int] = {}
+    """Ordem de iniciativa mantida em arrays ordenados.
+
+    A ordem de turnos é um array estável ordenado por ``(-rolagem, sequência)``:
+    empates mantêm a ordem de entrada. Avançar o turno é O(1) amortizado,
+    entradas no meio do combate usam ``bisect`` e remoções deixam um espaço
+    vazio no lugar, para que o cursor não se desloque.
+    """
+
+    def __init__(self, rng: Optional[random.Random] = None):
+        # Gerador próprio: snapshots e restores não tocam o ``random`` global
+        self.rng: random.Random = rng if rng is not None else random.Random()
         self.current_index: int = 0
-        
-    def roll_initiative(self, participants: List[Character]) -> None:
-        """Rola iniciativa para todos os participantes."""
-        self.order.clear()
+        # Se o último next_turn passou do fim da ordem (início de um novo round)
+        self.wrapped: bool = False
+        self._keys: List[Tuple[int, int]] = []
+        self._slots: List[Optional[Character]] = []
+        self._entries: Dict[int, Tuple[int, int]] = {}
+        self._rolls: Dict[int, int] = {}
+        self._removed: int = 0
+        self._sequence: int = 0
+
+    def roll_initiative(self, participants: List[Character],
+                        rolls: Optional[Mapping[int, int]] = None) -> None:
+        """Rola iniciativa para todos os participantes.
+
+        Com ``rolls`` (ID -> rolagem), usa as rolagens já conhecidas em vez de
+        rolar de novo, como num replay.
+        """
+        self._keys.clear()
+        self._slots.clear()
+        self._entries.clear()
+        self._rolls.clear()
+        self._removed = 0
+        self._sequence = 0
+
+        entries = []
         for participant in participants:
-            # Base da iniciativa: modificador de destreza + d20
-            initiative_roll = random.randint(1, 20)
-            self.order[participant] = initiative_roll
-            
-        # Ordena os participantes pela iniciativa
-        self.order = dict(sorted(self.order.items(), key=lambda x: x[1], reverse=True))
+            if participant.id in self._rolls:
+                continue
+            if rolls is not None and participant.id in rolls:
+                initiative_roll = rolls[participant.id]
+            else:
+                # Base da iniciativa: modificador de destreza + d20
+                initiative_roll = roll_die(self.rng, 20)
+            self._rolls[participant.id] = initiative_roll
+            entries.append(((-initiative_roll, self._next_sequence()), participant))
+
+        # Ordena os participantes pela iniciativa (estável em empates)
+        entries.sort(key=lambda entry: entry[0])
+        for key, participant in entries:
+            self._keys.append(key)
+            self._slots.append(participant)
+            self._entries[participant.id] = key
         self.current_index = 0
-        
-    def get_current_character(self) -> Character:
-        """Retorna o personagem atual na ordem de iniciativa."""
-        if not self.order:
+
+    def get_current_character(self) -> Optional[Character]:
+        """Retorna o personagem atual na ordem de iniciativa.
+
+        Retorna ``None`` se não houver participantes ou se o personagem do
+        turno atual tiver sido removido do combate.
+        """
+        if not self._rolls:
             return None
-        return list(self.order.keys())[self.current_index]
-        
-    def next_turn(self) -> Character:
-        """Avança para o próximo personagem na ordem de iniciativa."""
-        if not self.order:
+        return self._slots[self.current_index]
+
+    def next_turn(self) -> Optional[Character]:
+        """Avança para o próximo personagem na ordem de iniciativa.
+
+        ``wrapped`` indica se o avanço passou do fim da ordem.
+        """
+        self.wrapped = False
+        if not self._rolls:
             return None
-        self.current_index = (self.current_index + 1) % len(self.order)
-        return self.get_current_character()
-        
+        slots = self._slots
+        size = len(slots)
+        index = self.current_index
+        while True:
+            index += 1
+            if index == size:
+                index = 0
+                self.wrapped = True
+            if slots[index] is not None:
+                break
+        self.current_index = index
+
+        # Compacta apenas com o cursor sobre um participante válido
+        if self._removed > len(self._rolls):
+            self._compact()
+        return self._slots[self.current_index]
+
     def get_initiative_order(self) -> List[Character]:
         """Retorna a lista de personagens na ordem de iniciativa."""
-        return list(self.order.keys())
-        
-    def add_participant(self, character: Character) -> None:
-        """Adiciona um novo participante ao combate."""
-        if character not in self.order:
-            initiative_roll = random.randint(1, 20)
-            self.order[character] = initiative_roll
-            # Reordena a lista
-            self.order = dict(sorted(self.order.items(), key=lambda x: x[1], reverse=True))
-            
-    def remove_participant(self, character: Character) -> None:
-        """Remove um participante do combate."""
-        if character in self.order:
-            del self.order[character]
-            # Ajusta o índice atual se necessário
-            if self.current_index >= len(self.order):
-                self.current_index = 0
\ No newline at end of file
+        return [slot for slot in self._slots if slot is not None]
+
+    def order_participants(self, characters: Iterable[CharacterRef]) -> List[Character]:
+        """Ordena alguns personagens pela iniciativa, sem percorrer a ordem inteira.
+
+        Personagens fora do combate são ignorados.
+        """
+        entries = self._entries
+        keys = sorted(entries[cid] for cid in map(character_id, characters) if cid in entries)
+        slots = [self._slots[bisect_left(self._keys, key)] for key in keys]
+        return [slot for slot in slots if slot is not None]
+
+    def get_initiative(self, character: CharacterRef) -> Optional[int]:
+        """Retorna a rolagem de iniciativa de um personagem."""
+        return self._rolls.get(character_id(character))
+
+    def add_participant(self, character: Character, roll: Optional[int] = None) -> None:
+        """Adiciona um novo participante ao combate (com ``roll``, sem rolar)."""
+        if character.id in self._rolls:
+            return
+        initiative_roll = roll_die(self.rng, 20) if roll is None else roll
+        key = (-initiative_roll, self._next_sequence())
+        index = bisect_left(self._keys, key)
+
+        # Mantém o cursor sobre o mesmo personagem
+        if self._slots and index <= self.current_index:
+            self.current_index += 1
+        self._keys.insert(index, key)
+        self._slots.insert(index, character)
+        self._entries[character.id] = key
+        self._rolls[character.id] = initiative_roll
+
+    def remove_participant(self, character: CharacterRef) -> None:
+        """Remove um participante do combate sem deslocar o cursor."""
+        participant_id = character_id(character)
+        key = self._entries.pop(participant_id, None)
+        if key is None:
+            return
+        del self._rolls[participant_id]
+        self._slots[bisect_left(self._keys, key)] = None
+        self._removed += 1
+
+        if not self._rolls:
+            self._keys.clear()
+            self._slots.clear()
+            self._removed = 0
+            self.current_index = 0
+
+    def snapshot(self) -> tuple:
+        """Retorna o estado da iniciativa (ordem e cursor) como tupla imutável."""
+        return (
+            tuple(self._keys),
+            tuple(None if slot is None else slot.id for slot in self._slots),
+            tuple(self._rolls.items()),
+            self.current_index,
+            self._removed,
+            self._sequence
+        )
+
+    def restore(self, snapshot: tuple, characters: Dict[int, Character]) -> None:
+        """Restaura um estado de ``snapshot``, resolvendo os IDs em ``characters``."""
+        keys, slot_ids, rolls, self.current_index, self._removed, self._sequence = snapshot
+        self._keys = list(keys)
+        self._slots = [None if cid is None else characters[cid] for cid in slot_ids]
+        self._rolls = dict(rolls)
+        self._entries = {cid: key for key, cid in zip(keys, slot_ids) if cid is not None}
+
+    def __len__(self) -> int:
+        return len(self._rolls)
+
+    def __contains__(self, character: CharacterRef) -> bool:
+        return character_id(character) in self._rolls
+
+    def _next_sequence(self) -> int:
+        self._sequence += 1
+        return self._sequence
+
+    def _compact(self) -> None:
+        """Remove os espaços vazios deixados por participantes removidos."""
+        keys: List[Tuple[int, int]] = []
+        slots: List[Optional[Character]] = []
+        for index, (key, slot) in enumerate(zip(self._keys, self._slots)):
+            if slot is None:
+                continue
+            if index == self.current_index:
+                current = len(slots)
+            keys.append(key)
+            slots.append(slot)
+        self._keys = keys
+        self._slots = slots
+        self._removed = 0
+        self.current_index = current
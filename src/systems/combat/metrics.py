@@ -0,0 +1,190 @@
+from typing import List, Dict, Tuple, Callable, Any
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import functools
+import threading
+import time
+from .ability_effect import AbilityEffectManager
+from .combat_round import CombatRound
+from .combat_state import CombatState
+from .expiration import ExpirationScheduler
+
+# Limites superiores (segundos) dos buckets dos histogramas de latência
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 5e-4,
+    1e-3, 2.5e-3, 5e-3, 1e-2, 2.5e-2, 5e-2, 0.1, 0.25, 0.5, 1.0
+)
+
+# Pontos instrumentados: fase -> (classe, método). AbilityEffectManager.apply_effect
+# delega para apply_effects, então é medido por ele; as expirações de condições e
+# efeitos rodam em ExpirationScheduler.advance, chamado a cada CombatState.next_turn.
+HOT_PATHS: Dict[str, Tuple[type, str]] = {
+    "next_turn": (CombatState, "next_turn"),
+    "process_reaction": (CombatRound, "process_reaction"),
+    "apply_effects": (AbilityEffectManager, "apply_effects"),
+    "expirations": (ExpirationScheduler, "advance"),
+}
+
+METRIC_NAME = "dungeon_keeper_combat_phase_seconds"
+
+class LatencyHistogram:
+    """Histograma de latências com buckets fixos, contagem e soma."""
+    __slots__ = ('bounds', 'buckets', 'count', 'total')
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        # Um bucket por limite, mais o último (+Inf)
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def clear(self) -> None:
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, seconds: float) -> None:
+        self.buckets[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+
+    def cumulative(self) -> List[int]:
+        """Contagens acumuladas por limite (formato do Prometheus), terminando em +Inf."""
+        counts, running = [], 0
+        for count in self.buckets:
+            running += count
+            counts.append(running)
+        return counts
+
+    def quantile(self, q: float) -> float:
+        """Estimativa do quantil ``q`` pelo limite superior do bucket."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        for bound, count in zip(self.bounds + (float('inf'),), self.cumulative()):
+            if count >= rank:
+                return bound
+        return float('inf')
+
+class CombatMetrics:
+    """Contagens de chamadas e histogramas de latência das fases do combate.
+
+    Desligado por padrão. ``enable`` troca os métodos de ``HOT_PATHS`` por
+    versões cronometradas e ``disable`` devolve os originais, então não há
+    custo algum enquanto as métricas estão desligadas. A troca vale para todas
+    as instâncias do processo.
+    """
+
+    def __init__(self, bounds: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.bounds = bounds
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._points: Dict[str, Tuple[type, str]] = dict(HOT_PATHS)
+        self._originals: Dict[str, Callable] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._originals)
+
+    def add_point(self, phase: str, owner: type, method: str) -> None:
+        """Registra outro método a ser medido como ``phase``."""
+        self._points[phase] = (owner, method)
+        if self.enabled:
+            self._wrap(phase)
+
+    def enable(self) -> None:
+        """Liga a coleta (idempotente)."""
+        for phase in self._points:
+            if phase not in self._originals:
+                self._wrap(phase)
+
+    def disable(self) -> None:
+        """Desliga a coleta, restaurando os métodos originais."""
+        for phase, original in self._originals.items():
+            owner, method = self._points[phase]
+            setattr(owner, method, original)
+        self._originals.clear()
+
+    def reset(self) -> None:
+        """Zera todos os histogramas (os métodos cronometrados continuam registrando)."""
+        for histogram in self.histograms.values():
+            histogram.clear()
+
+    def histogram(self, phase: str) -> LatencyHistogram:
+        histogram = self.histograms.get(phase)
+        if histogram is None:
+            histogram = self.histograms[phase] = LatencyHistogram(self.bounds)
+        return histogram
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Métricas de cada fase: chamadas, soma, média, p50/p99 e buckets acumulados."""
+        result = {}
+        for phase, histogram in self.histograms.items():
+            result[phase] = {
+                "count": histogram.count,
+                "sum": histogram.total,
+                "mean": histogram.total / histogram.count if histogram.count else 0.0,
+                "p50": histogram.quantile(0.5),
+                "p99": histogram.quantile(0.99),
+                "buckets": dict(zip(histogram.bounds + (float('inf'),),
+                                    histogram.cumulative())),
+            }
+        return result
+
+    def to_prometheus(self) -> str:
+        """Métricas no formato de texto do Prometheus."""
+        lines = [
+            f"# HELP {METRIC_NAME} Latência das fases do combate.",
+            f"# TYPE {METRIC_NAME} histogram",
+        ]
+        for phase, histogram in sorted(self.histograms.items()):
+            labels = f'phase="{phase}"'
+            for bound, count in zip(histogram.bounds + (float('inf'),), histogram.cumulative()):
+                le = "+Inf" if bound == float('inf') else repr(bound)
+                lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{le}"}} {count}')
+            lines.append(f"{METRIC_NAME}_sum{{{labels}}} {histogram.total!r}")
+            lines.append(f"{METRIC_NAME}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Serve ``to_prometheus`` em ``http://host:port/metrics`` numa thread daemon."""
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.to_prometheus().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args: Any) -> None:
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def _wrap(self, phase: str) -> None:
+        owner, method = self._points[phase]
+        original = owner.__dict__[method]
+        histogram = self.histogram(phase)
+        observe = histogram.observe
+        perf_counter = time.perf_counter
+
+        @functools.wraps(original)
+        def timed(*args: Any, **kwargs: Any) -> Any:
+            start = perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                observe(perf_counter() - start)
+
+        self._originals[phase] = original
+        setattr(owner, method, timed)
+
+# Instância do processo; ``METRICS.enable()`` liga a coleta
+METRICS = CombatMetrics()
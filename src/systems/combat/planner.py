@@ -0,0 +1,303 @@
+from typing import List, Dict, Iterable, Optional, Tuple, NamedTuple
+from dataclasses import dataclass, field
+from concurrent.futures import Executor
+import math
+import random
+import time
+from ..character.character import Character
+from .combat_state import CombatState, CombatSnapshot
+from .combat_round import CombatRound, ActionType
+from .simulation import CombatantTemplate, can_attack, choose_target, resolve_attack
+
+class PlannedAction(NamedTuple):
+    """Decisão de turno: atacar ``target_id`` com a ação padrão, ou passar."""
+    action_type: Optional[ActionType]
+    target_id: Optional[int] = None
+
+PASS = PlannedAction(None)
+
+@dataclass
+class PlannerConfig:
+    """Parâmetros de busca do planejador."""
+    time_budget: Optional[float] = 0.02  # segundos por decisão
+    max_iterations: Optional[int] = None
+    rollout_turns: int = 12
+    exploration: float = 1.4
+    workers: int = 1
+    table_size: int = 200_000
+
+@dataclass
+class SearchResult:
+    """Resultado de uma busca: a ação escolhida e as estatísticas da raiz."""
+    action: PlannedAction
+    iterations: int
+    visits: Dict[PlannedAction, int] = field(default_factory=dict)
+    values: Dict[PlannedAction, float] = field(default_factory=dict)
+
+class _Node:
+    """Estatísticas de um estado na tabela de transposição."""
+    __slots__ = ('actions', 'visits', 'action_visits', 'action_values')
+
+    def __init__(self, actions: List[PlannedAction]):
+        self.actions = actions
+        self.visits = 0
+        self.action_visits: Dict[PlannedAction, int] = {}
+        self.action_values: Dict[PlannedAction, float] = {}
+
+    def select(self, exploration: float, rng: random.Random) -> PlannedAction:
+        """Escolhe uma ação ainda não tentada ou, se todas foram, pela fórmula UCT."""
+        untried = [a for a in self.actions if a not in self.action_visits]
+        if untried:
+            return rng.choice(untried)
+        log_visits = math.log(self.visits)
+        best, best_score = self.actions[0], -math.inf
+        for action in self.actions:
+            visits = self.action_visits[action]
+            score = (self.action_values[action] / visits
+                     + exploration * math.sqrt(log_visits / visits))
+            if score > best_score:
+                best, best_score = action, score
+        return best
+
+    def update(self, action: PlannedAction, value: float) -> None:
+        self.visits += 1
+        self.action_visits[action] = self.action_visits.get(action, 0) + 1
+        self.action_values[action] = self.action_values.get(action, 0.0) + value
+
+    def merge(self, other: '_Node') -> None:
+        """Soma as estatísticas de outro nó do mesmo estado (de outro worker)."""
+        self.visits += other.visits
+        for action, visits in other.action_visits.items():
+            self.action_visits[action] = self.action_visits.get(action, 0) + visits
+            self.action_values[action] = (self.action_values.get(action, 0.0)
+                                          + other.action_values[action])
+
+class CombatPlanner:
+    """IA de combate por busca em árvore Monte Carlo (MCTS/UCT).
+
+    O modelo do jogo é o próprio combate: cada iteração restaura um snapshot
+    da raiz num combate de rascunho, desce pela árvore escolhendo ações por
+    UCT, completa a luta com a política padrão da simulação e propaga o
+    resultado. Os resultados das rolagens são amostrados a cada iteração, de
+    modo que os nós acumulam o valor esperado (expectimax por amostragem).
+
+    Os nós ficam numa tabela de transposição indexada por
+    ``CombatState.state_hash``, reaproveitada entre decisões. Workers
+    paralelos começam com tabelas vazias (a tabela não é enviada a eles) e
+    as devolvem ao fim da busca, para serem somadas à tabela do planejador.
+    """
+
+    def __init__(self, profiles: Dict[int, CombatantTemplate],
+                 config: Optional[PlannerConfig] = None,
+                 rng: Optional[random.Random] = None,
+                 executor: Optional[Executor] = None):
+        self.profiles = profiles
+        self.config = config or PlannerConfig()
+        if self.config.time_budget is None and self.config.max_iterations is None:
+            raise ValueError("Defina time_budget ou max_iterations para o planejador")
+        self.rng = rng or random.Random()
+        self.executor = executor
+        self.table: Dict[int, _Node] = {}
+
+    def choose_action(self, combat_round: CombatRound) -> PlannedAction:
+        """Escolhe a ação do personagem atual do combate."""
+        return self.search(combat_round).action
+
+    def search(self, combat_round: CombatRound) -> SearchResult:
+        """Busca a melhor ação para o personagem atual, sem alterar o combate.
+
+        Com ``workers > 1`` e um ``executor``, cada worker faz uma busca
+        independente a partir da raiz; as estatísticas da raiz e as tabelas dos
+        workers são somadas (``state_hash`` não depende do processo, então as
+        chaves dos workers coincidem com as locais).
+        """
+        snapshot = combat_round.snapshot()
+        config = self.config
+        if config.workers > 1 and self.executor is not None:
+            jobs = [(self.profiles, config, snapshot, self.rng.getrandbits(64))
+                    for _ in range(config.workers)]
+            futures = [self.executor.submit(_search_worker, job) for job in jobs]
+            results = []
+            for future in futures:
+                result, table = future.result()
+                results.append(result)
+                self._merge_table(table)
+        else:
+            results = [_Search(self.profiles, config, self.table, self.rng).run(snapshot)]
+        if len(self.table) > config.table_size:
+            self.table.clear()
+
+        visits: Dict[PlannedAction, int] = {}
+        totals: Dict[PlannedAction, float] = {}
+        for _, root_visits, root_values in results:
+            for action, count in root_visits.items():
+                visits[action] = visits.get(action, 0) + count
+                totals[action] = totals.get(action, 0.0) + root_values[action]
+        action = max(visits, key=lambda a: visits[a]) if visits else PASS
+        return SearchResult(
+            action=action,
+            iterations=sum(iterations for iterations, _, _ in results),
+            visits=visits,
+            values={a: totals[a] / visits[a] for a in visits}
+        )
+
+    def _merge_table(self, table: Dict[int, _Node]) -> None:
+        """Soma a tabela de transposição de um worker à do planejador."""
+        own = self.table
+        for key, node in table.items():
+            current = own.get(key)
+            if current is None:
+                own[key] = node
+            else:
+                current.merge(node)
+
+    def play_turn(self, combat_round: CombatRound, rng: random.Random) -> PlannedAction:
+        """Escolhe e executa a ação do personagem atual."""
+        action = self.choose_action(combat_round)
+        actor = combat_round.combat_state.get_current_character()
+        if actor is not None:
+            execute_action(combat_round, self.profiles, actor, action, rng)
+        return action
+
+def available_actions(combat_round: CombatRound, profiles: Dict[int, CombatantTemplate],
+                      actor: Character) -> List[PlannedAction]:
+    """Lista as decisões possíveis: atacar cada inimigo vivo, ou passar."""
+    state = combat_round.combat_state
+    if (ActionType.STANDARD not in combat_round.get_available_actions(actor)
+            or not can_attack(state, actor)):
+        return [PASS]
+    team = profiles[actor.id].team
+    actions = [PlannedAction(ActionType.STANDARD, p.id) for p in state.participants
+               if p.is_alive() and profiles[p.id].team != team]
+    return actions or [PASS]
+
+def execute_action(combat_round: CombatRound, profiles: Dict[int, CombatantTemplate],
+                   actor: Character, action: PlannedAction, rng: random.Random) -> None:
+    """Executa uma decisão no combate."""
+    if action.action_type is None:
+        return
+    if not combat_round.use_action(actor, action.action_type):
+        return
+    state = combat_round.combat_state
+    target = next(p for p in state.participants if p.id == action.target_id)
+    resolve_attack(state, rng, actor, profiles[actor.id], target)
+
+def default_action(combat_round: CombatRound, profiles: Dict[int, CombatantTemplate],
+                   actor: Character) -> PlannedAction:
+    """Decisão da política padrão da simulação: atacar o inimigo com menos HP."""
+    actions = available_actions(combat_round, profiles, actor)
+    if actions[0] is PASS:
+        return PASS
+    participants = {p.id: p for p in combat_round.combat_state.participants}
+    target = choose_target([participants[a.target_id] for a in actions
+                            if a.target_id is not None])
+    return PlannedAction(ActionType.STANDARD, target.id)
+
+class _Search:
+    """Uma busca MCTS sobre um combate de rascunho."""
+
+    def __init__(self, profiles: Dict[int, CombatantTemplate], config: PlannerConfig,
+                 table: Dict[int, _Node], rng: random.Random):
+        self.profiles = profiles
+        self.config = config
+        self.table = table
+        self.rng = rng
+
+    def run(self, snapshot: CombatSnapshot) -> Tuple[int, Dict[PlannedAction, int],
+                                                     Dict[PlannedAction, float]]:
+        """Itera até esgotar o tempo ou as iterações; retorna as estatísticas da raiz."""
+        config = self.config
+        deadline = (time.perf_counter() + config.time_budget
+                    if config.time_budget is not None else math.inf)
+        limit = config.max_iterations if config.max_iterations is not None else math.inf
+
+        characters = {p.id: p.clone() for p in snapshot.participants}
+        state = CombatState(self.rng)
+        combat_round = CombatRound(state)
+        # Cada rollout continua o gerador do planner, em vez de repetir as mesmas rolagens
+        state.restore(snapshot, characters, restore_rng=False)
+        # Snapshots sem round começam de um round vazio
+        actions = (snapshot.combat_round if snapshot.combat_round is not None
+                   else combat_round.snapshot_actions())
+        combat_round.restore_actions(actions)
+        root_key = state.state_hash(combat_round)
+        initial_hp = self._team_hp(state.participants)
+        iterations = 0
+        while iterations < limit and (iterations == 0 or time.perf_counter() < deadline):
+            if iterations:
+                state.restore(snapshot, characters, restore_rng=False)
+                combat_round.restore_actions(actions)
+                # O rascunho não precisa do histórico dos rollouts anteriores
+                state.action_history.clear()
+                state.event_log.clear()
+            self._iterate(combat_round, initial_hp)
+            iterations += 1
+
+        root = self.table.get(root_key)
+        if root is None:
+            return iterations, {}, {}
+        return iterations, dict(root.action_visits), dict(root.action_values)
+
+    def _iterate(self, combat_round: CombatRound, initial_hp: Dict[str, int]) -> None:
+        state = combat_round.combat_state
+        path: List[Tuple[_Node, PlannedAction, str]] = []
+        expanding = True
+        for _ in range(self.config.rollout_turns):
+            if len(self._surviving_teams(state)) <= 1:
+                break
+            actor = state.get_current_character()
+            if actor is not None and actor.is_alive():
+                if expanding:
+                    key = state.state_hash(combat_round)
+                    node = self.table.get(key)
+                    if node is None:
+                        node = self.table[key] = _Node(
+                            available_actions(combat_round, self.profiles, actor))
+                        expanding = False
+                    action = node.select(self.config.exploration, self.rng)
+                    path.append((node, action, self.profiles[actor.id].team))
+                else:
+                    action = self._default_action(combat_round, actor)
+                execute_action(combat_round, self.profiles, actor, action, self.rng)
+
+            round_number = state.round_number
+            state.next_turn()
+            if state.round_number != round_number:
+                combat_round.start_round()
+
+        values = self._evaluate(state, initial_hp)
+        for node, action, team in path:
+            node.update(action, values[team])
+
+    def _default_action(self, combat_round: CombatRound, actor: Character) -> PlannedAction:
+        """Política padrão dos rollouts: a mesma da simulação em lote."""
+        return default_action(combat_round, self.profiles, actor)
+
+    def _team_hp(self, participants: Iterable[Character]) -> Dict[str, int]:
+        totals: Dict[str, int] = {}
+        for participant in participants:
+            team = self.profiles[participant.id].team
+            totals[team] = totals.get(team, 0) + max(0, int(participant.stats['hp']))
+        return totals
+
+    def _surviving_teams(self, state: CombatState) -> set:
+        return {self.profiles[p.id].team for p in state.participants if p.is_alive()}
+
+    def _evaluate(self, state: CombatState, initial_hp: Dict[str, int]) -> Dict[str, float]:
+        """Valor de cada time: sua fração de HP menos a do melhor adversário."""
+        hp = self._team_hp(state.participants)
+        fractions = {team: hp.get(team, 0) / total if total else 0.0
+                     for team, total in initial_hp.items()}
+        values = {}
+        for team, fraction in fractions.items():
+            best_other = max((f for t, f in fractions.items() if t != team), default=0.0)
+            values[team] = fraction - best_other
+        return values
+
+def _search_worker(job: Tuple[Dict[int, CombatantTemplate], PlannerConfig, CombatSnapshot, int]
+                   ) -> Tuple[Tuple[int, Dict[PlannedAction, int], Dict[PlannedAction, float]],
+                              Dict[int, '_Node']]:
+    """Busca independente de um worker; devolve o resultado e a tabela preenchida."""
+    profiles, config, snapshot, seed = job
+    table: Dict[int, _Node] = {}
+    return _Search(profiles, config, table, random.Random(seed)).run(snapshot), table
@@ -0,0 +1,253 @@
+from typing import List, Dict, Optional, Tuple, Iterable
+from dataclasses import dataclass, field
+from concurrent.futures import ProcessPoolExecutor
+import os
+import random
+from ..character.character import Character
+from ..character.stats import StatBlock
+from ..dice.rng import RngService, roll_die
+from .combat_state import CombatState, CombatAction
+from .combat_round import CombatRound, ActionType
+from .condition import Condition, ConditionType, ConditionFlag
+from .damage_type import DamageType, ResistanceType
+
+@dataclass
+class CombatantTemplate:
+    """Modelo de um combatente usado para gerar encontros simulados."""
+    name: str
+    team: str
+    stats: Dict[str, int] = field(default_factory=dict)
+    count: int = 1
+    attack_bonus: int = 0
+    damage_dice: Tuple[int, int] = (1, 6)  # (quantidade, faces)
+    damage_bonus: int = 0
+    damage_type: DamageType = DamageType.SLASHING
+    resistances: Dict[DamageType, ResistanceType] = field(default_factory=dict)
+    on_hit_condition: Optional[ConditionType] = None
+    on_hit_condition_duration: int = 1
+
+@dataclass
+class EncounterTemplate:
+    """Modelo de encontro: combatentes de dois ou mais times."""
+    combatants: List[CombatantTemplate]
+    max_rounds: int = 100
+
+    def get_teams(self) -> List[str]:
+        """Retorna os times do encontro, na ordem de declaração."""
+        return list(dict.fromkeys(template.team for template in self.combatants))
+
+    def build(self) -> List[Tuple[Character, CombatantTemplate]]:
+        """Instancia os personagens do encontro."""
+        combatants = []
+        for template in self.combatants:
+            for index in range(template.count):
+                name = template.name if template.count == 1 else f"{template.name} {index + 1}"
+                combatants.append((Character(name=name, stats=StatBlock(template.stats)), template))
+        return combatants
+
+@dataclass
+class FightResult:
+    """Resultado de uma luta simulada."""
+    seed: int
+    winner: Optional[str]
+    rounds: int
+    hp_curves: Dict[str, List[int]] = field(default_factory=dict)
+
+@dataclass
+class SimulationReport:
+    """Resultados agregados de um lote de lutas simuladas."""
+    fights: int
+    win_rates: Dict[str, float]
+    draw_rate: float
+    mean_rounds: float
+    round_counts: Dict[int, int]
+    hp_curves: Dict[str, List[float]]
+    results: List[FightResult] = field(default_factory=list)
+
+def _roll_d20(rng: random.Random, advantage: bool, disadvantage: bool) -> int:
+    """Rola um d20 com vantagem ou desvantagem (que se anulam)."""
+    first = roll_die(rng, 20)
+    if advantage == disadvantage:
+        return first
+    second = roll_die(rng, 20)
+    return max(first, second) if advantage else min(first, second)
+
+def _team_hp(combatants: List[Tuple[Character, CombatantTemplate]],
+             teams: List[str]) -> Dict[str, int]:
+    totals = {team: 0 for team in teams}
+    for character, template in combatants:
+        totals[template.team] += int(character.stats['hp'])
+    return totals
+
+def _surviving_teams(combatants: List[Tuple[Character, CombatantTemplate]]) -> List[str]:
+    return list(dict.fromkeys(t.team for c, t in combatants if c.is_alive()))
+
+def can_attack(state: CombatState, actor: Character) -> bool:
+    """Verifica se alguma condição impede o personagem de atacar."""
+    return not state.condition_manager.has_flag(actor, ConditionFlag.CANT_ATTACK)
+
+def choose_target(enemies: List[Character]) -> Character:
+    """Escolhe o alvo da política padrão: o inimigo com menos HP."""
+    return min(enemies, key=lambda c: c.stats['hp'])
+
+def resolve_attack(state: CombatState, rng: random.Random, actor: Character,
+                   template: CombatantTemplate, target: Character) -> None:
+    """Rola e aplica um ataque de ``actor`` contra ``target``, registrando a ação."""
+    actor_flags = state.condition_manager.get_flags(actor)
+    target_flags = state.condition_manager.get_flags(target)
+    roll = _roll_d20(
+        rng,
+        advantage=bool(actor_flags & ConditionFlag.ADVANTAGE_ON_ATTACKS
+                       or target_flags & ConditionFlag.ADVANTAGE_AGAINST),
+        disadvantage=bool(actor_flags & ConditionFlag.DISADVANTAGE_ON_ATTACKS
+                          or target_flags & ConditionFlag.DISADVANTAGE_AGAINST)
+    )
+    if roll == 1 or (roll != 20 and roll + template.attack_bonus < target.stats['armor_class']):
+        state.record_action(CombatAction(actor=actor, target=target, action_type="miss"))
+        return
+
+    dice, faces = template.damage_dice
+    if roll == 20:
+        dice *= 2
+    base_damage = max(0, sum(roll_die(rng, faces) for _ in range(dice)) + template.damage_bonus)
+    damage = state.damage_type_manager.calculate_damage(base_damage, template.damage_type, target)
+    target.take_damage(damage)
+    state.record_action(CombatAction(
+        actor=actor,
+        target=target,
+        action_type="attack",
+        damage_type=template.damage_type.name,
+        damage_amount=damage
+    ))
+
+    if template.on_hit_condition is not None and target.is_alive():
+        state.condition_manager.add_condition(
+            target, Condition(template.on_hit_condition, template.on_hit_condition_duration)
+        )
+
+def _take_turn(state: CombatState, combat_round: CombatRound, rng: random.Random,
+               actor: Character, templates: Dict[int, CombatantTemplate],
+               combatants: List[Tuple[Character, CombatantTemplate]]) -> None:
+    """Executa o turno de um combatente: ataca o inimigo vivo com menos HP."""
+    template = templates[actor.id]
+    if not can_attack(state, actor):
+        return
+    if not combat_round.use_action(actor, ActionType.STANDARD):
+        return
+
+    enemies = [c for c, t in combatants if t.team != template.team and c.is_alive()]
+    if not enemies:
+        return
+    resolve_attack(state, rng, actor, template, choose_target(enemies))
+
+def setup_combat(combatants: List[Tuple[Character, CombatantTemplate]],
+                 rng: Optional[random.Random] = None) -> CombatRound:
+    """Inicia o combate entre ``combatants`` e abre o primeiro round."""
+    state = CombatState(rng=rng)
+    for character, combatant in combatants:
+        if combatant.resistances:
+            # Combatentes do mesmo modelo compartilham o perfil internado
+            state.damage_type_manager.set_profile(character, combatant.resistances)
+    state.start_combat([character for character, _ in combatants])
+    combat_round = CombatRound(state)
+    combat_round.start_round()
+    return combat_round
+
+def simulate_encounter(template: EncounterTemplate, seed: int) -> FightResult:
+    """Simula uma luta completa; o resultado depende apenas da semente.
+
+    A iniciativa e os ataques usam fluxos separados do ``RngService`` da semente.
+    """
+    service = RngService(seed)
+    rng = service.stream("attacks")
+    teams = template.get_teams()
+    combatants = template.build()
+    templates = {character.id: combatant for character, combatant in combatants}
+
+    combat_round = setup_combat(combatants, service.stream("initiative"))
+    state = combat_round.combat_state
+
+    hp_curves: Dict[str, List[int]] = {
+        team: [hp] for team, hp in _team_hp(combatants, teams).items()
+    }
+    winner: Optional[str] = None
+    current = state.get_current_character()
+    while True:
+        if current is not None and current.is_alive():
+            _take_turn(state, combat_round, rng, current, templates, combatants)
+
+        surviving = _surviving_teams(combatants)
+        if len(surviving) <= 1:
+            winner = surviving[0] if surviving else None
+            rounds = state.round_number
+            break
+
+        round_number = state.round_number
+        current = state.next_turn()
+        if state.round_number != round_number:
+            for team, hp in _team_hp(combatants, teams).items():
+                hp_curves[team].append(hp)
+            if state.round_number > template.max_rounds:
+                rounds = template.max_rounds
+                break
+            combat_round.start_round()
+
+    # Registra o HP do round em que a luta terminou
+    if len(hp_curves[teams[0]]) <= rounds:
+        for team, hp in _team_hp(combatants, teams).items():
+            hp_curves[team].append(hp)
+    return FightResult(seed=seed, winner=winner, rounds=rounds, hp_curves=hp_curves)
+
+def _simulate_batch(job: Tuple[EncounterTemplate, List[int]]) -> List[FightResult]:
+    template, seeds = job
+    return [simulate_encounter(template, seed) for seed in seeds]
+
+def aggregate_results(results: List[FightResult], teams: List[str]) -> SimulationReport:
+    """Agrega os resultados de várias lutas em taxas de vitória e curvas de HP."""
+    fights = len(results)
+    wins = {team: 0 for team in teams}
+    round_counts: Dict[int, int] = {}
+    for result in results:
+        if result.winner is not None:
+            wins[result.winner] += 1
+        round_counts[result.rounds] = round_counts.get(result.rounds, 0) + 1
+
+    # Curvas médias: lutas encerradas mantêm o HP final nos rounds seguintes
+    length = max((len(r.hp_curves[teams[0]]) for r in results), default=0)
+    hp_curves: Dict[str, List[float]] = {}
+    for team in teams:
+        totals = [0] * length
+        for result in results:
+            curve = result.hp_curves[team]
+            for index in range(length):
+                totals[index] += curve[min(index, len(curve) - 1)]
+        hp_curves[team] = [total / fights for total in totals]
+
+    return SimulationReport(
+        fights=fights,
+        win_rates={team: (wins[team] / fights if fights else 0.0) for team in teams},
+        draw_rate=(sum(1 for r in results if r.winner is None) / fights if fights else 0.0),
+        mean_rounds=(sum(r.rounds for r in results) / fights if fights else 0.0),
+        round_counts=dict(sorted(round_counts.items())),
+        hp_curves=hp_curves,
+        results=results
+    )
+
+def run_simulations(template: EncounterTemplate, seeds: Iterable[int],
+                    processes: Optional[int] = None,
+                    chunk_size: Optional[int] = None) -> SimulationReport:
+    """Simula o encontro uma vez por semente, distribuindo as lutas entre processos.
+
+    Cada luta usa um gerador próprio criado a partir da semente, então o
+    resultado é idêntico com qualquer número de processos.
+    """
+    seeds = list(seeds)
+    processes = processes or os.cpu_count() or 1
+    if processes <= 1 or len(seeds) <= 1:
+        results = _simulate_batch((template, seeds))
+    else:
+        chunk_size = chunk_size or max(1, len(seeds) // (processes * 4))
+        jobs = [(template, seeds[i:i + chunk_size]) for i in range(0, len(seeds), chunk_size)]
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = [result for batch in executor.map(_simulate_batch, jobs) for result in batch]
+    return aggregate_results(results, template.get_teams())
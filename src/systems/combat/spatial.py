@@ -0,0 +1,168 @@
+from typing import List, Dict, Optional, Tuple, Iterator
+import math
+from ..character.character import Character, CharacterRef, character_id
+from .ability_effect import AreaShape, EffectTarget
+
+Point = Tuple[float, float]
+
+class SpatialIndex:
+    """Grade uniforme com as posições dos combatentes.
+
+    Cada célula de ``cell_size`` unidades (pés, por padrão um quadrado de 5)
+    guarda os personagens que estão nela. Mover um personagem só atualiza as
+    duas células envolvidas, e as consultas de área visitam apenas as células
+    que cruzam a área, sem percorrer todos os participantes.
+    """
+
+    def __init__(self, cell_size: float = 5.0):
+        if cell_size <= 0:
+            raise ValueError("O tamanho da célula deve ser positivo")
+        self.cell_size = cell_size
+        self._positions: Dict[int, Point] = {}
+        self._cells: Dict[Tuple[int, int], Dict[int, Character]] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, character: CharacterRef) -> bool:
+        return character_id(character) in self._positions
+
+    def _cell(self, x: float, y: float) -> Tuple[int, int]:
+        size = self.cell_size
+        return (math.floor(x / size), math.floor(y / size))
+
+    def place(self, character: Character, x: float, y: float) -> None:
+        """Coloca ou move um personagem para ``(x, y)``."""
+        key = character.id
+        cell = self._cell(x, y)
+        previous = self._positions.get(key)
+        if previous is not None:
+            old_cell = self._cell(*previous)
+            if old_cell != cell:
+                self._discard(old_cell, key)
+                self._cells.setdefault(cell, {})[key] = character
+        else:
+            self._cells.setdefault(cell, {})[key] = character
+        self._positions[key] = (x, y)
+
+    def remove(self, character: CharacterRef) -> None:
+        """Retira um personagem do índice."""
+        key = character_id(character)
+        position = self._positions.pop(key, None)
+        if position is not None:
+            self._discard(self._cell(*position), key)
+
+    def _discard(self, cell: Tuple[int, int], key: int) -> None:
+        occupants = self._cells[cell]
+        del occupants[key]
+        if not occupants:
+            del self._cells[cell]
+
+    def get_position(self, character: CharacterRef) -> Optional[Point]:
+        """Retorna a posição de um personagem, ou None se ele não estiver no índice."""
+        return self._positions.get(character_id(character))
+
+    def clear(self) -> None:
+        """Remove todos os personagens."""
+        self._positions.clear()
+        self._cells.clear()
+
+    def snapshot(self) -> tuple:
+        """Retorna as posições como tupla imutável de (ID, (x, y))."""
+        return tuple(self._positions.items())
+
+    def restore(self, snapshot: tuple, characters: Dict[int, Character]) -> None:
+        """Reconstrói o índice a partir de ``snapshot``."""
+        self.clear()
+        for key, (x, y) in snapshot:
+            character = characters.get(key)
+            if character is not None:
+                self.place(character, x, y)
+
+    def _candidates(self, min_x: float, min_y: float,
+                    max_x: float, max_y: float) -> Iterator[Tuple[Character, Point]]:
+        """Personagens das células que cruzam o retângulo informado."""
+        first_x, first_y = self._cell(min_x, min_y)
+        last_x, last_y = self._cell(max_x, max_y)
+        cells = self._cells
+        positions = self._positions
+        # Áreas maiores que o número de células ocupadas: percorre as ocupadas
+        if (last_x - first_x + 1) * (last_y - first_y + 1) > len(cells):
+            for (cell_x, cell_y), occupants in cells.items():
+                if first_x <= cell_x <= last_x and first_y <= cell_y <= last_y:
+                    for key, character in occupants.items():
+                        yield character, positions[key]
+            return
+        for cell_x in range(first_x, last_x + 1):
+            for cell_y in range(first_y, last_y + 1):
+                cell = cells.get((cell_x, cell_y))
+                if cell:
+                    for key, character in cell.items():
+                        yield character, positions[key]
+
+    def query_radius(self, origin: Point, radius: float) -> List[Character]:
+        """Personagens a até ``radius`` de ``origin``."""
+        ox, oy = origin
+        limit = radius * radius
+        found = [
+            character for character, (x, y)
+            in self._candidates(ox - radius, oy - radius, ox + radius, oy + radius)
+            if (x - ox) ** 2 + (y - oy) ** 2 <= limit
+        ]
+        return sorted(found, key=lambda character: character.id)
+
+    def query_cone(self, origin: Point, direction: Point, length: float,
+                   angle: float) -> List[Character]:
+        """Personagens num cone que parte de ``origin`` na direção ``direction``.
+
+        ``angle`` é a abertura total do cone, em graus; quem está exatamente
+        na origem não é atingido.
+        """
+        ox, oy = origin
+        dx, dy = _normalize(direction)
+        cos_half = math.cos(math.radians(angle) / 2)
+        limit = length * length
+        found = []
+        for character, (x, y) in self._candidates(ox - length, oy - length,
+                                                  ox + length, oy + length):
+            vx, vy = x - ox, y - oy
+            distance_sq = vx * vx + vy * vy
+            if 0 < distance_sq <= limit and vx * dx + vy * dy >= cos_half * math.sqrt(distance_sq):
+                found.append(character)
+        return sorted(found, key=lambda character: character.id)
+
+    def query_line(self, origin: Point, direction: Point, length: float,
+                   width: float) -> List[Character]:
+        """Personagens numa linha de ``length`` por ``width`` a partir de ``origin``."""
+        ox, oy = origin
+        dx, dy = _normalize(direction)
+        half_width = width / 2
+        end_x, end_y = ox + dx * length, oy + dy * length
+        found = []
+        for character, (x, y) in self._candidates(
+                min(ox, end_x) - half_width, min(oy, end_y) - half_width,
+                max(ox, end_x) + half_width, max(oy, end_y) + half_width):
+            vx, vy = x - ox, y - oy
+            along = vx * dx + vy * dy
+            if 0 <= along <= length and abs(vx * dy - vy * dx) <= half_width:
+                found.append(character)
+        return sorted(found, key=lambda character: character.id)
+
+    def query_area(self, target: EffectTarget, origin: Point,
+                   direction: Optional[Point] = None) -> List[Character]:
+        """Personagens atingidos pela área descrita em ``target``."""
+        shape = target.area_shape
+        if shape == AreaShape.RADIUS:
+            return self.query_radius(origin, target.area_radius)
+        if direction is None:
+            raise ValueError(f"Área {shape.name} exige uma direção")
+        if shape == AreaShape.CONE:
+            return self.query_cone(origin, direction, target.area_radius, target.area_angle)
+        return self.query_line(origin, direction, target.area_radius, target.area_width)
+
+def _normalize(vector: Point) -> Point:
+    x, y = vector
+    norm = math.hypot(x, y)
+    if norm == 0:
+        raise ValueError("A direção da área não pode ser nula")
+    return x / norm, y / norm
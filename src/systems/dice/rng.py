@@ -0,0 +1,192 @@
+from typing import Dict, Optional, Union
+import hashlib
+import os
+import random
+import numpy as np
+
+_MASK = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+_MIX_1 = 0xBF58476D1CE4E5B9
+_MIX_2 = 0x94D049BB133111EB
+_TO_FLOAT = 1.0 / (1 << 53)
+
+# Tamanho padrão dos blocos de rolagens pré-geradas
+DEFAULT_BUFFER_SIZE = 4096
+
+def _mix(z: int) -> int:
+    """Finalizador do SplitMix64."""
+    z = ((z ^ (z >> 30)) * _MIX_1) & _MASK
+    z = ((z ^ (z >> 27)) * _MIX_2) & _MASK
+    return z ^ (z >> 31)
+
+def _mix_array(z: np.ndarray) -> np.ndarray:
+    """Finalizador do SplitMix64 sobre um array uint64 (a multiplicação já é mod 2**64)."""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(_MIX_1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(_MIX_2)
+    mixed: np.ndarray = z ^ (z >> np.uint64(31))
+    return mixed
+
+def _name_hash(name: str) -> int:
+    """Hash de 64 bits estável entre processos (o ``hash`` de str não é)."""
+    return int.from_bytes(hashlib.blake2b(name.encode(), digest_size=8).digest(), 'little')
+
+def derive_key(seed: int, name: str) -> int:
+    """Chave do fluxo ``name`` para a semente ``seed``."""
+    return _mix((seed + _name_hash(name)) & _MASK)
+
+class DiceStream(random.Random):
+    """Fluxo de números aleatórios baseado em contador (SplitMix64).
+
+    O n-ésimo valor é ``mix(chave + n * GOLDEN)``: não há estado além da
+    chave e do contador, então saltar adiante (``jump``) é O(1) e um bloco
+    de valores pode ser gerado de uma vez com NumPy (``rolls``). Como
+    subclasse de ``random.Random``, serve em qualquer lugar que aceite um
+    gerador (``randint``, ``choice``, ``sample``...).
+    """
+
+    def __init__(self, key: Optional[int] = None, counter: int = 0):
+        self._buffers: Dict[int, DiceBuffer] = {}
+        super().__init__(key)
+        self.counter = counter
+
+    def seed(self, a: object = None, version: int = 2) -> None:
+        """Redefine a chave do fluxo e zera o contador."""
+        if a is None:
+            a = int.from_bytes(os.urandom(8), 'little')
+        elif not isinstance(a, int):
+            a = _name_hash(str(a))
+        self.key = a & _MASK
+        self.counter = 0
+        self.gauss_next = None
+        self._buffers = {}
+
+    def _next(self) -> int:
+        self.counter += 1
+        return _mix((self.key + self.counter * _GOLDEN) & _MASK)
+
+    def random(self) -> float:
+        return (self._next() >> 11) * _TO_FLOAT
+
+    def getrandbits(self, k: int) -> int:
+        if k <= 64:
+            return self._next() >> (64 - k) if k > 0 else 0
+        value = 0
+        for _ in range(0, k, 64):
+            value = (value << 64) | self._next()
+        return value >> (-k % 64)
+
+    def jump(self, steps: int) -> None:
+        """Avança o fluxo ``steps`` valores sem gerá-los."""
+        self.counter += steps
+
+    def substream(self, name: str) -> 'DiceStream':
+        """Fluxo independente derivado deste (mesma chave + nome)."""
+        return DiceStream(derive_key(self.key, name))
+
+    def roll(self, faces: int) -> int:
+        """Rola um dado de ``faces`` lados (consome um valor do fluxo)."""
+        return 1 + (((self._next() >> 32) * faces) >> 32)
+
+    def rolls(self, faces: int, count: int) -> np.ndarray:
+        """Rola ``count`` dados de uma vez; igual a ``count`` chamadas de ``roll``."""
+        steps = np.arange(self.counter + 1, self.counter + count + 1, dtype=np.uint64)
+        values = _mix_array(np.uint64(self.key) + steps * np.uint64(_GOLDEN))
+        self.counter += count
+        faces_rolled: np.ndarray = (
+            1 + (((values >> np.uint64(32)) * np.uint64(faces)) >> np.uint64(32))).astype(np.int64)
+        return faces_rolled
+
+    def buffer(self, faces: int) -> 'DiceBuffer':
+        """Buffer de rolagens pré-geradas do dado de ``faces`` lados.
+
+        Cada tamanho de dado tem seu próprio subfluxo (``"d20"``, ``"d6"``...),
+        então os buffers não consomem o fluxo principal. Laços quentes podem
+        guardar o buffer e chamá-lo diretamente (``d20 = stream.buffer(20)``).
+        """
+        buffer = self._buffers.get(faces)
+        if buffer is None:
+            buffer = self._buffers[faces] = DiceBuffer(self.substream(f"d{faces}"), faces)
+        return buffer
+
+    def die(self, faces: int) -> int:
+        """Rola um dado a partir do buffer pré-gerado."""
+        return self.buffer(faces)()
+
+    def d20(self) -> int:
+        """Rola um d20 a partir do buffer pré-gerado."""
+        return self.die(20)
+
+    def getstate(self) -> tuple:
+        buffers = tuple((faces, buffer.position()) for faces, buffer in self._buffers.items())
+        return (self.key, self.counter, self.gauss_next, buffers)
+
+    def setstate(self, state: tuple) -> None:
+        self.key, self.counter, self.gauss_next, buffers = state
+        self._buffers = {
+            faces: DiceBuffer(DiceStream(derive_key(self.key, f"d{faces}"), position), faces)
+            for faces, position in buffers
+        }
+
+class DiceBuffer:
+    """Rolagens de um dado geradas em blocos NumPy e consumidas uma a uma."""
+    __slots__ = ('stream', 'faces', 'size', '_values', '_index')
+
+    def __init__(self, stream: DiceStream, faces: int, size: int = DEFAULT_BUFFER_SIZE):
+        self.stream = stream
+        self.faces = faces
+        self.size = size
+        self._values: list = []
+        self._index = 0
+
+    def __call__(self) -> int:
+        index = self._index
+        if index == len(self._values):
+            self._values = self.stream.rolls(self.faces, self.size).tolist()
+            index = 0
+        self._index = index + 1
+        value: int = self._values[index]
+        return value
+
+    def position(self) -> int:
+        """Contador do fluxo descontando as rolagens ainda não consumidas."""
+        return self.stream.counter - (len(self._values) - self._index)
+
+class RngService:
+    """Fonte de aleatoriedade injetável, com um fluxo por subsistema.
+
+    Cada nome (``"initiative"``, ``"crafting"``...) tem seu próprio
+    ``DiceStream``, derivado da semente: o que um subsistema consome não
+    altera os outros, e a mesma semente reproduz a partida inteira.
+    """
+
+    def __init__(self, seed: Optional[int] = None):
+        if seed is None:
+            seed = int.from_bytes(os.urandom(8), 'little')
+        self.seed = seed & _MASK
+        self._streams: Dict[str, DiceStream] = {}
+
+    def stream(self, name: str) -> DiceStream:
+        """Retorna (criando, se preciso) o fluxo do subsistema ``name``."""
+        stream = self._streams.get(name)
+        if stream is None:
+            stream = self._streams[name] = DiceStream(derive_key(self.seed, name))
+        return stream
+
+    def spawn(self, index: int) -> 'RngService':
+        """Serviço independente para a tarefa ``index`` (ex.: lutas em paralelo)."""
+        return RngService(_mix((self.seed + (index + 1) * _GOLDEN) & _MASK))
+
+    def getstate(self) -> Dict[str, tuple]:
+        """Estado de todos os fluxos criados, para replays."""
+        return {name: stream.getstate() for name, stream in self._streams.items()}
+
+    def setstate(self, state: Dict[str, tuple]) -> None:
+        """Restaura o estado capturado por ``getstate``."""
+        for name, stream_state in state.items():
+            self.stream(name).setstate(stream_state)
+
+def roll_die(rng: Union[random.Random, DiceStream], faces: int) -> int:
+    """Rola um dado com qualquer gerador; com um ``DiceStream``, usa os buffers."""
+    if isinstance(rng, DiceStream):
+        return rng.die(faces)
+    return rng.randint(1, faces)
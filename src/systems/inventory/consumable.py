@@ -1,5 +1,6 @@
 from typing import Dict, Any, Optional, List, Callable
 from dataclasses import dataclass, field
+from enum import Enum, auto
 from .item import Item, ItemType, ItemEffect
 
 class ConsumableType(Enum):
@@ -22,7 +23,8 @@ class ConsumableEffect(ItemEffect):
 @dataclass
 class Consumable(Item):
     """Classe para itens consumiveis."""
-    consumable_type: ConsumableType
+    # Obrigatório; o padrão só existe porque os campos de Item já têm padrões
+    consumable_type: Optional[ConsumableType] = None
     use_time: float = 1.0  # Tempo em segundos para usar
     cooldown: float = 0.0  # Tempo em segundos entre usos
     charges: Optional[int] = None  # Número de usos, None para infinito
@@ -31,6 +33,8 @@ class Consumable(Item):
     custom_use_effect: Optional[Callable[[Any], None]] = None
     
     def __post_init__(self):
+        if self.consumable_type is None:
+            raise ValueError(f"Consumível {self.name} precisa de um tipo")
         super().__post_init__()
         self.item_type = ItemType.CONSUMABLE
     
@@ -1,6 +1,7 @@
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 from enum import Enum, auto
+import random
 from .item import Item, ItemType, ItemRarity
 
 class CraftingType(Enum):
@@ -66,6 +67,8 @@ class CraftingSystem:
     recipes: Dict[str, CraftingRecipe] = field(default_factory=dict)
     skill_levels: Dict[CraftingType, int] = field(default_factory=dict)
     active_stations: List[str] = field(default_factory=list)
+    # Gerador das rolagens de crafting (ex.: RngService(seed).stream("crafting"))
+    rng: random.Random = field(default_factory=random.Random, repr=False, compare=False)
     
     def __post_init__(self):
         # Inicializa níveis de habilidade
@@ -134,8 +137,7 @@ class CraftingSystem:
         crafter_level = self.skill_levels[recipe.requirements.skill_type]
         success_chance = recipe.calculate_success_chance(crafter_level)
         
-        import random
-        roll = random.random() + quality_bonus
+        roll = self.rng.random() + quality_bonus
         
         if roll <= success_chance:
             # Determina qualidade
@@ -187,9 +189,8 @@ class CraftingSystem:
     
     def _return_some_materials(self, recipe: CraftingRecipe, inventory: Any) -> None:
         """Retorna alguns materiais quando o crafting falha."""
-        import random
         for material, amount in recipe.requirements.materials.items():
             # 50% de chance de recuperar cada material
-            returned_amount = sum(1 for _ in range(amount) if random.random() > 0.5)
+            returned_amount = sum(1 for _ in range(amount) if self.rng.random() > 0.5)
             if returned_amount > 0:
                 inventory.add_item_by_name(material, returned_amount)
\ No newline at end of file
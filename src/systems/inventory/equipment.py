@@ -1,11 +1,13 @@
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field
 from .item import Item, ItemType, EquipmentSlot, ItemEffect
+from ..character.stats import ModifierLayer
 
 @dataclass
 class Equipment(Item):
     """Classe para itens equipáveis."""
-    slot: EquipmentSlot
+    # Obrigatório; o padrão só existe porque os campos de Item já têm padrões
+    slot: Optional[EquipmentSlot] = None
     defense: int = 0
     attack: int = 0
     magic_attack: int = 0
@@ -15,8 +17,13 @@ class Equipment(Item):
     class_requirements: List[str] = field(default_factory=list)
     enchantments: List[ItemEffect] = field(default_factory=list)
     set_name: Optional[str] = None
+    # Tokens dos modificadores aplicados, por ID do personagem que equipa o item
+    _modifier_tokens: Dict[int, List[int]] = field(default_factory=dict, repr=False,
+                                                   compare=False)
     
-    def __post_init__(self):
+    def __post_init__(self) -> None:
+        if self.slot is None:
+            raise ValueError(f"Equipamento {self.name} precisa de um slot")
         super().__post_init__()
         self.stackable = False
         self.requirements.update(self.stat_requirements)
@@ -39,35 +46,39 @@ class Equipment(Item):
         
         return True
     
+    def stat_modifiers(self) -> Dict[str, int]:
+        """Soma os bônus do item, de seus efeitos permanentes e dos encantamentos."""
+        modifiers = {
+            'defense': self.defense,
+            'attack': self.attack,
+            'magic_attack': self.magic_attack,
+            'magic_defense': self.magic_defense
+        }
+        for effect in [e for e in self.effects if e.is_permanent] + self.enchantments:
+            for stat, value in effect.stat_modifiers.items():
+                modifiers[stat] = modifiers.get(stat, 0) + value
+        return {stat: value for stat, value in modifiers.items() if value}
+    
     def on_equip(self, character: Any) -> None:
-        """Chamado quando o item é equipado."""
-        # Aplica modificadores base
-        character.modify_stat('defense', self.defense)
-        character.modify_stat('attack', self.attack)
-        character.modify_stat('magic_attack', self.magic_attack)
-        character.modify_stat('magic_defense', self.magic_defense)
-        
-        # Aplica efeitos
-        self.apply_effects(character)
+        """Chamado quando o item é equipado.
+
+        Os bônus entram na camada de equipamento do personagem e são retirados
+        pelos seus tokens em ``on_unequip``, sem reverter valores.
+        """
+        self._modifier_tokens[character.id] = [
+            character.add_modifier(stat, value, ModifierLayer.EQUIPMENT)
+            for stat, value in self.stat_modifiers().items()
+        ]
         
-        # Aplica encantamentos
-        for enchantment in self.enchantments:
-            enchantment.apply_effects(character)
+        # Aplica efeitos temporários
+        for effect in self.effects:
+            if not effect.is_permanent:
+                self._apply_temporary_effect(effect, character)
     
     def on_unequip(self, character: Any) -> None:
         """Chamado quando o item é desequipado."""
-        # Remove modificadores base
-        character.modify_stat('defense', -self.defense)
-        character.modify_stat('attack', -self.attack)
-        character.modify_stat('magic_attack', -self.magic_attack)
-        character.modify_stat('magic_defense', -self.magic_defense)
-        
-        # Remove efeitos
-        self.remove_effects(character)
-        
-        # Remove encantamentos
-        for enchantment in self.enchantments:
-            enchantment.remove_effects(character)
+        for token in self._modifier_tokens.pop(character.id, ()):
+            character.remove_modifier(token)
     
     def add_enchantment(self, enchantment: ItemEffect) -> None:
         """Adiciona um encantamento ao equipamento."""
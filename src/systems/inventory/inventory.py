@@ -1,4 +1,4 @@
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 from dataclasses import dataclass, field
 from .item import Item, ItemType, EquipmentSlot
 from .equipment import Equipment
@@ -112,16 +112,18 @@ class Inventory:
             return False
             
         equipment = slot.item
-        if not equipment.can_be_equipped_by(character):
+        # Equipment sempre tem slot (validado em __post_init__)
+        equipment_slot = equipment.slot
+        if equipment_slot is None or not equipment.can_be_equipped_by(character):
             return False
         
         # Se já houver um item equipado neste slot, desequipa primeiro
-        current_equipped = self.equipped_items[equipment.slot]
+        current_equipped = self.equipped_items[equipment_slot]
         if current_equipped:
-            self.unequip_item(equipment.slot, character)
+            self.unequip_item(equipment_slot, character)
         
         # Equipa o novo item
-        self.equipped_items[equipment.slot] = equipment
+        self.equipped_items[equipment_slot] = equipment
         equipment.on_equip(character)
         slot.item = None
         
@@ -60,6 +60,9 @@ class Item:
     effects: List[ItemEffect] = field(default_factory=list)
     tags: List[str] = field(default_factory=list)
     
+    def __post_init__(self) -> None:
+        """Validação pós-construção; subclasses chamam ``super().__post_init__()``."""
+    
     def can_stack_with(self, other: 'Item') -> bool:
         """Verifica se este item pode ser empilhado com outro."""
         if not self.stackable or not other.stackable:
@@ -52,6 +52,8 @@ class NarrativeAid:
     plot_hooks: List[PlotHook] = field(default_factory=list)
     environment_descriptions: List[EnvironmentDescription] = field(default_factory=list)
     consequences: List[ActionConsequence] = field(default_factory=list)
+    # Gerador das escolhas aleatórias (ex.: RngService(seed).stream("narrative"))
+    rng: random.Random = field(default_factory=random.Random, repr=False, compare=False)
     
     def __post_init__(self):
         self._initialize_default_content()
@@ -151,7 +153,7 @@ class NarrativeAid:
                hook.urgency >= min_urgency and
                hook.complexity <= max_complexity
         ]
-        return random.choice(suitable_hooks) if suitable_hooks else None
+        return self.rng.choice(suitable_hooks) if suitable_hooks else None
     
     def get_environment_description(self, tags: Set[str] = None,
                                    time_of_day: Optional[str] = None,
@@ -163,7 +165,7 @@ class NarrativeAid:
                (not time_of_day or desc.time_of_day == time_of_day) and
                (not weather or desc.weather == weather)
         ]
-        return random.choice(suitable_descs) if suitable_descs else None
+        return self.rng.choice(suitable_descs) if suitable_descs else None
     
     def get_consequence(self, tags: Set[str] = None,
                         min_severity: int = 1,
@@ -175,7 +177,7 @@ class NarrativeAid:
                cons.severity >= min_severity and
                (not timeframe or cons.timeframe == timeframe)
         ]
-        return random.choice(suitable_consequences) if suitable_consequences else None
+        return self.rng.choice(suitable_consequences) if suitable_consequences else None
     
     def search_elements(self, query: str,
                         element_type: Optional[NarrativeElementType] = None) -> List[NarrativeElement]:
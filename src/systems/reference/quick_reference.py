@@ -3,6 +3,9 @@ from dataclasses import dataclass, field
 from enum import Enum, auto
 import random
 
+# Gerador das tabelas roladas sem ``rng``
+_rng = random.Random()
+
 class ReferenceType(Enum):
     RULE = auto()        # Regras básicas
     COMBAT = auto()      # Regras de combate
@@ -30,17 +33,19 @@ class ReferenceTable:
     entries: List[str]
     weights: Optional[List[float]] = None  # Para tabelas com probabilidades diferentes
     
-    def roll(self) -> str:
+    def roll(self, rng: Optional[random.Random] = None) -> str:
         """Retorna uma entrada aleatória da tabela."""
+        rng = rng if rng is not None else _rng
         if self.weights:
-            return random.choices(self.entries, weights=self.weights, k=1)[0]
-        return random.choice(self.entries)
+            return rng.choices(self.entries, weights=self.weights, k=1)[0]
+        return rng.choice(self.entries)
     
-    def roll_multiple(self, count: int) -> List[str]:
+    def roll_multiple(self, count: int, rng: Optional[random.Random] = None) -> List[str]:
         """Retorna múltiplas entradas aleatórias da tabela."""
+        rng = rng if rng is not None else _rng
         if self.weights:
-            return random.choices(self.entries, weights=self.weights, k=count)
-        return random.sample(self.entries, min(count, len(self.entries)))
+            return rng.choices(self.entries, weights=self.weights, k=count)
+        return rng.sample(self.entries, min(count, len(self.entries)))
 
 @dataclass
 class ContentGenerator:
@@ -49,9 +54,9 @@ class ContentGenerator:
     description: str
     tables: Dict[str, ReferenceTable]
     
-    def generate(self) -> Dict[str, str]:
+    def generate(self, rng: Optional[random.Random] = None) -> Dict[str, str]:
         """Gera uma combinação de elementos das tabelas."""
-        return {name: table.roll() for name, table in self.tables.items()}
+        return {name: table.roll(rng) for name, table in self.tables.items()}
 
 @dataclass
 class QuickReference:
@@ -59,6 +64,8 @@ class QuickReference:
     entries: Dict[str, ReferenceEntry] = field(default_factory=dict)
     tables: Dict[str, ReferenceTable] = field(default_factory=dict)
     generators: Dict[str, ContentGenerator] = field(default_factory=dict)
+    # Gerador das rolagens de tabela (ex.: RngService(seed).stream("reference"))
+    rng: random.Random = field(default_factory=random.Random, repr=False, compare=False)
     
     def __post_init__(self):
         self._initialize_default_content()
@@ -195,14 +202,14 @@ class QuickReference:
         """Rola em uma tabela específica."""
         table = self.tables.get(table_name)
         if table:
-            return table.roll()
+            return table.roll(self.rng)
         return None
     
     def generate_content(self, generator_name: str) -> Optional[Dict[str, str]]:
         """Gera conteúdo usando um gerador específico."""
         generator = self.generators.get(generator_name)
         if generator:
-            return generator.generate()
+            return generator.generate(self.rng)
         return None
     
     def export_all_entries(self, format: str = "markdown") -> str:
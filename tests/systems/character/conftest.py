@@ -0,0 +1,10 @@
+import pytest
+from src.systems.character import status_effect
+
+@pytest.fixture(autouse=True)
+def effect_catalog():
+    """Restaura o catálogo global de efeitos depois de cada teste."""
+    saved = dict(status_effect._TEMPLATES)
+    yield status_effect.EFFECT_TEMPLATES
+    status_effect._TEMPLATES.clear()
+    status_effect._TEMPLATES.update(saved)
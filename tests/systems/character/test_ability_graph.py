@@ -0,0 +1,119 @@
+import random
+import pytest
+from src.systems.character.ability_graph import PrerequisiteGraph
+from src.systems.character.ability_system import (
+    Ability, AbilityCost, AbilityRequirement, AbilityResource, AbilitySystem, AbilityTree,
+    AbilityType
+)
+
+def make_ability(name, level=1, **attributes):
+    return Ability(name, name, AbilityType.ACTIVE, AbilityCost(AbilityResource.NONE),
+                   AbilityRequirement(level=level, attributes=attributes))
+
+@pytest.fixture
+def system():
+    system = AbilitySystem()
+    system.add_ability_tree("magia", "Magias arcanas")
+    system.add_ability("magia", make_ability("faisca"))
+    system.add_ability("magia", make_ability("chama", level=2, intelligence=12), {"faisca"})
+    system.add_ability("magia", make_ability("bola_de_fogo", level=5), {"chama"})
+    system.add_ability("magia", make_ability("escudo", wisdom=10))
+    return system
+
+def test_cycles_are_rejected_at_registration(system):
+    with pytest.raises(ValueError, match="faisca -> bola_de_fogo -> chama -> faisca"):
+        system.add_ability("magia", make_ability("faisca"), {"bola_de_fogo"})
+    with pytest.raises(ValueError):
+        system.add_ability("magia", make_ability("eco"), {"eco"})
+    # A árvore não é alterada quando o registro falha
+    assert "faisca" not in system.trees["magia"].prerequisites
+
+    tree = AbilityTree("Direta", "Editada sem add_ability")
+    tree.abilities = {"a": make_ability("a"), "b": make_ability("b")}
+    tree.prerequisites = {"a": {"b"}, "b": {"a"}}
+    with pytest.raises(ValueError, match="Ciclo"):
+        tree.graph
+
+def test_topological_order_puts_prerequisites_first(system):
+    order = system.trees["magia"].graph.order
+    assert order.index("faisca") < order.index("chama") < order.index("bola_de_fogo")
+
+def test_learnable_set_tracks_learning_and_attributes(system):
+    attributes = {"intelligence": 10}
+    assert system.get_learnable_abilities("magia", 1, attributes) == {"faisca"}
+    assert system.learn_ability("magia", "faisca", 1, attributes)
+    assert system.get_learnable_abilities("magia", 1, attributes) == set()
+    assert system.get_learnable_abilities("magia", 2, {"intelligence": 12}) == {"chama"}
+    assert system.get_learnable_abilities("magia", 2, {"intelligence": 12, "wisdom": 10}) == {
+        "chama", "escudo"}
+    assert not system.can_learn_ability("magia", "chama", 1, {"intelligence": 12})
+    assert system.get_learnable_abilities("desconhecida", 1, {}) == frozenset()
+
+def test_learnable_set_matches_full_recheck():
+    rng = random.Random(7)
+    tree = AbilityTree("Aleatória", "")
+    names = [f"h{index}" for index in range(60)]
+    for index, name in enumerate(names):
+        attributes = {attr: rng.randint(8, 16) for attr in rng.sample(["str", "int", "wis"], 2)}
+        prereqs = set(rng.sample(names[:index], min(index, rng.randint(0, 2))))
+        tree.add_ability(name, make_ability(name, rng.randint(1, 6), **attributes), prereqs)
+
+    system = AbilitySystem()
+    system.trees["aleatoria"] = tree
+
+    def expected(level, attributes):
+        return {name for name in names if name not in system.learned_abilities
+                and level >= tree.abilities[name].requirements.level
+                and all(attributes.get(attr, -1) >= value for attr, value
+                        in tree.abilities[name].requirements.attributes.items())
+                and tree.prerequisites.get(name, set()) <= system.learned_abilities.keys()}
+
+    for _ in range(200):
+        level = rng.randint(1, 6)
+        attributes = {attr: rng.randint(8, 16) for attr in rng.sample(["str", "int", "wis"], 2)}
+        learnable = system.get_learnable_abilities("aleatoria", level, attributes)
+        assert learnable == expected(level, attributes)
+        if learnable and rng.random() < 0.3:
+            assert system.learn_ability("aleatoria", rng.choice(sorted(learnable)), level,
+                                        attributes)
+
+def test_graph_indexes_requirements():
+    graph = PrerequisiteGraph({"a": make_ability("a", 2, str=10), "b": make_ability("b", 4)}, {})
+    assert graph.level_changes(1, 3) == ["a"] and graph.level_changes(4, 1) == ["a", "b"]
+    assert graph.attribute_changes("str", float("-inf"), 10) == ["a"]
+    assert graph.attribute_changes("dex", 1, 20) == []
+
+def test_direct_prerequisite_edits_recompile_the_graph():
+    system = AbilitySystem()
+    tree = system.trees["combate"]
+    assert system.can_learn_ability("combate", "postura_defensiva", 5, {})
+    tree.prerequisites["postura_defensiva"] = {"golpe_preciso"}
+    assert not system.can_learn_ability("combate", "postura_defensiva", 5, {})
+    assert "postura_defensiva" not in system.get_learnable_abilities("combate", 5, {})
+    assert tree.graph.prerequisites["postura_defensiva"] == {"golpe_preciso"}
+
+    # Os conjuntos são imutáveis: toda edição passa pelo dicionário
+    with pytest.raises(AttributeError):
+        tree.prerequisites["postura_defensiva"].clear()
+    del tree.prerequisites["postura_defensiva"]
+    assert system.can_learn_ability("combate", "postura_defensiva", 5, {})
+
+    tree.prerequisites = {"golpe_preciso": {"postura_defensiva"}}
+    assert not system.can_learn_ability("combate", "golpe_preciso", 5, {})
+    tree.prerequisites.update(postura_defensiva={"golpe_preciso"})
+    with pytest.raises(ValueError, match="Ciclo"):
+        tree.graph
+
+def test_replaced_abilities_refresh_the_caches():
+    system = AbilitySystem()
+    tree = system.trees["combate"]
+    assert not system.can_learn_ability("combate", "postura_defensiva", 1, {})
+    tree.abilities["postura_defensiva"] = make_ability("postura_defensiva", level=1)
+    assert system.can_learn_ability("combate", "postura_defensiva", 1, {})
+
+    # Trocar uma habilidade aprendida por outra (mesmo total) também recria o conjunto
+    assert system.learn_ability("combate", "golpe_preciso", 5, {})
+    assert "postura_defensiva" in system.get_learnable_abilities("combate", 5, {})
+    del system.learned_abilities["golpe_preciso"]
+    system.learned_abilities["postura_defensiva"] = tree.abilities["postura_defensiva"]
+    assert system.get_learnable_abilities("combate", 5, {}) == {"golpe_preciso"}
@@ -155,4 +155,22 @@ def test_status_effect_management(character):
     assert not character.has_status_effect("poison")
     
     # Tenta remover efeito inexistente
-    assert character.remove_status_effect("nonexistent") is None
\ No newline at end of file
+    assert character.remove_status_effect("nonexistent") is None
+
+def test_characters_compare_by_identity():
+    first = Character(name="Goblin")
+    second = Character(name="Goblin")
+    assert first != second
+    assert first == first
+    assert len({first, second}) == 2
+
+def test_character_id():
+    first = Character(name="Goblin")
+    second = Character(name="Goblin")
+    assert first.id != second.id
+    assert first.clone().id == first.id
+
+def test_character_id_helper(character):
+    from src.systems.character.character import character_id
+    assert character_id(character) == character.id
+    assert character_id(character.id) == character.id
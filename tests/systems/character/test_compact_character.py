@@ -0,0 +1,94 @@
+import pytest
+from src.systems.character.character import Character
+from src.systems.character.compact_character import CompactCharacter, CoreStat
+from src.systems.combat.combat_state import CombatState
+
+@pytest.fixture
+def character():
+    return CompactCharacter(name="Goblin", stats={"hp": 7, "max_hp": 7, "stealth": 6})
+
+def test_default_stats_match_character():
+    compact = CompactCharacter(name="Test")
+    assert dict(compact.stats) == Character(name="Test").stats
+
+def test_get_and_modify_stat(character):
+    assert character.get_stat("hp") == 7
+    assert character.get_stat("stealth") == 6
+    assert character.get_stat("unknown") is None
+
+    character.modify_stat("strength", 2)
+    character.modify_stat("stealth", -1)
+    character.modify_stat("unknown", 5)
+    assert character.get_stat("strength") == 12
+    assert character.get_stat("stealth") == 5
+    assert "unknown" not in character.stats
+
+def test_stats_view(character):
+    character.stats["dexterity"] = 14
+    character.stats["perception"] = 3
+    assert character.get_stat("dexterity") == 14
+    assert character.stats["perception"] == 3
+    assert len(character.stats) == len(CoreStat) + 2
+    with pytest.raises(KeyError):
+        del character.stats["hp"]
+
+def test_hp_and_mana(character):
+    character.take_damage(10)
+    assert not character.is_alive()
+    character.heal(20)
+    assert character.get_stat("hp") == 7
+    assert character.use_mana(4)
+    assert not character.use_mana(10)
+    character.restore_mana(100)
+    assert character.get_stat("mp") == 10
+
+def test_level_up(character):
+    character.add_experience(2500)
+    assert character.level == 3
+    assert character.get_stat("max_hp") == 17
+    assert character.get_stat("hp") == 17
+
+def test_lazy_collections(character):
+    assert character._inventory is None
+    assert not character.has_item("Adaga")
+
+    class Item:
+        name = "Adaga"
+
+    character.add_to_inventory(Item())
+    assert character.has_item("Adaga")
+    assert character.remove_from_inventory("Adaga").name == "Adaga"
+
+def test_round_trip_with_character():
+    original = Character(name="Orc", stats={"hp": 15, "rage": 2}, level=3)
+    compact = CompactCharacter.from_character(original)
+    assert compact.id == original.id
+    assert compact.get_stat("rage") == 2
+
+    restored = compact.to_character()
+    assert restored.id == original.id
+    assert restored.stats == original.stats
+    assert restored.level == 3
+
+def test_compact_character_in_combat():
+    participants = [CompactCharacter(name=f"Goblin {i}") for i in range(3)]
+    state = CombatState()
+    state.start_combat(participants)
+    assert state.next_turn() in participants
+    participants[0].take_damage(100)
+    assert len(state.get_remaining_participants()) == 2
+
+def test_modifier_tokens_are_never_reused(character):
+    first = character.add_modifier("strength", 1)
+    second = character.add_modifier("strength", 2)
+    assert character.remove_modifier(second)
+    third = character.add_modifier("strength", 4)
+    assert third not in (first, second)
+    # Um token antigo não remove o modificador de outro
+    assert not character.remove_modifier(second)
+    assert character.get_stat("strength") == character.get_base_stat("strength") + 5
+
+    snapshot = character.snapshot_stats()
+    fourth = character.add_modifier("strength", 8)
+    character.restore_stats(snapshot)
+    assert character.add_modifier("strength", 1) not in (first, third, fourth)
@@ -0,0 +1,59 @@
+import pytest
+from src.systems.character import effect_history
+from src.systems.character.effect_history import EffectHistory, EffectRecord
+from src.systems.character.status_effect import StatusEffectManager
+
+def records(count):
+    return [EffectRecord("envenenado", tick, tick + 4, 1) for tick in range(count)]
+
+def test_ring_buffer_keeps_most_recent():
+    history = EffectHistory(capacity=3)
+    for record in records(5):
+        history.append(record)
+    assert len(history) == 3
+    assert history.recent() == records(5)[2:]
+    assert history.recent(2) == records(5)[3:]
+    assert history.recent(0) == []
+    assert history.recent(10) == records(5)[2:]
+    assert list(history.spilled()) == []
+    with pytest.raises(ValueError):
+        EffectHistory(capacity=0)
+
+def test_evicted_records_spill_to_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(effect_history, "SPILL_BATCH", 2)
+    path = tmp_path / "historico.csv"
+    history = EffectHistory(capacity=2, spill_path=str(path))
+    for record in records(5):
+        history.append(record)
+    # Dois registros já foram gravados em lote; o terceiro, só no flush
+    assert len(path.read_text().splitlines()) == 2
+    assert list(history.spilled()) == records(5)[:3]
+    assert history.recent() == records(5)[3:]
+
+def test_manager_history_is_bounded():
+    manager = StatusEffectManager(effect_history=EffectHistory(capacity=4))
+    for _ in range(10):
+        manager.apply_effect("amedrontado", {})
+        manager.update_effects({})
+        manager.update_effects({})
+    history = manager.get_effect_history()
+    assert len(history) == 4
+    assert history[-1] == EffectRecord("amedrontado", 18, 20, 1)
+
+def test_short_history_spills_on_close(tmp_path):
+    path = tmp_path / "historico.csv"
+    with EffectHistory(capacity=2, spill_path=str(path)) as history:
+        for record in records(5):
+            history.append(record)
+        # Menos descartados que um lote: nada no disco ainda
+        assert not path.exists()
+    assert list(EffectHistory(spill_path=str(path)).spilled()) == records(5)[:3]
+
+def test_manager_close_flushes_history(tmp_path):
+    path = tmp_path / "heroi.csv"
+    with StatusEffectManager(effect_history=EffectHistory(1, str(path))) as manager:
+        for _ in range(3):
+            manager.apply_effect("amedrontado", {})
+            manager.update_effects({})
+            manager.update_effects({})
+    assert len(path.read_text().splitlines()) == 2
@@ -0,0 +1,66 @@
+import pytest
+from src.systems.character.character import Character
+from src.systems.character.compact_character import CompactCharacter
+from src.systems.character.progression import (
+    LEVEL_CHANGE_LISTENERS,
+    LevelChange,
+    XPCurve,
+    award_experience
+)
+
+@pytest.fixture
+def events():
+    received = []
+    LEVEL_CHANGE_LISTENERS.append(received.append)
+    yield received
+    LEVEL_CHANGE_LISTENERS.remove(received.append)
+
+def test_curve_lookup_and_extrapolation():
+    curve = XPCurve([0, 300, 900, 2700], max_level=10)
+    assert [curve.level_for(xp) for xp in (0, 299, 300, 2699, 2700)] == [1, 1, 2, 3, 4]
+    # Depois da tabela, cada nível custa o último degrau (1800)
+    assert curve.level_for(2700 + 1800 * 2) == 6
+    assert curve.level_for(10 ** 9) == 10
+    assert curve.experience_for(6) == 2700 + 1800 * 2
+    assert curve.levels_for([0, 300, 6300, 10 ** 9]).tolist() == [1, 2, 6, 10]
+    with pytest.raises(ValueError):
+        XPCurve([0, 100, 100])
+
+def test_big_grant_jumps_levels_in_one_step(events):
+    hero = Character(name="Herói")
+    change = hero.add_experience(49_500)
+    assert change == LevelChange(hero, 1, 50)
+    assert events == [change]
+    assert hero.stats["max_hp"] == 10 + 5 * 49 and hero.stats["hp"] == hero.stats["max_hp"]
+    assert hero.stats["max_mp"] == 10 + 3 * 49
+    assert hero.add_experience(100) is None
+    assert len(events) == 1
+
+def test_matches_level_by_level_progression():
+    stepped, jumped = Character(name="A"), Character(name="B")
+    for _ in range(7):
+        stepped.add_experience(1000)
+    jumped.add_experience(7000)
+    assert (stepped.level, dict(stepped.stats)) == (jumped.level, dict(jumped.stats))
+
+def test_award_experience_to_raid(events):
+    raid = [Character(name=f"Aventureiro {i}") for i in range(4)] + [CompactCharacter("Goblin")]
+    raid[0].add_experience(900)
+    changes = award_experience(raid, [200, 100, 2000, 0, 3000])
+    assert changes == events
+    assert [(c.character, c.old_level, c.new_level) for c in changes] == [
+        (raid[0], 1, 2), (raid[2], 1, 3), (raid[4], 1, 4)]
+    assert raid[4].get_stat("max_hp") == 25
+    assert [c.experience for c in raid] == [1100, 100, 2000, 0, 3000]
+    with pytest.raises(ValueError):
+        award_experience(raid, [1, 2])
+
+def test_custom_curve_per_class():
+    class Mage(Character):
+        xp_curve = XPCurve.linear(500, stat_gains={"max_mp": 10, "intelligence": 1})
+
+    mage = Mage(name="Maga")
+    mage.add_experience(1000)
+    assert mage.level == 3
+    assert mage.stats["max_mp"] == 30 and mage.stats["mp"] == 30
+    assert mage.stats["intelligence"] == 12 and mage.stats["max_hp"] == 10
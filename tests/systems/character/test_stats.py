@@ -0,0 +1,160 @@
+import pickle
+import pytest
+from src.systems.character.stats import ModifierLayer, StatBlock
+from src.systems.character.character import Character
+from src.systems.character.compact_character import CompactCharacter
+from src.systems.character.status_effect import StatusEffectManager, StatusModifier
+from src.systems.combat.combat_state import CombatState
+from src.systems.combat.condition import Condition, ConditionType
+from src.systems.inventory.equipment import Equipment
+from src.systems.inventory.inventory import Inventory
+from src.systems.inventory.item import ItemType, ItemRarity, ItemEffect, EquipmentSlot
+
+@pytest.fixture
+def block():
+    return StatBlock({"strength": 10, "dexterity": 12, "hp": 20})
+
+def test_modifiers_only_dirty_the_affected_stat(block):
+    token = block.add_modifier("strength", 3, ModifierLayer.EQUIPMENT)
+    assert block._dirty == {"strength"}
+    assert block["strength"] == 13
+    assert not block._dirty
+    assert block.base["strength"] == 10
+
+    assert block.remove_modifier(token)
+    assert block["strength"] == 10
+    assert not block.remove_modifier(token)
+
+def test_layers_and_percentages(block):
+    block.add_modifier("strength", 2, ModifierLayer.EQUIPMENT)
+    block.add_modifier("strength", 0.5, ModifierLayer.EFFECTS, percentage=True)
+    condition = block.add_modifier("strength", -2, ModifierLayer.CONDITIONS)
+    # (10 + 2 - 2) * 1.5
+    assert block["strength"] == 15
+    block.remove_modifier(condition)
+    assert block["strength"] == 18
+
+    assert block.clear_layer(ModifierLayer.EFFECTS) == 1
+    assert block["strength"] == 12
+    assert [m.layer for m in block.get_modifiers("strength")] == [ModifierLayer.EQUIPMENT]
+
+def test_percentages_do_not_drift():
+    block = StatBlock({"speed": 30.0})
+    for _ in range(1000):
+        token = block.add_modifier("speed", 0.1, percentage=True)
+        block.remove_modifier(token)
+    assert block["speed"] == 30.0
+
+def test_writes_change_base_value(block):
+    block.add_modifier("dexterity", 2)
+    block["dexterity"] = 14
+    assert block["dexterity"] == 16
+    assert block.get("missing") is None
+    assert "missing" not in block
+    # Modificador de atributo sem valor base fica registrado, mas invisível
+    block.add_modifier("perception", 1)
+    assert "perception" not in block
+    block["perception"] = 4
+    assert block["perception"] == 5
+
+def test_mapping_behaviour(block):
+    block.add_modifier("hp", 5)
+    assert list(block) == ["strength", "dexterity", "hp"]
+    assert list(block.items()) == [("strength", 10), ("dexterity", 12), ("hp", 25)]
+    assert block == {"strength": 10, "dexterity": 12, "hp": 25}
+    assert dict(block) == {"strength": 10, "dexterity": 12, "hp": 25}
+    assert len(block) == 3
+
+def test_snapshot_copy_and_pickle(block):
+    token = block.add_modifier("strength", 4)
+    snapshot = block.snapshot()
+    copy = block.copy()
+    block.remove_modifier(token)
+    block["hp"] = 1
+
+    assert copy["strength"] == 14 and copy["hp"] == 20
+    assert pickle.loads(pickle.dumps(copy)) == copy
+    block.restore(snapshot)
+    assert block["strength"] == 14 and block["hp"] == 20
+    # Tokens não são reutilizados depois do rollback
+    assert block.add_modifier("hp", 1) > token
+
+def test_character_resources_use_base_values():
+    character = Character(name="Guardião", stats={"hp": 10, "max_hp": 10})
+    character.add_modifier("max_hp", 5, ModifierLayer.EQUIPMENT)
+    character.heal(100)
+    assert character.stats["hp"] == 15
+    character.take_damage(4)
+    assert character.stats["hp"] == 11
+
+    character.level_up()
+    assert character.get_base_stat("max_hp") == 15
+    assert character.stats["max_hp"] == 20
+    clone = character.clone()
+    clone.clear_modifiers(ModifierLayer.EQUIPMENT)
+    assert clone.stats["max_hp"] == 15
+    assert character.stats["max_hp"] == 20
+
+def test_compact_character_flat_modifiers():
+    compact = CompactCharacter("Goblin", stats={"strength": 8})
+    token = compact.add_modifier("strength", 2, ModifierLayer.CONDITIONS)
+    assert compact.stats["strength"] == 10
+    assert compact.get_base_stat("strength") == 8
+    snapshot = compact.snapshot_stats()
+    assert compact.clear_modifiers(ModifierLayer.CONDITIONS) == 1
+    assert compact.stats["strength"] == 8
+    compact.restore_stats(snapshot)
+    assert compact.remove_modifier(token)
+    assert compact.stats["strength"] == 8
+    with pytest.raises(ValueError):
+        compact.add_modifier("strength", 0.1, percentage=True)
+
+def test_status_effects_on_stat_block():
+    manager = StatusEffectManager()
+    manager.register_effect("furia", "Ataque +10% por pilha", None, None, modifiers={
+        "attack": StatusModifier("attack", 0.1, is_percentage=True, stacks=True, max_stacks=3)
+    })
+    stats = StatBlock({"attack": 20})
+    manager.apply_effect("furia", stats)
+    assert stats["attack"] == 22
+    assert manager.stack_effect("furia", stats)
+    assert stats["attack"] == 24
+    manager.remove_effect("furia", stats)
+    assert stats["attack"] == 20
+    assert not stats.get_modifiers()
+
+def test_combat_restore_rebuilds_condition_layer():
+    character = Character(name="Alvo", stats={"strength": 10})
+    state = CombatState()
+    state.start_combat([character])
+    state.condition_manager.add_condition(character, Condition(ConditionType.POISONED, 1))
+    snapshot = state.snapshot()
+    state.condition_manager.remove_condition(character, ConditionType.POISONED)
+    assert character.stats["strength"] == 10
+
+    state.restore(snapshot)
+    assert character.stats["strength"] == 8
+    assert len(character.stats.get_modifiers(layer=ModifierLayer.CONDITIONS)) == 2
+    state.next_turn()
+    assert character.stats["strength"] == 10
+
+def test_equip_and_unequip_use_equipment_tokens():
+    hero = Character(name="Hero", stats={"attack": 5, "defense": 5})
+    sword = Equipment(name="Espada", description="", item_type=ItemType.WEAPON,
+                      rarity=ItemRarity.COMMON, weight=2.0, value=10,
+                      slot=EquipmentSlot.MAIN_HAND, attack=3,
+                      enchantments=[ItemEffect(name="Guarda", description="",
+                                               stat_modifiers={"defense": 2})])
+    inventory = Inventory(max_slots=4, max_weight=50.0)
+    inventory.add_item(sword)
+    # Modificador de equipamento que não pertence ao item
+    ring = hero.add_modifier("attack", 1, ModifierLayer.EQUIPMENT)
+
+    assert inventory.equip_item(0, hero)
+    assert (hero.stats["attack"], hero.stats["defense"]) == (9, 7)
+    assert len(hero.stats.get_modifiers(layer=ModifierLayer.EQUIPMENT)) == 3
+
+    assert inventory.unequip_item(EquipmentSlot.MAIN_HAND, hero)
+    assert (hero.stats["attack"], hero.stats["defense"]) == (6, 5)
+    assert hero.stats.base["attack"] == 5
+    assert hero.remove_modifier(ring)
@@ -0,0 +1,68 @@
+import dataclasses
+import pytest
+from src.systems.character.stats import StatBlock
+from src.systems.character.status_effect import (
+    EFFECT_TEMPLATES, EffectRecord, StatusCategory, StatusEffectManager, StatusModifier,
+    StatusType, register_effect
+)
+
+@pytest.fixture
+def manager():
+    return StatusEffectManager()
+
+def test_manager_starts_empty_and_shares_templates(manager):
+    assert manager.active_effects == {}
+    assert manager.apply_effect("envenenado", {})
+    other = StatusEffectManager()
+    other.apply_effect("envenenado", {})
+    assert manager.active_effects["envenenado"].template is EFFECT_TEMPLATES["envenenado"]
+    assert other.active_effects["envenenado"].template is EFFECT_TEMPLATES["envenenado"]
+    assert not manager.apply_effect("desconhecido", {})
+
+def test_templates_are_immutable():
+    template = EFFECT_TEMPLATES["protegido"]
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        template.duration = 10
+    with pytest.raises(TypeError):
+        template.modifiers["attack"] = StatusModifier("attack", 1)
+
+def test_instances_track_stacks_and_duration(manager):
+    register_effect("bênção", "Ataque +1 por pilha", StatusType.BUFF, StatusCategory.MAGICAL,
+                    duration=2, modifiers={
+                        "attack": StatusModifier("attack", 1, stacks=True, max_stacks=2)
+                    })
+    stats = StatBlock({"attack": 10})
+    manager.apply_effect("bênção", stats)
+    assert manager.stack_effect("bênção", stats) and not manager.stack_effect("bênção", stats)
+    assert stats["attack"] == 12
+    # Reaplicar renova a duração sem somar os modificadores de novo
+    manager.update_effects(stats)
+    assert manager.apply_effect("bênção", stats)
+    assert manager.get_effect_duration("bênção") == 2 and stats["attack"] == 12
+
+    manager.update_effects(stats)
+    manager.update_effects(stats)
+    assert manager.active_effects == {} and stats["attack"] == 10
+    assert manager.get_effect_history() == [EffectRecord("bênção", 0, 3, 2)]
+    assert EFFECT_TEMPLATES["bênção"].modifiers["attack"].value == 1
+
+def test_immunity_blocks_application(manager):
+    manager.add_immunity("amedrontado")
+    assert not manager.apply_effect("amedrontado", {"attack": 5})
+    assert manager.get_active_effects() == []
+
+def test_conflicting_registration_is_rejected(manager):
+    modifiers = {"attack": StatusModifier("attack", 1)}
+    first = register_effect("bênção", "Ataque +1", StatusType.BUFF, StatusCategory.MAGICAL,
+                            duration=2, modifiers=modifiers)
+    assert manager.register_effect("bênção", "Ataque +1", StatusType.BUFF,
+                                   StatusCategory.MAGICAL, duration=2,
+                                   modifiers=modifiers) is first
+    with pytest.raises(ValueError):
+        manager.register_effect("bênção", "Ataque +1", StatusType.BUFF, StatusCategory.MAGICAL,
+                                duration=5, modifiers=modifiers)
+    assert EFFECT_TEMPLATES["bênção"] is first
+
+    replaced = register_effect("bênção", "Ataque +1", StatusType.BUFF, StatusCategory.MAGICAL,
+                               duration=5, modifiers=modifiers, replace=True)
+    assert EFFECT_TEMPLATES["bênção"] is replaced and replaced.duration == 5
@@ -0,0 +1,98 @@
+import pytest
+from src.systems.character.character import Character
+from src.systems.character.status_effect import StatusEffectManager, StatusModifier
+from src.systems.character.status_engine import StatusEngine
+
+@pytest.fixture
+def engine():
+    return StatusEngine()
+
+def test_tick_aggregates_per_owner(engine):
+    engine.add_effect(1, "envenenado", duration=3, ticks={"damage": 3})
+    engine.add_effect(1, "queimando", duration=1, ticks={"damage": 2})
+    engine.add_effect(2, "regeneração", ticks={"heal": 1}, multiplier=2)
+    engine.add_effect(2, "envenenado", duration=2, ticks={"damage": 3})
+
+    tick = engine.tick()
+    # "queimando" expira antes de causar dano, como em update_effects
+    assert tick.as_dict() == {1: {"damage": 3}, 2: {"damage": 3, "heal": 2}}
+    assert tick.expired == [(1, "queimando")]
+    assert engine.get_effects(1) == {"envenenado": 2}
+    assert engine.get_effects(2) == {"regeneração": -1, "envenenado": 1}
+
+    assert engine.tick().as_dict() == {1: {"damage": 3}, 2: {"heal": 2}}
+    assert engine.tick().as_dict() == {2: {"heal": 2}}
+    assert len(engine) == 1
+
+def test_matches_status_effect_manager():
+    manager = StatusEffectManager()
+    manager.apply_effect("envenenado", {})
+    engine = StatusEngine()
+    engine.add_status_effect(7, manager.active_effects["envenenado"])
+    expected = []
+    while manager.active_effects.get("envenenado"):
+        expected.append(manager.update_effects({}))
+    results = [engine.tick().as_dict().get(7) for _ in expected]
+    assert results == [ticks[0] if ticks else None for ticks in expected]
+    assert not engine.get_effects(7)
+
+@pytest.mark.parametrize("duration", [0, 1, 3])
+def test_short_durations_match_manager(duration):
+    manager = StatusEffectManager()
+    manager.apply_effect("envenenado", {})
+    instance = manager.active_effects["envenenado"]
+    instance.remaining = duration
+    engine = StatusEngine()
+    engine.add_status_effect(7, instance)
+
+    expected = []
+    while manager.active_effects.get("envenenado"):
+        expected.append(manager.update_effects({}))
+    results = [engine.tick().as_dict().get(7) for _ in expected]
+    assert results == [ticks[0] if ticks else None for ticks in expected]
+    assert not engine.get_effects(7) and len(engine) == 0
+
+def test_rejects_negative_durations(engine):
+    with pytest.raises(ValueError):
+        engine.add_effect(1, "a", duration=-3)
+
+def test_callbacks_take_slow_path_and_modifiers_expire(engine):
+    hero = Character(name="Herói", stats={"attack": 10})
+    removed = []
+    engine.add_effect(hero, "fúria", duration=2, tick_effect=lambda: {"rage": 1},
+                      removal_effect=lambda: removed.append("fúria"),
+                      modifiers={"attack": StatusModifier("attack", 4)}, stats=hero.stats)
+    assert hero.stats["attack"] == 14
+    assert engine.tick().as_dict() == {hero.id: {"rage": 1}}
+    tick = engine.tick()
+    assert tick.as_dict() == {} and tick.expired == [(hero.id, "fúria")]
+    assert removed == ["fúria"] and hero.stats["attack"] == 10
+
+def test_remove_effect_and_owner(engine):
+    first = engine.add_effect(1, "a", ticks={"damage": 1})
+    engine.add_effect(1, "b", ticks={"damage": 1})
+    engine.add_effect(2, "a", ticks={"damage": 1})
+    assert engine.remove_effect(first) and not engine.remove_effect(first)
+    assert engine.remove_owner(1) == 1
+    assert engine.tick().as_dict() == {2: {"damage": 1}}
+
+def test_removed_rows_are_skipped_until_compacted(engine):
+    hero = Character(name="Herói", stats={"attack": 10})
+    removed = []
+    ids = [engine.add_effect(i, "a", duration=5, ticks={"damage": 1}) for i in range(1, 5)]
+    buff = engine.add_effect(hero, "fúria", duration=5,
+                             removal_effect=lambda: removed.append("fúria"),
+                             modifiers={"attack": StatusModifier("attack", 4)},
+                             stats=hero.stats)
+    assert hero.stats["attack"] == 14
+
+    assert engine.remove_effect(ids[1]) and engine.remove_effect(buff)
+    assert not engine.remove_effect(buff)
+    # Removidas só são marcadas: as colunas continuam com cinco linhas
+    assert len(engine._ids) == 5 and len(engine) == 3
+    assert hero.stats["attack"] == 10 and not engine.get_effects(hero)
+
+    tick = engine.tick()
+    assert tick.as_dict() == {1: {"damage": 1}, 3: {"damage": 1}, 4: {"damage": 1}}
+    assert tick.expired == [] and removed == []
+    assert len(engine._ids) == 3
@@ -0,0 +1,98 @@
+import pytest
+from src.systems.combat.ability_effect import (
+    AbilityEffect,
+    AbilityEffectManager,
+    EffectType,
+    EffectTarget,
+    EffectDuration
+)
+from src.systems.combat.combat_state import CombatState
+from src.systems.combat.condition import Condition, ConditionType, ConditionManager
+from src.systems.combat.damage_type import DamageType, DamageTypeManager
+from src.systems.character.character import Character
+
+@pytest.fixture
+def damage_manager():
+    return DamageTypeManager()
+
+@pytest.fixture
+def condition_manager():
+    return ConditionManager()
+
+@pytest.fixture
+def effect_manager(damage_manager, condition_manager):
+    return AbilityEffectManager(damage_manager=damage_manager,
+                                condition_manager=condition_manager)
+
+@pytest.fixture
+def targets():
+    return [Character(name=f"Alvo {i}", stats={"hp": 40, "strength": 10}) for i in range(3)]
+
+def make_fireball():
+    effect = AbilityEffect(EffectType.DAMAGE, EffectTarget(single_target=False,
+                                                           area_of_effect=True),
+                           EffectDuration())
+    effect.add_damage(DamageType.FIRE, 10)
+    effect.add_damage(DamageType.FORCE, 2)
+    return effect
+
+def make_poison(turns=2):
+    effect = AbilityEffect(EffectType.CONDITION, EffectTarget(),
+                           EffectDuration(instant=False, turns=turns))
+    effect.add_condition(Condition(ConditionType.POISONED, duration=turns))
+    return effect
+
+def test_damage_respects_resistances(effect_manager, damage_manager, targets):
+    damage_manager.add_resistance(targets[0], DamageType.FIRE)
+    damage_manager.add_immunity(targets[1], DamageType.FIRE)
+    dealt = effect_manager.apply_effects([(make_fireball(), targets)])
+    assert dealt == {targets[0].id: 7, targets[1].id: 2, targets[2].id: 12}
+    assert [t.stats["hp"] for t in targets] == [33, 38, 28]
+
+def test_batch_path_matches_scalar_path(damage_manager):
+    many = [Character(name=f"Soldado {i}", stats={"hp": 100}) for i in range(40)]
+    for index, character in enumerate(many):
+        if index % 3 == 1:
+            damage_manager.add_resistance(character, DamageType.FIRE)
+        elif index % 3 == 2:
+            damage_manager.add_vulnerability(character, DamageType.FIRE)
+    scalar = AbilityEffectManager(damage_manager=damage_manager)
+    expected = {c.id: sum(damage_manager.calculate_damage(a, t, c)
+                          for t, a in make_fireball().damage.items()) for c in many}
+    assert AbilityEffectManager(damage_manager=damage_manager).apply_effects(
+        [(make_fireball(), many)]) == expected
+    first = many[0]
+    assert scalar.apply_effects([(make_fireball(), [first])]) == {first.id: expected[first.id]}
+
+def test_conditions_are_instanced_per_target(effect_manager, condition_manager, targets):
+    effect_manager.apply_effects([(make_poison(), targets)])
+    conditions = [condition_manager.get_conditions(t)[0] for t in targets]
+    assert len({id(c) for c in conditions}) == 3
+    assert all(c.type == ConditionType.POISONED for c in conditions)
+    assert [t.stats["strength"] for t in targets] == [8, 8, 8]
+
+def test_several_effects_in_one_call(effect_manager, condition_manager, targets):
+    buff = AbilityEffect(EffectType.BUFF, EffectTarget(), EffectDuration(instant=False, turns=1))
+    buff.add_stat_modifier("strength", 4)
+    dealt = effect_manager.apply_effects([
+        (make_fireball(), targets[:2]),
+        (make_fireball(), targets[1:2]),
+        (buff, targets[2:]),
+    ])
+    assert dealt == {targets[0].id: 12, targets[1].id: 24}
+    assert targets[2].stats["strength"] == 14
+    assert effect_manager.get_active_effects(targets[2]) == [buff]
+
+def test_without_managers_damage_ignores_resistances(targets):
+    manager = AbilityEffectManager()
+    assert manager.apply_effect(make_fireball(), targets[0]) == {targets[0].id: 12}
+    manager.apply_effect(make_poison(), targets[0])
+    assert targets[0].stats["strength"] == 10
+
+def test_combat_state_wires_managers(targets):
+    state = CombatState()
+    state.start_combat(list(targets))
+    state.damage_type_manager.add_vulnerability(targets[0], DamageType.FIRE)
+    state.effect_manager.apply_effects([(make_fireball(), targets[:1]), (make_poison(1), targets)])
+    assert targets[0].stats["hp"] == 18
+    assert all(state.condition_manager.get_conditions(t) for t in targets)
@@ -0,0 +1,151 @@
+import random
+import pytest
+from src.systems.combat.combat_log import CombatEventLog, CombatEvent, replay, INITIATIVE_ACTION
+from src.systems.combat.combat_state import CombatState, CombatAction
+from src.systems.combat.condition import Condition, ConditionType
+from src.systems.combat.damage_type import DamageType
+from src.systems.character.character import Character
+
+@pytest.fixture
+def mock_characters():
+    return [
+        Character(name="Character 1", stats={"hp": 100, "max_hp": 100}),
+        Character(name="Character 2", stats={"hp": 100, "max_hp": 100})
+    ]
+
+def test_append_and_read_events(mock_characters):
+    attacker, defender = mock_characters
+    log = CombatEventLog()
+    log.append_action(CombatAction(actor=attacker, target=defender, action_type="attack",
+                                   damage_type="FIRE", damage_amount=12), 1, 0)
+    log.append_action(CombatAction(actor=defender, action_type="dodge"), 1, 1)
+    log.append_action(CombatAction(actor=defender, target=attacker, action_type="attack",
+                                   damage_type=DamageType.COLD, damage_amount=3), 2, 2)
+
+    assert len(log) == 3
+    events = list(log.events())
+    assert events[0] == CombatEvent(attacker.id, defender.id, "attack", "FIRE", 12, 1, 0)
+    assert events[1] == CombatEvent(defender.id, None, "dodge", None, 0, 1, 1)
+    assert events[2].damage_type == "COLD"
+    assert log.columns["amount"].tolist() == [12, 0, 3]
+    assert log.strings.count("attack") == 1
+
+def test_chunked_flush_round_trip(tmp_path, mock_characters):
+    attacker, defender = mock_characters
+    path = str(tmp_path / "combat.log")
+    log = CombatEventLog(path=path, chunk_size=4)
+    for turn in range(10):
+        action_type = "attack" if turn % 2 else f"spell_{turn % 3}"
+        log.append(attacker.id, defender.id, action_type, "FIRE", turn, turn // 2 + 1, turn)
+
+    assert log.flushed_events == 8
+    assert len(log) == 2
+    log.flush()
+
+    chunks = list(CombatEventLog.iter_chunks(path))
+    assert [len(chunk) for chunk in chunks] == [4, 4, 2]
+
+    loaded = CombatEventLog.load(path)
+    assert len(loaded) == 10
+    events = list(loaded.events())
+    assert [e.amount for e in events] == list(range(10))
+    assert events[3].action_type == "attack"
+    assert events[4].action_type == "spell_1"
+
+def test_flush_without_path():
+    with pytest.raises(ValueError):
+        CombatEventLog().flush()
+
+def test_combat_state_records_events(mock_characters):
+    state = CombatState()
+    state.start_combat(mock_characters)
+    state.next_turn()
+    state.record_action(CombatAction(actor=mock_characters[0], target=mock_characters[1],
+                                     damage_type="SLASHING", damage_amount=7))
+    assert len(state.event_log) == 3
+    events = list(state.event_log.events())
+    assert [e.action_type for e in events[:2]] == [INITIATIVE_ACTION] * 2
+    assert [e.actor_id for e in events[:2]] == [
+        p.id for p in state.initiative.get_initiative_order()]
+    assert events[2].turn == 1
+    assert state.save_state()["event_log"]["amount"][2] == 7
+
+def test_replay_rebuilds_state(mock_characters):
+    attacker, defender = mock_characters
+    log = CombatEventLog()
+    log.append(defender.id, None, INITIATIVE_ACTION, None, 15, 0, 0)
+    log.append(attacker.id, None, INITIATIVE_ACTION, None, 8, 0, 0)
+    log.append(attacker.id, defender.id, "attack", "FIRE", 30, 1, 0)
+    log.append(defender.id, attacker.id, "attack", "COLD", 5, 2, 2)
+
+    state = replay(log.events(), mock_characters)
+    assert state.round_number == 2
+    assert len(state.action_history) == 2
+    assert state.initiative.get_initiative_order() == [defender, attacker]
+    assert state.action_history[0].target is defender
+    assert defender.stats["hp"] == 70
+    assert attacker.stats["hp"] == 95
+    assert list(state.event_log.events()) == list(log.events())
+
+def test_replay_round_trip_with_heal_and_condition(mock_characters):
+    attacker, defender = mock_characters
+    start = [p.snapshot_stats() for p in mock_characters]
+    state = CombatState(random.Random(3))
+    state.start_combat(list(mock_characters))
+    state.next_turn()
+    state.record_action(CombatAction(actor=attacker, target=defender, damage_amount=30))
+    defender.take_damage(30)
+    state.record_action(CombatAction(actor=defender, target=defender, action_type="heal",
+                                     damage_amount=10))
+    defender.heal(10)
+    state.record_action(CombatAction(actor=attacker, target=defender, action_type="condition",
+                                     damage_type="STUNNED", damage_amount=2))
+    order = state.initiative.get_initiative_order()
+    for participant, stats in zip(mock_characters, start):
+        participant.restore_stats(stats)
+
+    # Um RNG diferente não pode mudar a ordem: as rolagens vêm do log
+    random.seed(99)
+    rebuilt = replay(state.event_log.events(), mock_characters)
+    assert rebuilt.initiative.get_initiative_order() == order
+    assert defender.stats["hp"] == 80
+    assert attacker.stats["hp"] == 100
+    assert [c.type for c in rebuilt.condition_manager.get_conditions(defender)] == [
+        ConditionType.STUNNED]
+    assert list(rebuilt.event_log.events()) == list(state.event_log.events())
+
+def test_replay_expires_conditions_like_the_original(mock_characters):
+    for participant in mock_characters:
+        participant.stats["strength"] = 10
+    start = [p.snapshot_stats() for p in mock_characters]
+    state = CombatState(random.Random(3))
+    state.start_combat(list(mock_characters))
+    first, second = state.initiative.get_initiative_order()
+    state.record_action(CombatAction(actor=first, target=second, action_type="condition",
+                                     damage_type="POISONED", damage_amount=1))
+    state.condition_manager.add_condition(second, Condition(ConditionType.POISONED, 1))
+    for _ in range(4):
+        actor = state.next_turn()
+        state.record_action(CombatAction(actor=actor, target=first, damage_amount=5))
+        first.take_damage(5)
+    assert not state.condition_manager.get_conditions(second)
+    end = [dict(p.stats.items()) for p in mock_characters]
+    for participant, stats in zip(mock_characters, start):
+        participant.restore_stats(stats)
+
+    rebuilt = replay(state.event_log.events(), mock_characters)
+    assert [dict(p.stats.items()) for p in mock_characters] == end
+    assert first.stats["hp"] == 80
+    assert second.stats["strength"] == 10
+    assert not rebuilt.condition_manager.get_conditions(second)
+    assert (rebuilt.round_number, rebuilt.turn_number) == (state.round_number, state.turn_number)
+    assert rebuilt.get_current_character() is state.get_current_character()
+
+def test_end_combat_flushes_the_last_chunk(tmp_path, mock_characters):
+    path = str(tmp_path / "combat.log")
+    state = CombatState(random.Random(1))
+    state.event_log = CombatEventLog(path=path, chunk_size=64)
+    state.start_combat(list(mock_characters))
+    state.record_action(CombatAction(actor=mock_characters[0], target=mock_characters[1]))
+    state.end_combat()
+    assert len(CombatEventLog.load(path)) == 3
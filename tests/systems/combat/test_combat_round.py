@@ -5,6 +5,7 @@ from src.systems.combat.combat_round import (
     ActionUsage
 )
 from src.systems.combat.combat_state import CombatState, CombatAction
+from src.systems.combat.condition import Condition, ConditionType
 from src.systems.character.character import Character
 
 @pytest.fixture
@@ -72,4 +73,113 @@ def test_is_turn_complete(combat_round, mock_character):
     combat_round.use_action(mock_character, ActionType.STANDARD)
     combat_round.use_action(mock_character, ActionType.MOVEMENT)
     
-    assert combat_round.is_turn_complete(mock_character)
\ No newline at end of file
+    assert combat_round.is_turn_complete(mock_character)
+
+def test_action_usage_accepts_character_id(combat_round, mock_character):
+    combat_round.use_action(mock_character.id, ActionType.BONUS)
+    assert not combat_round.can_take_action(mock_character, ActionType.BONUS)
+    assert mock_character.id in combat_round.action_usage
+
+def test_action_usage_is_bitmask(combat_round, mock_character):
+    combat_round.use_action(mock_character, ActionType.STANDARD)
+    combat_round.use_action(mock_character, ActionType.REACTION)
+    assert combat_round.action_usage[mock_character.id] == \
+        ActionUsage.STANDARD | ActionUsage.REACTION
+    # Ações livres nunca se esgotam
+    assert combat_round.use_action(mock_character, ActionType.FREE)
+    assert combat_round.use_action(mock_character, ActionType.FREE)
+
+def test_conditions_restrict_actions(combat_round, mock_character):
+    combat_state = combat_round.combat_state
+    combat_state.condition_manager.add_condition(
+        mock_character, Condition(ConditionType.PARALYZED, duration=1))
+    assert ActionType.MOVEMENT not in combat_round.get_available_actions(mock_character)
+    assert not combat_round.use_action(mock_character, ActionType.MOVEMENT)
+
+    combat_state.condition_manager.remove_condition(mock_character, ConditionType.PARALYZED)
+    assert combat_round.use_action(mock_character, ActionType.MOVEMENT)
+
+@pytest.mark.parametrize("condition_type, available", [
+    (ConditionType.STUNNED, [ActionType.FREE]),
+    (ConditionType.PARALYZED, [ActionType.BONUS, ActionType.FREE]),
+    (ConditionType.SILENCED, list(ActionType)),
+])
+def test_condition_restrictions_block_action_types(combat_round, mock_character,
+                                                   condition_type, available):
+    combat_round.combat_state.condition_manager.add_condition(
+        mock_character, Condition(condition_type, duration=1))
+    assert combat_round.get_available_actions(mock_character) == available
+    blocked = [action for action in ActionType if action not in available]
+    assert not any(combat_round.use_action(mock_character, action) for action in blocked)
+
+@pytest.fixture
+def melee(combat_round):
+    fighters = [Character(name=f"Lutador {i}", stats={"hp": 20}) for i in range(6)]
+    combat_round.combat_state.start_combat(fighters)
+    combat_round.start_round()
+    return fighters
+
+def test_reactor_index_follows_registrations(combat_round, melee):
+    trigger = "attack_of_opportunity"
+    for fighter in melee[:3]:
+        combat_round.register_reaction_opportunity(fighter, trigger)
+    assert combat_round.reactors[trigger] == {f.id for f in melee[:3]}
+
+    combat_round.use_action(melee[0], ActionType.REACTION)
+    assert combat_round.reactors[trigger] == {melee[1].id, melee[2].id}
+    # Quem já usou a reação não volta ao índice
+    combat_round.register_reaction_opportunity(melee[0], "spell_cast")
+    assert "spell_cast" not in combat_round.reactors
+
+    snapshot = combat_round.snapshot_actions()
+    combat_round.reset_actions()
+    assert combat_round.reactors == {}
+    combat_round.restore_actions(snapshot)
+    assert combat_round.reactors == {trigger: {melee[1].id, melee[2].id}}
+
+def test_dispatch_trigger_in_initiative_order(combat_round, melee):
+    trigger = "attack_of_opportunity"
+    mover = melee[0]
+    for fighter in melee[1:]:
+        combat_round.register_reaction_opportunity(fighter, trigger)
+    order = combat_round.combat_state.initiative.get_initiative_order()
+    expected = [f for f in order if f is not mover]
+    assert combat_round.get_reactors(trigger) == expected
+
+    reacted = combat_round.dispatch_trigger(trigger, CombatAction(actor=mover, target=mover))
+    assert reacted == expected
+    history = combat_round.combat_state.action_history
+    assert [a.actor for a in history[-len(expected):]] == expected
+    assert combat_round.get_reactors(trigger) == []
+    assert combat_round.dispatch_trigger(trigger, CombatAction(actor=mover)) == []
+
+def test_dispatch_trigger_factory_can_decline(combat_round, melee):
+    trigger = "spell_cast"
+    for fighter in melee[:2]:
+        combat_round.register_reaction_opportunity(fighter, trigger)
+
+    def counterspell(reactor):
+        if reactor is melee[0]:
+            return None
+        return CombatAction(actor=reactor, action_type="counterspell")
+
+    assert combat_round.dispatch_trigger(trigger, counterspell) == [melee[1]]
+    assert combat_round.can_react_to(melee[0], trigger)
+    assert combat_round.reactors[trigger] == {melee[0].id}
+
+def test_round_start_resets_usage_lazily(combat_round, melee):
+    for fighter in melee:
+        combat_round.use_action(fighter, ActionType.STANDARD)
+    assert combat_round.is_turn_complete(melee[0]) is False
+    stored = dict(combat_round._usage)
+
+    combat_round.start_round()
+    # Os registros antigos continuam lá, mas valem como vazios
+    assert combat_round._usage == stored
+    assert combat_round.action_usage == {}
+    assert combat_round.can_take_action(melee[0], ActionType.STANDARD)
+
+    combat_round.use_action(melee[0], ActionType.BONUS)
+    assert combat_round.action_usage == {melee[0].id: ActionUsage.BONUS}
+    assert not combat_round.can_take_action(melee[0], ActionType.BONUS)
+    assert combat_round.can_take_action(melee[1], ActionType.STANDARD)
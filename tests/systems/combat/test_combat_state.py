@@ -57,4 +57,17 @@ def test_add_remove_participant(combat_state, mock_characters):
     
     # Remove participante
     combat_state.remove_participant(new_character)
-    assert new_character not in combat_state.participants
\ No newline at end of file
+    assert new_character not in combat_state.participants
+
+def test_removing_participants_mid_round_keeps_round(combat_state):
+    party = [Character(name=f"Character {index}", stats={"hp": 100}) for index in range(5)]
+    combat_state.start_combat(party)
+    order = combat_state.initiative.get_initiative_order()
+    assert combat_state.next_turn() is order[1]
+    # Três remoções compactam a ordem no próximo turno, movendo o cursor para trás
+    for character in (order[0], order[2], order[3]):
+        combat_state.remove_participant(character)
+    assert combat_state.next_turn() is order[4]
+    assert combat_state.round_number == 1
+    assert combat_state.next_turn() is order[1]
+    assert combat_state.round_number == 2
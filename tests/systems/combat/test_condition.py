@@ -1,9 +1,12 @@
 import pytest
+from dataclasses import FrozenInstanceError
 from src.systems.combat.condition import (
     Condition,
     ConditionType,
     ConditionManager,
-    ConditionEffect
+    ConditionEffect,
+    ConditionFlag,
+    CONDITION_EFFECTS
 )
 from src.systems.character.character import Character
 
@@ -48,4 +51,45 @@ def test_update_conditions(condition_manager, mock_character):
     # Segunda atualização
     condition_manager.update_conditions(mock_character)
     conditions = condition_manager.get_conditions(mock_character)
-    assert len(conditions) == 0
\ No newline at end of file
+    assert len(conditions) == 0
+
+def test_conditions_keyed_by_character_id(condition_manager, mock_character):
+    condition_manager.add_condition(mock_character, Condition(ConditionType.BLINDED))
+    assert list(condition_manager.conditions) == [mock_character.id]
+    assert condition_manager.get_conditions(mock_character.id) == \
+        condition_manager.get_conditions(mock_character)
+
+def test_condition_flags(condition_manager, mock_character):
+    assert condition_manager.get_flags(mock_character) == 0
+    condition_manager.add_condition(mock_character, Condition(ConditionType.BLINDED))
+    condition_manager.add_condition(mock_character, Condition(ConditionType.PARALYZED))
+    assert condition_manager.has_flag(mock_character, ConditionFlag.CANT_ATTACK)
+    assert condition_manager.has_flag(mock_character, ConditionFlag.DISADVANTAGE_ON_ATTACKS)
+    assert not condition_manager.has_flag(mock_character, ConditionFlag.CANT_CAST)
+
+    condition_manager.remove_condition(mock_character, ConditionType.PARALYZED)
+    assert not condition_manager.has_flag(mock_character, ConditionFlag.CANT_ATTACK)
+    assert condition_manager.get_flags(mock_character) == \
+        ConditionFlag.DISADVANTAGE_ON_ATTACKS | ConditionFlag.ADVANTAGE_AGAINST
+
+def test_condition_effect_flags():
+    effect = ConditionEffect(cant_move=True, advantage_against=True)
+    assert effect.flags == ConditionFlag.CANT_MOVE | ConditionFlag.ADVANTAGE_AGAINST
+
+def test_condition_effects_are_shared():
+    first = Condition(ConditionType.POISONED)
+    second = Condition(ConditionType.POISONED)
+    assert first.effects is second.effects
+    assert first.effects is CONDITION_EFFECTS[ConditionType.POISONED]
+    with pytest.raises(FrozenInstanceError):
+        first.effects.cant_move = True
+    with pytest.raises(TypeError):
+        first.effects.stat_modifiers['strength'] = 0
+
+def test_every_condition_type_has_effects():
+    assert set(CONDITION_EFFECTS) == set(ConditionType)
+    assert CONDITION_EFFECTS[ConditionType.SILENCED].flags == ConditionFlag.CANT_CAST
+    assert CONDITION_EFFECTS[ConditionType.RESTRAINED].cant_move
+    invisible = CONDITION_EFFECTS[ConditionType.INVISIBLE]
+    assert invisible.flags == (ConditionFlag.ADVANTAGE_ON_ATTACKS
+                               | ConditionFlag.DISADVANTAGE_AGAINST)
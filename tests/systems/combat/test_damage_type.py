@@ -1,8 +1,11 @@
+import pickle
 import pytest
 from src.systems.combat.damage_type import (
     DamageType,
     ResistanceType,
-    DamageTypeManager
+    DamageTypeManager,
+    ResistanceProfile,
+    NO_RESISTANCES
 )
 from src.systems.character.character import Character
 
@@ -42,4 +45,81 @@ def test_remove_special_resistance(damage_manager, mock_character):
     damage_manager.add_immunity(mock_character, DamageType.ACID)
     damage_manager.remove_special_resistance(mock_character, DamageType.ACID)
     resistance = damage_manager.get_resistance(mock_character, DamageType.ACID)
-    assert resistance == ResistanceType.NORMAL
\ No newline at end of file
+    assert resistance == ResistanceType.NORMAL
+
+def test_calculate_damage_batch_matches_scalar(damage_manager):
+    targets = [Character(name=f"Target {i}", stats={"hp": 100}) for i in range(6)]
+    resistances = list(ResistanceType)
+    for index, target in enumerate(targets[1:]):
+        for damage_type in DamageType:
+            resistance = resistances[(index + damage_type.value) % len(resistances)]
+            damage_manager.set_resistance(target, damage_type, resistance)
+
+    hits = [(base, damage_type, target)
+            for base in (0, 1, 7, 10)
+            for damage_type in DamageType
+            for target in targets]
+    bases, damage_types, hit_targets = zip(*hits)
+    batch = damage_manager.calculate_damage_batch(bases, damage_types, hit_targets)
+    expected = [damage_manager.calculate_damage(*hit) for hit in hits]
+    assert batch.tolist() == expected
+
+def test_calculate_damage_batch_single_type(damage_manager):
+    targets = [Character(name=f"Target {i}", stats={"hp": 100}) for i in range(3)]
+    damage_manager.add_resistance(targets[0], DamageType.FIRE)
+    damage_manager.add_immunity(targets[2], DamageType.FIRE)
+    damage = damage_manager.calculate_damage_batch([10, 10, 10], DamageType.FIRE, targets)
+    assert damage.tolist() == [5, 10, 0]
+
+def test_resistance_matrix(damage_manager):
+    targets = [Character(name=f"Target {i}", stats={"hp": 100}) for i in range(20)]
+    for target in targets:
+        damage_manager.add_vulnerability(target, DamageType.COLD)
+    matrix = damage_manager.get_resistance_matrix(targets)
+    assert matrix.shape == (20, len(DamageType))
+    cold = list(DamageType).index(DamageType.COLD)
+    assert (matrix[:, cold] == ResistanceType.VULNERABLE.value).all()
+
+def test_resistances_accept_character_id(damage_manager, mock_character):
+    damage_manager.add_resistance(mock_character.id, DamageType.FIRE)
+    assert (damage_manager.get_resistance(mock_character, DamageType.FIRE)
+            == ResistanceType.RESISTANT)
+    assert damage_manager.calculate_damage(10, DamageType.FIRE, mock_character.id) == 5
+
+def test_profiles_are_interned_and_immutable():
+    goblin = ResistanceProfile({DamageType.POISON: ResistanceType.RESISTANT,
+                                DamageType.FIRE: ResistanceType.NORMAL})
+    assert goblin is ResistanceProfile({DamageType.POISON: ResistanceType.RESISTANT})
+    assert goblin == {DamageType.POISON: ResistanceType.RESISTANT}
+    assert ResistanceProfile() is NO_RESISTANCES
+    assert pickle.loads(pickle.dumps(goblin)) is goblin
+    poison = list(DamageType).index(DamageType.POISON)
+    assert goblin.multipliers[poison] == 0.5 and goblin.multipliers.sum() == len(DamageType) - 0.5
+    with pytest.raises(ValueError):
+        goblin.codes[poison] = ResistanceType.IMMUNE.value
+
+def test_group_shares_profile_with_copy_on_write_overrides(damage_manager):
+    goblins = [Character(name=f"Goblin {i}", stats={"hp": 7}) for i in range(200)]
+    profile = {DamageType.POISON: ResistanceType.RESISTANT}
+    for goblin in goblins:
+        damage_manager.set_profile(goblin, profile)
+    shared = damage_manager.get_all_resistances(goblins[0])
+    assert all(damage_manager.get_all_resistances(g) is shared for g in goblins)
+
+    # Alterar um goblin troca só o perfil dele
+    damage_manager.add_vulnerability(goblins[0], DamageType.FIRE)
+    assert damage_manager.get_all_resistances(goblins[1]) is shared
+    assert dict(damage_manager.get_all_resistances(goblins[0])) == {
+        DamageType.POISON: ResistanceType.RESISTANT, DamageType.FIRE: ResistanceType.VULNERABLE}
+    assert damage_manager.calculate_damage_batch([10, 10], DamageType.FIRE,
+                                                 goblins[:2]).tolist() == [20, 10]
+    damage_manager.remove_special_resistance(goblins[0], DamageType.FIRE)
+    assert damage_manager.get_all_resistances(goblins[0]) is shared
+
+def test_snapshot_keeps_profiles(damage_manager, mock_character):
+    damage_manager.add_resistance(mock_character, DamageType.FIRE)
+    snapshot = damage_manager.snapshot()
+    damage_manager.add_immunity(mock_character, DamageType.FIRE)
+    assert damage_manager.calculate_damage(10, DamageType.FIRE, mock_character) == 0
+    damage_manager.restore(snapshot)
+    assert damage_manager.calculate_damage(10, DamageType.FIRE, mock_character) == 5
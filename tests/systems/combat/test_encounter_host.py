@@ -0,0 +1,111 @@
+import asyncio
+import pytest
+from src.systems.combat.encounter_host import EncounterHost
+from src.systems.combat.planner import PASS
+from src.systems.combat.simulation import CombatantTemplate, EncounterTemplate
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def skirmish():
+    """Herói contra dois goblins; todos acertam sempre."""
+    return EncounterTemplate(combatants=[
+        CombatantTemplate(name="Herói", team="herois", stats={"hp": 30},
+                          attack_bonus=20, damage_dice=(1, 1), damage_bonus=6),
+        CombatantTemplate(name="Goblin", team="goblins", count=2, stats={"hp": 7},
+                          attack_bonus=20, damage_dice=(1, 1)),
+    ]).build()
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+@pytest.fixture
+def host(clock):
+    return EncounterHost(turn_timeout=5.0, clock=clock)
+
+def test_npc_only_encounters_finish_in_batched_ticks(host):
+    encounters = [host.add_encounter(skirmish(), seed=seed) for seed in range(20)]
+    turns = host.tick()
+    assert turns > 20
+    assert all(e.finished and e.winner == "herois" for e in encounters)
+    assert host.tick() == 0
+    assert len(host.encounters) == 0
+    assert list(host.results) == [e.id for e in encounters]
+
+def test_finished_results_are_bounded(clock):
+    host = EncounterHost(clock=clock, max_results=3)
+    encounters = [host.add_encounter(skirmish(), seed=seed) for seed in range(5)]
+    host.tick()
+    assert len(host.encounters) == 0
+    assert list(host.results) == [e.id for e in encounters[-3:]]
+    assert host.remove_encounter(encounters[-1].id) is encounters[-1]
+    assert len(host.results) == 2
+
+def test_player_turns_are_awaited(host):
+    combatants = skirmish()
+    hero = combatants[0][0]
+    encounter = host.add_encounter(combatants, players=[hero], seed=1)
+
+    async def play():
+        prompts = []
+        while True:
+            host.tick()
+            prompt = await host.next_turn(encounter.id)
+            if prompt is None:
+                return prompts
+            assert prompt.actor is hero
+            prompts.append(prompt)
+            # Uma resposta com ação indisponível é recusada
+            assert not host.submit_action(encounter.id, PASS._replace(target_id=hero.id))
+            assert host.submit_action(encounter.id, prompt.actions[0], prompt.turn_number)
+            assert not host.submit_action(encounter.id, prompt.actions[0], prompt.turn_number)
+
+    prompts = asyncio.run(play())
+    assert len(prompts) == 2
+    assert encounter.finished and encounter.winner == "herois"
+
+def test_afk_turns_are_resolved_on_timeout(host, clock):
+    combatants = skirmish()
+    hero = combatants[0][0]
+    encounter = host.add_encounter(combatants, players=[hero], seed=1)
+    host.tick()
+    prompt = encounter.prompt
+    assert prompt is not None and prompt.deadline == 5.0
+
+    clock.now = 4.9
+    assert host.tick() == 0
+    clock.now = 5.0
+    assert host.tick() >= 1
+    assert encounter.prompt is None or encounter.prompt.turn_number > prompt.turn_number
+    # Resposta atrasada para o turno já resolvido
+    assert not host.submit_action(encounter.id, prompt.actions[0], prompt.turn_number)
+
+def test_run_loop_and_removal():
+    host = EncounterHost(turn_timeout=0.01, tick_interval=0.001)
+    combatants = skirmish()
+    encounter = host.add_encounter(combatants, players=[combatants[0][0]], seed=2)
+    other = host.add_encounter(skirmish(), seed=3)
+
+    async def main():
+        stop = asyncio.Event()
+        runner = asyncio.create_task(host.run(stop))
+        # Ninguém responde: os turnos do jogador expiram e a luta termina mesmo assim
+        seen = []
+        prompt = await host.next_turn(encounter.id)
+        while prompt is not None:
+            seen.append(prompt.turn_number)
+            prompt = await host.next_turn(encounter.id, after=prompt.turn_number)
+        stop.set()
+        await runner
+        return seen
+
+    seen = asyncio.run(main())
+    assert seen == sorted(set(seen)) and seen
+    assert encounter.finished and other.finished
+    assert host.remove_encounter(encounter.id) is encounter
+    assert encounter.id not in host.encounters
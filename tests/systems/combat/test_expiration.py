@@ -0,0 +1,156 @@
+import pytest
+from src.systems.combat.expiration import ExpirationScheduler
+from src.systems.combat.condition import Condition, ConditionType, ConditionManager
+from src.systems.combat.ability_effect import (
+    AbilityEffect,
+    AbilityEffectManager,
+    EffectType,
+    EffectTarget,
+    EffectDuration
+)
+from src.systems.combat.combat_state import CombatState
+from src.systems.character.character import Character
+
+@pytest.fixture
+def scheduler():
+    return ExpirationScheduler()
+
+@pytest.fixture
+def mock_character():
+    return Character(name="Test Character", stats={"hp": 100, "strength": 10})
+
+def make_buff(turns, until_dispelled=False):
+    effect = AbilityEffect(
+        EffectType.BUFF,
+        EffectTarget(),
+        EffectDuration(instant=False, turns=turns, until_dispelled=until_dispelled)
+    )
+    effect.add_stat_modifier("strength", 2)
+    return effect
+
+def test_schedule_and_advance(scheduler):
+    expired = []
+    scheduler.schedule(1, 2, lambda: expired.append("a"))
+    scheduler.schedule(1, 1, lambda: expired.append("b"))
+    scheduler.schedule(2, 1, lambda: expired.append("c"))
+
+    assert scheduler.advance(1) == 1
+    assert expired == ["b"]
+    assert scheduler.advance(1) == 1
+    assert expired == ["b", "a"]
+    assert scheduler.get_turn(1) == 2
+    assert scheduler.get_turn(2) == 0
+
+def test_cancel_and_reschedule(scheduler):
+    expired = []
+    entry = scheduler.schedule(1, 1, lambda: expired.append("a"))
+    entry.cancel()
+    assert scheduler.advance(1) == 0
+
+    entry = scheduler.schedule(1, 1, lambda: expired.append("b"))
+    entry = scheduler.reschedule(entry, 3)
+    assert entry.remaining() == 3
+    scheduler.advance(1)
+    scheduler.advance(1)
+    assert expired == []
+    scheduler.advance(1)
+    assert expired == ["b"]
+    assert scheduler.pending(1) == 0
+
+def test_condition_duration_setter(mock_character):
+    manager = ConditionManager()
+    condition = Condition(ConditionType.POISONED, duration=1)
+    manager.add_condition(mock_character, condition)
+    condition.duration = 3
+    manager.update_conditions(mock_character)
+    assert condition.duration == 2
+    assert manager.get_conditions(mock_character) == [condition]
+
+def test_removed_condition_does_not_expire(mock_character):
+    manager = ConditionManager()
+    manager.add_condition(mock_character, Condition(ConditionType.POISONED, duration=2))
+    manager.remove_condition(mock_character, ConditionType.POISONED)
+    assert mock_character.stats["strength"] == 10
+    manager.update_conditions(mock_character)
+    manager.update_conditions(mock_character)
+    assert mock_character.stats["strength"] == 10
+
+def test_effect_expires(mock_character):
+    manager = AbilityEffectManager()
+    effect = make_buff(turns=2)
+    manager.apply_effect(effect, mock_character)
+    assert mock_character.stats["strength"] == 12
+    assert manager.get_remaining_turns(effect, mock_character) == 2
+
+    manager.update_effects(mock_character)
+    assert manager.get_active_effects(mock_character) == [effect]
+    manager.update_effects(mock_character)
+    assert manager.get_active_effects(mock_character) == []
+    assert mock_character.stats["strength"] == 10
+    # O modelo do efeito não é alterado
+    assert effect.duration.turns == 2
+
+def test_effect_until_dispelled(mock_character):
+    manager = AbilityEffectManager()
+    effect = make_buff(turns=1, until_dispelled=True)
+    manager.apply_effect(effect, mock_character)
+    for _ in range(5):
+        manager.update_effects(mock_character)
+    assert manager.get_active_effects(mock_character) == [effect]
+    assert manager.get_remaining_turns(effect, mock_character) is None
+
+def test_remove_effect_cancels_expiration(mock_character):
+    manager = AbilityEffectManager()
+    effect = make_buff(turns=1)
+    manager.apply_effect(effect, mock_character)
+    manager.remove_effect(effect, mock_character)
+    assert mock_character.stats["strength"] == 10
+    manager.update_effects(mock_character)
+    assert mock_character.stats["strength"] == 10
+
+def test_shared_effect_per_target():
+    manager = AbilityEffectManager()
+    first = Character(name="First", stats={"strength": 10})
+    second = Character(name="Second", stats={"strength": 10})
+    effect = make_buff(turns=1)
+    manager.apply_effect(effect, first)
+    manager.apply_effect(effect, second)
+    manager.update_effects(first)
+    assert manager.get_active_effects(first) == []
+    assert manager.get_active_effects(second) == [effect]
+
+def test_combat_state_shares_scheduler():
+    state = CombatState()
+    character = Character(name="Solo", stats={"hp": 100, "strength": 10})
+    state.start_combat([character])
+    state.condition_manager.add_condition(character, Condition(ConditionType.STUNNED, duration=1))
+    state.effect_manager.apply_effect(make_buff(turns=2), character)
+
+    state.next_turn()
+    assert state.condition_manager.get_conditions(character) == []
+    assert len(state.effect_manager.get_active_effects(character)) == 1
+    state.next_turn()
+    assert state.effect_manager.get_active_effects(character) == []
+    assert character.stats["strength"] == 10
+
+def test_shared_scheduler_advances_once_per_turn():
+    state = CombatState()
+    character = Character(name="Solo", stats={"hp": 100, "strength": 10})
+    state.start_combat([character])
+    state.condition_manager.add_condition(character, Condition(ConditionType.POISONED, duration=2))
+    effect = make_buff(turns=2)
+    state.effect_manager.apply_effect(effect, character)
+
+    # Os dois gerenciadores atualizados no mesmo turno não avançam o relógio de novo
+    state.next_turn()
+    state.condition_manager.update_conditions(character)
+    state.effect_manager.update_effects(character)
+    assert state.scheduler.get_turn(character.id) == 1
+    assert state.condition_manager.get_conditions(character)[0].duration == 1
+    assert state.effect_manager.get_remaining_turns(effect, character) == 1
+
+    state.next_turn()
+    state.condition_manager.update_conditions(character)
+    state.effect_manager.update_effects(character)
+    assert state.condition_manager.get_conditions(character) == []
+    assert state.effect_manager.get_active_effects(character) == []
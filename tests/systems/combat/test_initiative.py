@@ -10,12 +10,21 @@ def mock_character():
 def initiative():
     return Initiative()
 
+@pytest.fixture
+def party():
+    return [Character(name=f"Character {i}", stats={"hp": 100}) for i in range(5)]
+
 def test_roll_initiative(initiative, mock_character):
     participants = [mock_character]
     initiative.roll_initiative(participants)
-    assert len(initiative.order) == 1
-    assert mock_character in initiative.order
-    assert 1 <= initiative.order[mock_character] <= 20
+    assert len(initiative) == 1
+    assert mock_character in initiative
+    assert 1 <= initiative.get_initiative(mock_character) <= 20
+
+def test_roll_initiative_sorted(initiative, party):
+    initiative.roll_initiative(party)
+    rolls = [initiative.get_initiative(c) for c in initiative.get_initiative_order()]
+    assert rolls == sorted(rolls, reverse=True)
 
 def test_get_current_character(initiative, mock_character):
     participants = [mock_character]
@@ -30,12 +39,53 @@ def test_next_turn(initiative, mock_character):
     assert next_char == mock_character
     assert initiative.current_index == 0
 
+def test_next_turn_cycles(initiative, party):
+    initiative.roll_initiative(party)
+    order = initiative.get_initiative_order()
+    turns = [initiative.next_turn() for _ in range(len(order))]
+    assert turns == order[1:] + order[:1]
+
 def test_add_participant(initiative, mock_character):
     initiative.add_participant(mock_character)
-    assert mock_character in initiative.order
-    assert 1 <= initiative.order[mock_character] <= 20
+    assert mock_character in initiative
+    assert 1 <= initiative.get_initiative(mock_character) <= 20
+
+def test_add_participant_keeps_current(initiative, party):
+    initiative.roll_initiative(party[:4])
+    initiative.next_turn()
+    current = initiative.get_current_character()
+    initiative.add_participant(party[4])
+    assert initiative.get_current_character() is current
+    order = initiative.get_initiative_order()
+    rolls = [initiative.get_initiative(c) for c in order]
+    assert rolls == sorted(rolls, reverse=True)
 
 def test_remove_participant(initiative, mock_character):
     initiative.add_participant(mock_character)
     initiative.remove_participant(mock_character)
-    assert mock_character not in initiative.order
\ No newline at end of file
+    assert mock_character not in initiative
+
+def test_remove_participant_keeps_cursor(initiative, party):
+    initiative.roll_initiative(party)
+    order = initiative.get_initiative_order()
+    initiative.next_turn()
+    initiative.next_turn()
+    assert initiative.get_current_character() is order[2]
+
+    # Remover alguém antes do cursor não altera o turno atual
+    initiative.remove_participant(order[0])
+    assert initiative.get_current_character() is order[2]
+
+    # Remover o personagem atual passa a vez ao seguinte
+    initiative.remove_participant(order[2])
+    assert initiative.get_current_character() is None
+    assert initiative.next_turn() is order[3]
+    assert initiative.get_initiative_order() == [order[1], order[3], order[4]]
+
+def test_compaction_preserves_order(initiative, party):
+    initiative.roll_initiative(party)
+    order = initiative.get_initiative_order()
+    for character in order[:3]:
+        initiative.remove_participant(character)
+    turns = [initiative.next_turn() for _ in range(4)]
+    assert turns == [order[3], order[4], order[3], order[4]]
@@ -0,0 +1,90 @@
+import urllib.request
+import pytest
+from src.systems.character.character import Character
+from src.systems.combat.combat_round import CombatRound
+from src.systems.combat.combat_state import CombatAction, CombatState
+from src.systems.combat.condition import Condition, ConditionType
+from src.systems.combat.metrics import CombatMetrics, HOT_PATHS, LatencyHistogram
+
+@pytest.fixture
+def metrics():
+    metrics = CombatMetrics()
+    yield metrics
+    metrics.disable()
+
+@pytest.fixture
+def combat_round():
+    state = CombatState()
+    state.start_combat([Character(name=f"Lutador {i}", stats={"hp": 20}) for i in range(3)])
+    combat_round = CombatRound(state)
+    combat_round.start_round()
+    return combat_round
+
+def test_disabled_metrics_leave_methods_untouched(metrics):
+    originals = {phase: owner.__dict__[name] for phase, (owner, name) in HOT_PATHS.items()}
+    metrics.enable()
+    assert all(owner.__dict__[name] is not originals[phase]
+               for phase, (owner, name) in HOT_PATHS.items())
+    metrics.disable()
+    assert all(owner.__dict__[name] is originals[phase]
+               for phase, (owner, name) in HOT_PATHS.items())
+
+def test_counts_and_histograms(metrics, combat_round):
+    state = combat_round.combat_state
+    metrics.enable()
+    metrics.enable()
+    for _ in range(5):
+        state.next_turn()
+    fighter = state.participants[0]
+    combat_round.register_reaction_opportunity(fighter, "attack_of_opportunity")
+    combat_round.process_reaction(fighter, "attack_of_opportunity", CombatAction(actor=fighter))
+
+    snapshot = metrics.snapshot()
+    assert snapshot["next_turn"]["count"] == 5
+    assert snapshot["process_reaction"]["count"] == 1
+    assert snapshot["expirations"]["count"] == 5
+    assert snapshot["apply_effects"]["count"] == 0
+    assert snapshot["next_turn"]["buckets"][float('inf')] == 5
+    assert 0 < snapshot["next_turn"]["p50"] <= snapshot["next_turn"]["p99"]
+
+    metrics.reset()
+    state.next_turn()
+    assert metrics.snapshot()["next_turn"]["count"] == 1
+
+def test_one_turn_samples_the_expiration_path(metrics, combat_round):
+    state = combat_round.combat_state
+    # Quem joga o próximo turno
+    fighter = state.initiative.get_initiative_order()[1]
+    state.condition_manager.add_condition(fighter, Condition(ConditionType.STUNNED, duration=1))
+    metrics.enable()
+    state.next_turn()
+
+    snapshot = metrics.snapshot()
+    assert snapshot["next_turn"]["count"] == 1
+    assert snapshot["expirations"]["count"] > 0
+    assert state.condition_manager.get_conditions(fighter) == []
+
+def test_prometheus_export(metrics, combat_round):
+    metrics.enable()
+    combat_round.combat_state.next_turn()
+    text = metrics.to_prometheus()
+    assert "# TYPE dungeon_keeper_combat_phase_seconds histogram" in text
+    assert 'dungeon_keeper_combat_phase_seconds_bucket{phase="next_turn",le="+Inf"} 1' in text
+    assert 'dungeon_keeper_combat_phase_seconds_count{phase="next_turn"} 1' in text
+
+    server = metrics.serve(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            assert response.read().decode() == metrics.to_prometheus()
+    finally:
+        server.shutdown()
+        server.server_close()
+
+def test_histogram_quantiles():
+    histogram = LatencyHistogram((0.001, 0.01, 0.1))
+    for seconds in (0.0005, 0.0005, 0.005, 0.5):
+        histogram.observe(seconds)
+    assert histogram.cumulative() == [2, 3, 3, 4]
+    assert histogram.quantile(0.5) == 0.001
+    assert histogram.quantile(1.0) == float('inf')
@@ -0,0 +1,156 @@
+import os
+import pickle
+import random
+import subprocess
+import sys
+import time
+import pytest
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from src.systems.combat.planner import (
+    CombatPlanner,
+    PlannerConfig,
+    PlannedAction,
+    PASS,
+    available_actions
+)
+from src.systems.combat.simulation import CombatantTemplate, EncounterTemplate
+from src.systems.combat.combat_state import CombatState
+from src.systems.combat.combat_round import CombatRound, ActionType
+from src.systems.combat.condition import Condition, ConditionType
+from src.systems.combat.ability_effect import (
+    AbilityEffect, EffectDuration, EffectTarget, EffectType
+)
+
+# Raiz do repositório, para importar ``src`` no processo filho
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+@pytest.fixture
+def encounter():
+    """Na vez do herói: escolher entre o bruto e o lacaio inofensivo (com menos HP)."""
+    template = EncounterTemplate(combatants=[
+        CombatantTemplate(name="Herói", team="herois",
+                          stats={"hp": 12},
+                          attack_bonus=20, damage_dice=(1, 1), damage_bonus=4),
+        CombatantTemplate(name="Bruto", team="monstros", stats={"hp": 5},
+                          attack_bonus=20, damage_dice=(1, 1), damage_bonus=9),
+        CombatantTemplate(name="Lacaio", team="monstros", stats={"hp": 4},
+                          attack_bonus=20, damage_dice=(1, 1), damage_bonus=-5),
+    ])
+    combatants = template.build()
+    state = CombatState(rng=random.Random(3))
+    state.start_combat([character for character, _ in combatants])
+    while state.get_current_character() is not combatants[0][0]:
+        state.next_turn()
+    combat_round = CombatRound(state)
+    combat_round.start_round()
+    profiles = {character.id: profile for character, profile in combatants}
+    return combat_round, profiles, [character for character, _ in combatants]
+
+def test_available_actions(encounter):
+    combat_round, profiles, (hero, brute, minion) = encounter
+    assert available_actions(combat_round, profiles, hero) == [
+        PlannedAction(ActionType.STANDARD, brute.id),
+        PlannedAction(ActionType.STANDARD, minion.id)
+    ]
+    combat_round.combat_state.condition_manager.add_condition(
+        hero, Condition(ConditionType.STUNNED, duration=1))
+    assert available_actions(combat_round, profiles, hero) == [PASS]
+
+def test_planner_prefers_dangerous_target(encounter):
+    combat_round, profiles, (hero, brute, minion) = encounter
+    assert combat_round.combat_state.get_current_character() is hero
+    planner = CombatPlanner(profiles, PlannerConfig(time_budget=None, max_iterations=300),
+                            rng=random.Random(0))
+    result = planner.search(combat_round)
+    assert result.action == PlannedAction(ActionType.STANDARD, brute.id)
+    assert result.iterations == 300
+    assert result.values[result.action] > result.values[
+        PlannedAction(ActionType.STANDARD, minion.id)]
+
+def test_search_leaves_combat_untouched(encounter):
+    combat_round, profiles, participants = encounter
+    state = combat_round.combat_state
+    before = state.state_hash(combat_round)
+    planner = CombatPlanner(profiles, PlannerConfig(time_budget=None, max_iterations=50))
+    planner.search(combat_round)
+    assert state.state_hash(combat_round) == before
+    assert [p.stats["hp"] for p in participants] == [12, 5, 4]
+    assert state.action_history == []
+
+def test_time_budget(encounter):
+    combat_round, profiles, _ = encounter
+    planner = CombatPlanner(profiles, PlannerConfig(time_budget=0.01))
+    start = time.perf_counter()
+    result = planner.search(combat_round)
+    assert time.perf_counter() - start < 0.5
+    assert result.iterations >= 1
+
+def test_transposition_table_is_reused(encounter):
+    combat_round, profiles, _ = encounter
+    planner = CombatPlanner(profiles, PlannerConfig(time_budget=None, max_iterations=40))
+    first = planner.search(combat_round)
+    assert planner.table
+    second = planner.search(combat_round)
+    assert sum(second.visits.values()) > sum(first.visits.values())
+
+def test_play_turn(encounter):
+    combat_round, profiles, (hero, brute, _) = encounter
+    planner = CombatPlanner(profiles, PlannerConfig(time_budget=None, max_iterations=300),
+                            rng=random.Random(0))
+    action = planner.play_turn(combat_round, random.Random(1))
+    assert action.target_id == brute.id
+    assert combat_round.combat_state.action_history[-1].actor is hero
+
+def test_parallel_search(encounter):
+    combat_round, profiles, (_, brute, _) = encounter
+    config = PlannerConfig(time_budget=None, max_iterations=150, workers=2)
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        planner = CombatPlanner(profiles, config, rng=random.Random(0), executor=executor)
+        result = planner.search(combat_round)
+    assert result.iterations == 300
+    assert result.action == PlannedAction(ActionType.STANDARD, brute.id)
+
+def test_parallel_tables_are_merged(encounter):
+    combat_round, profiles, _ = encounter
+    config = PlannerConfig(time_budget=None, max_iterations=150, workers=2)
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        planner = CombatPlanner(profiles, config, rng=random.Random(0), executor=executor)
+        planner.search(combat_round)
+    assert planner.table
+
+    # Uma busca serial depois continua das estatísticas dos dois workers
+    config.workers = 1
+    result = planner.search(combat_round)
+    assert sum(result.visits.values()) == 450
+
+def test_state_hash_is_stable_across_processes(encounter):
+    combat_round, _, (hero, brute, _) = encounter
+    state = combat_round.combat_state
+    state.condition_manager.add_condition(brute, Condition(ConditionType.POISONED, duration=2))
+    effect = AbilityEffect(EffectType.BUFF, EffectTarget(), EffectDuration(instant=False, turns=3))
+    effect.stat_modifiers["strength"] = 2
+    state.effect_manager.apply_effect(effect, hero)
+    # Outro processo, com outra semente de hash de strings, reconstrói o mesmo estado
+    script = "\n".join([
+        "import pickle, sys",
+        "from src.systems.combat.combat_state import CombatState",
+        "from src.systems.combat.combat_round import CombatRound",
+        "snapshot = pickle.load(sys.stdin.buffer)",
+        "state = CombatState()",
+        "state.restore(snapshot, {p.id: p.clone() for p in snapshot.participants})",
+        "combat_round = CombatRound(state)",
+        "combat_round.restore_actions(snapshot.combat_round)",
+        "print(state.state_hash(combat_round))",
+    ])
+    snapshot = pickle.dumps(combat_round.snapshot())
+    hashes = {
+        subprocess.run([sys.executable, "-c", script], input=snapshot,
+                       capture_output=True, check=True, cwd=ROOT,
+                       env={**os.environ, "PYTHONHASHSEED": seed}).stdout.strip()
+        for seed in ("1", "2")
+    }
+    assert hashes == {str(state.state_hash(combat_round)).encode()}
+
+def test_requires_a_budget():
+    with pytest.raises(ValueError):
+        CombatPlanner({}, PlannerConfig(time_budget=None, max_iterations=None))
@@ -0,0 +1,92 @@
+import pytest
+from src.systems.combat.simulation import (
+    CombatantTemplate,
+    EncounterTemplate,
+    simulate_encounter,
+    run_simulations
+)
+from src.systems.combat.condition import ConditionType
+from src.systems.combat.damage_type import DamageType, ResistanceType
+
+@pytest.fixture
+def encounter():
+    return EncounterTemplate(combatants=[
+        CombatantTemplate(
+            name="Guerreiro",
+            team="herois",
+            stats={"hp": 30, "max_hp": 30, "armor_class": 15},
+            attack_bonus=5,
+            damage_dice=(1, 8),
+            damage_bonus=3
+        ),
+        CombatantTemplate(
+            name="Goblin",
+            team="goblins",
+            count=3,
+            stats={"hp": 7, "max_hp": 7, "armor_class": 13},
+            attack_bonus=4,
+            damage_dice=(1, 6),
+            damage_bonus=2,
+            damage_type=DamageType.PIERCING,
+            on_hit_condition=ConditionType.POISONED
+        )
+    ], max_rounds=50)
+
+def test_build_encounter(encounter):
+    combatants = encounter.build()
+    assert len(combatants) == 4
+    assert [c.name for c, _ in combatants] == ["Guerreiro", "Goblin 1", "Goblin 2", "Goblin 3"]
+    assert encounter.get_teams() == ["herois", "goblins"]
+
+def test_simulate_encounter_is_reproducible(encounter):
+    first = simulate_encounter(encounter, seed=42)
+    second = simulate_encounter(encounter, seed=42)
+    assert first == second
+    assert first.winner in ("herois", "goblins")
+    assert first.rounds >= 1
+
+def test_hp_curves(encounter):
+    result = simulate_encounter(encounter, seed=7)
+    for team, curve in result.hp_curves.items():
+        assert len(curve) == result.rounds + 1
+        assert curve == sorted(curve, reverse=True)
+    assert result.hp_curves["herois"][0] == 30
+    assert result.hp_curves["goblins"][0] == 21
+
+def test_immune_team_never_loses():
+    encounter = EncounterTemplate(combatants=[
+        CombatantTemplate(
+            name="Golem",
+            team="golem",
+            stats={"hp": 20, "armor_class": 5},
+            attack_bonus=10,
+            resistances={DamageType.SLASHING: ResistanceType.IMMUNE}
+        ),
+        CombatantTemplate(name="Bandido", team="bandidos", count=2, stats={"hp": 5})
+    ])
+    report = run_simulations(encounter, range(20), processes=1)
+    assert report.win_rates["golem"] == 1.0
+    assert report.draw_rate == 0.0
+
+def test_round_limit_is_a_draw():
+    encounter = EncounterTemplate(combatants=[
+        CombatantTemplate(name="A", team="a", stats={"armor_class": 30}),
+        CombatantTemplate(name="B", team="b", stats={"armor_class": 30})
+    ], max_rounds=5)
+    report = run_simulations(encounter, range(10), processes=1)
+    assert report.draw_rate > 0.0
+    assert max(report.round_counts) <= 5
+
+def test_run_simulations_aggregates(encounter):
+    report = run_simulations(encounter, range(50), processes=1)
+    assert report.fights == 50
+    assert sum(report.win_rates.values()) + report.draw_rate == pytest.approx(1.0)
+    assert sum(report.round_counts.values()) == 50
+    assert report.hp_curves["herois"][0] == 30
+
+def test_process_pool_matches_serial(encounter):
+    serial = run_simulations(encounter, range(16), processes=1)
+    parallel = run_simulations(encounter, range(16), processes=2, chunk_size=3)
+    assert parallel.results == serial.results
+    assert parallel.win_rates == serial.win_rates
+    assert parallel.hp_curves == serial.hp_curves
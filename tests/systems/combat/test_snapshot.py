@@ -0,0 +1,178 @@
+import random
+import pytest
+from src.systems.combat.combat_state import CombatState, CombatAction, CombatPhase
+from src.systems.combat.combat_round import CombatRound, ActionType
+from src.systems.combat.condition import Condition, ConditionType
+from src.systems.combat.damage_type import DamageType, ResistanceType
+from src.systems.combat.ability_effect import (
+    AbilityEffect,
+    EffectType,
+    EffectTarget,
+    EffectDuration
+)
+from src.systems.character.character import Character
+from src.systems.character.compact_character import CompactCharacter
+from src.systems.character.stats import ModifierLayer
+from src.systems.dice.rng import DiceStream
+
+@pytest.fixture
+def combat_round():
+    participants = [
+        Character(name="Character 1", stats={"hp": 100, "strength": 10}),
+        Character(name="Character 2", stats={"hp": 100, "strength": 10}),
+        CompactCharacter(name="Goblin", stats={"hp": 20})
+    ]
+    state = CombatState(rng=random.Random(1))
+    state.start_combat(participants)
+    state.damage_type_manager.add_resistance(participants[0], DamageType.FIRE)
+    combat_round = CombatRound(state)
+    combat_round.start_round()
+    return combat_round
+
+def make_buff(turns):
+    effect = AbilityEffect(EffectType.BUFF, EffectTarget(),
+                           EffectDuration(instant=False, turns=turns))
+    effect.add_stat_modifier("strength", 3)
+    return effect
+
+def describe(combat_round):
+    """Resumo comparável do estado do combate."""
+    state = combat_round.combat_state
+    return (
+        state.phase,
+        state.round_number,
+        state.turn_number,
+        [p.id for p in state.initiative.get_initiative_order()],
+        state.initiative.current_index,
+        [(p.id, dict(p.stats)) for p in state.participants],
+        [(p.id, [(c.type, c.duration) for c in state.condition_manager.get_conditions(p)])
+         for p in state.participants],
+        [(p.id, state.damage_type_manager.get_resistance(p, DamageType.FIRE))
+         for p in state.participants],
+        [(p.id, [(id(e), state.effect_manager.get_remaining_turns(e, p))
+                 for e in state.effect_manager.get_active_effects(p)])
+         for p in state.participants],
+        [(p.id, combat_round.get_available_actions(p)) for p in state.participants],
+        len(state.action_history),
+        len(state.event_log)
+    )
+
+def mutate(combat_round):
+    state = combat_round.combat_state
+    first, second, goblin = state.participants
+    state.condition_manager.add_condition(first, Condition(ConditionType.POISONED, duration=2))
+    state.effect_manager.apply_effect(make_buff(turns=3), second)
+    state.damage_type_manager.add_vulnerability(first, DamageType.FIRE)
+    goblin.take_damage(15)
+    combat_round.use_action(first, ActionType.STANDARD)
+    combat_round.register_reaction_opportunity(second, "attack_of_opportunity")
+    state.record_action(CombatAction(actor=first, target=goblin, damage_amount=15))
+    for _ in range(4):
+        state.next_turn()
+
+def test_restore_round_trip(combat_round):
+    mutate(combat_round)
+    snapshot = combat_round.snapshot()
+    before = describe(combat_round)
+
+    mutate(combat_round)
+    combat_round.combat_state.phase = CombatPhase.ENDED
+    assert describe(combat_round) != before
+
+    combat_round.restore(snapshot)
+    assert describe(combat_round) == before
+    assert combat_round.combat_state.phase == CombatPhase.COMBAT
+
+def test_restored_expirations_keep_running(combat_round):
+    state = combat_round.combat_state
+    first = state.participants[0]
+    state.condition_manager.add_condition(first, Condition(ConditionType.POISONED, duration=2))
+    snapshot = combat_round.snapshot()
+    state.scheduler.advance(first.id)
+    state.scheduler.advance(first.id)
+    assert first.stats["strength"] == 10
+
+    combat_round.restore(snapshot)
+    assert first.stats["strength"] == 8
+    state.scheduler.advance(first.id)
+    assert first.stats["strength"] == 8
+    state.scheduler.advance(first.id)
+    assert first.stats["strength"] == 10
+    assert state.condition_manager.get_conditions(first) == []
+
+def test_fork_is_independent(combat_round):
+    mutate(combat_round)
+    before = describe(combat_round)
+    fork = combat_round.fork()
+
+    fork_state = fork.combat_state
+    assert [p.id for p in fork_state.participants] == \
+        [p.id for p in combat_round.combat_state.participants]
+    assert all(a is not b for a, b in zip(fork_state.participants,
+                                          combat_round.combat_state.participants))
+
+    mutate(fork)
+    fork_state.participants[0].take_damage(50)
+    fork.use_action(fork_state.participants[1], ActionType.BONUS)
+    fork_state.damage_type_manager.add_immunity(fork_state.participants[0], DamageType.FIRE)
+    for _ in range(3):
+        fork_state.next_turn()
+
+    assert describe(combat_round) == before
+    assert fork_state.damage_type_manager.get_resistance(
+        fork_state.participants[0], DamageType.FIRE) == ResistanceType.IMMUNE
+
+def test_fork_shares_static_data(combat_round):
+    state = combat_round.combat_state
+    original = state.participants[0]
+    original.inventory["espada"] = object()
+    fork = state.fork()
+    clone = fork.participants[0]
+    assert clone.inventory is original.inventory
+    assert clone.stats is not original.stats
+    assert fork.damage_type_manager.resistances is state.damage_type_manager.resistances
+
+@pytest.mark.parametrize("rng", [random.Random(5), DiceStream(5)])
+def test_forks_and_restore_replay_the_same_rolls(rng):
+    state = CombatState(rng)
+    state.start_combat([Character(name="A", stats={"hp": 10}),
+                        Character(name="B", stats={"hp": 10})])
+    snapshot = state.snapshot()
+    rolls = [state.initiative.rng.randint(1, 20) for _ in range(5)]
+
+    forks = [state.fork_from(snapshot), state.fork_from(snapshot)]
+    assert all(fork.initiative.rng is not rng for fork in forks)
+    assert [[fork.initiative.rng.randint(1, 20) for _ in range(5)] for fork in forks] == \
+        [rolls, rolls]
+
+    state.restore(snapshot)
+    assert [rng.randint(1, 20) for _ in range(5)] == rolls
+
+def test_restore_leaves_the_global_rng_alone():
+    state = CombatState()
+    assert state.initiative.rng is not random
+    state.start_combat([Character(name="A", stats={"hp": 10}),
+                        Character(name="B", stats={"hp": 10})])
+    snapshot = state.snapshot()
+    random.seed(7)
+    expected = [random.random() for _ in range(3)]
+    random.seed(7)
+    state.restore(snapshot)
+    state.fork_from(snapshot)
+    assert [random.random() for _ in range(3)] == expected
+
+def test_restore_keeps_foreign_effect_modifiers(combat_round):
+    state = combat_round.combat_state
+    first = state.participants[0]
+    first.add_modifier("strength", 1, ModifierLayer.EFFECTS)
+    state.effect_manager.apply_effect(make_buff(turns=3), first)
+    snapshot = combat_round.snapshot()
+    assert first.stats["strength"] == 14
+
+    combat_round.restore(snapshot)
+    assert first.stats["strength"] == 14
+    state.scheduler.advance(first.id)
+    state.scheduler.advance(first.id)
+    state.scheduler.advance(first.id)
+    # O buff expira e leva só os próprios modificadores
+    assert first.stats["strength"] == 11
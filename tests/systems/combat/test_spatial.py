@@ -0,0 +1,98 @@
+import pytest
+from src.systems.combat.spatial import SpatialIndex
+from src.systems.combat.combat_state import CombatState
+from src.systems.combat.ability_effect import (
+    AbilityEffect,
+    AreaShape,
+    EffectType,
+    EffectTarget,
+    EffectDuration
+)
+from src.systems.character.character import Character
+
+@pytest.fixture
+def characters():
+    return [Character(name=f"Combatente {i}") for i in range(6)]
+
+@pytest.fixture
+def spatial_index(characters):
+    index = SpatialIndex(cell_size=5)
+    positions = [(0, 0), (10, 0), (20, 0), (10, 10), (-10, 0), (0, 3)]
+    for character, (x, y) in zip(characters, positions):
+        index.place(character, x, y)
+    return index
+
+def names(characters):
+    return [c.name for c in characters]
+
+def test_query_radius(spatial_index):
+    assert names(spatial_index.query_radius((0, 0), 10)) == \
+        ["Combatente 0", "Combatente 1", "Combatente 4", "Combatente 5"]
+    assert names(spatial_index.query_radius((20, 0), 0)) == ["Combatente 2"]
+
+def test_move_updates_cells(spatial_index, characters):
+    spatial_index.place(characters[2], 1, 1)
+    assert spatial_index.get_position(characters[2]) == (1, 1)
+    assert characters[2] in spatial_index.query_radius((0, 0), 2)
+    assert spatial_index.query_radius((20, 0), 3) == []
+
+    spatial_index.remove(characters[2])
+    assert characters[2] not in spatial_index
+    assert len(spatial_index) == 5
+    assert characters[2] not in spatial_index.query_radius((0, 0), 2)
+
+def test_query_cone(spatial_index):
+    # Cone de 100° para a direita alcança (10, 10), a 45° da direção
+    assert names(spatial_index.query_cone((0, 0), (1, 0), 15, 100)) == \
+        ["Combatente 1", "Combatente 3"]
+    assert names(spatial_index.query_cone((0, 0), (1, 0), 15, 60)) == ["Combatente 1"]
+    assert names(spatial_index.query_cone((0, 0), (-1, 0), 15, 60)) == ["Combatente 4"]
+
+def test_query_line(spatial_index):
+    assert names(spatial_index.query_line((0, 0), (1, 0), 30, 5)) == \
+        ["Combatente 0", "Combatente 1", "Combatente 2"]
+    assert names(spatial_index.query_line((0, 0), (0, 1), 30, 5)) == \
+        ["Combatente 0", "Combatente 5"]
+    with pytest.raises(ValueError):
+        spatial_index.query_line((0, 0), (0, 0), 30, 5)
+
+def test_large_area_visits_occupied_cells():
+    index = SpatialIndex(cell_size=1)
+    far = Character(name="Longe")
+    index.place(far, 1000, 1000)
+    assert index.query_radius((0, 0), 10_000) == [far]
+
+def test_combat_state_area_targets(characters):
+    state = CombatState()
+    state.start_combat(list(characters))
+    for index, character in enumerate(characters):
+        state.move_participant(character, index * 5, 0)
+    caster = characters[0]
+    effect = AbilityEffect(
+        EffectType.DAMAGE,
+        EffectTarget(single_target=False, area_of_effect=True, area_radius=10,
+                     area_shape=AreaShape.CONE, area_angle=60),
+        EffectDuration()
+    )
+
+    targets = state.get_area_targets(effect, (0, 0), direction=(1, 0), caster=caster)
+    assert targets == characters[1:3]
+    allies = {caster.id, characters[1].id}
+    assert state.get_area_targets(effect, (0, 0), (1, 0), caster, allies) == [characters[2]]
+    with pytest.raises(ValueError):
+        state.get_area_targets(effect, (0, 0))
+
+    state.remove_participant(characters[1])
+    assert state.get_area_targets(effect, (0, 0), (1, 0), caster) == [characters[2]]
+
+def test_positions_in_snapshot(characters):
+    state = CombatState()
+    state.start_combat(characters)
+    state.move_participant(characters[0], 0, 0)
+    snapshot = state.snapshot()
+    state.move_participant(characters[0], 50, 50)
+
+    fork = state.fork_from(snapshot)
+    assert fork.spatial_index.get_position(characters[0].id) == (0, 0)
+    state.restore(snapshot)
+    assert state.spatial_index.query_radius((0, 0), 1) == [characters[0]]
@@ -0,0 +1,84 @@
+import pickle
+import random
+import pytest
+from src.systems.dice.rng import DiceStream, RngService, roll_die
+from src.systems.combat.initiative import Initiative
+from src.systems.character.character import Character
+from src.systems.reference.quick_reference import ReferenceTable
+
+@pytest.fixture
+def service():
+    return RngService(seed=1234)
+
+def test_streams_are_reproducible_and_independent(service):
+    first = [service.stream("initiative").roll(20) for _ in range(50)]
+    other = RngService(seed=1234)
+    other.stream("crafting").random()  # consumir outro fluxo não altera este
+    assert [other.stream("initiative").roll(20) for _ in range(50)] == first
+    assert [RngService(seed=1235).stream("initiative").roll(20) for _ in range(50)] != first
+    assert service.stream("initiative") is service.stream("initiative")
+
+def test_jump_ahead_matches_sequential_draws():
+    stream = DiceStream(7)
+    values = [stream.random() for _ in range(100)]
+    jumped = DiceStream(7)
+    jumped.jump(60)
+    assert jumped.random() == values[60]
+
+def test_bulk_rolls_match_scalar_rolls():
+    bulk = DiceStream(99).rolls(20, 1000)
+    scalar = DiceStream(99)
+    assert bulk.tolist() == [scalar.roll(20) for _ in range(1000)]
+    assert bulk.min() == 1 and bulk.max() == 20
+
+def test_buffered_d20_uses_its_own_substream():
+    stream = DiceStream(5)
+    rolls = [stream.d20() for _ in range(5000)]
+    reference = DiceStream(5).substream("d20")
+    assert rolls == [reference.roll(20) for _ in range(5000)]
+    # O buffer não consome o fluxo principal
+    assert stream.counter == 0
+
+def test_state_round_trip_and_pickle():
+    stream = DiceStream(3)
+    stream.d20()
+    stream.random()
+    state = stream.getstate()
+    expected = [(stream.d20(), stream.randint(1, 6)) for _ in range(10)]
+    stream.setstate(state)
+    assert [(stream.d20(), stream.randint(1, 6)) for _ in range(10)] == expected
+
+    stream.setstate(state)
+    copy = pickle.loads(pickle.dumps(stream))
+    assert [copy.d20() for _ in range(10)] == [stream.d20() for _ in range(10)]
+    assert [copy.die(6) for _ in range(10)] == [stream.die(6) for _ in range(10)]
+
+def test_service_spawn_and_state(service):
+    assert service.spawn(0).seed != service.spawn(1).seed
+    assert service.spawn(3).seed == RngService(seed=1234).spawn(3).seed
+    stream = service.stream("loot")
+    state = service.getstate()
+    drawn = stream.random()
+    service.setstate(state)
+    assert stream.random() == drawn
+
+def test_random_api_compatibility():
+    stream = DiceStream(11)
+    assert 1 <= stream.randint(1, 6) <= 6
+    assert stream.choice("abc") in "abc"
+    assert sorted(stream.sample(range(10), 10)) == list(range(10))
+    assert 0.0 <= stream.random() < 1.0
+    assert stream.getrandbits(100) < 2 ** 100
+    assert 1 <= roll_die(random.Random(0), 8) <= 8
+
+def test_subsystems_accept_streams(service):
+    characters = [Character(name=f"Combatente {i}") for i in range(6)]
+    rolls = []
+    for _ in range(2):
+        initiative = Initiative(RngService(seed=9).stream("initiative"))
+        initiative.roll_initiative(characters)
+        rolls.append([initiative.get_initiative(c) for c in characters])
+    assert rolls[0] == rolls[1]
+
+    table = ReferenceTable("tesouro", "Tesouro", ["moedas", "gema", "poção"])
+    assert table.roll(DiceStream(1)) == table.roll(DiceStream(1))
@@ -145,5 +145,6 @@ def test_custom_use_effect():
     
     character = MockCharacter()
     assert item.use(character)
-    assert character.hp == 100
-    assert character.mp == 100
\ No newline at end of file
+    # O efeito customizado soma direto, sem o limite de heal/restore_mana
+    assert character.hp == 150
+    assert character.mp == 150
\ No newline at end of file
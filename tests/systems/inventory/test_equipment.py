@@ -1,6 +1,7 @@
 import pytest
 from src.systems.inventory.equipment import Equipment
 from src.systems.inventory.item import ItemType, ItemRarity, ItemEffect, EquipmentSlot
+from src.systems.character.stats import StatBlock
 
 @pytest.fixture
 def basic_equipment():
@@ -45,19 +46,23 @@ def enchanted_equipment():
 
 class MockCharacter:
     def __init__(self, level=1):
-        self.stats = {
+        self.id = id(self)
+        self.stats = StatBlock({
             "strength": 10,
             "dexterity": 10,
             "defense": 5,
             "attack": 5,
             "magic_attack": 5,
             "magic_defense": 5
-        }
+        })
         self.level = level
         self.character_class = "Warrior"
     
-    def modify_stat(self, stat, value):
-        self.stats[stat] += value
+    def add_modifier(self, stat, value, layer):
+        return self.stats.add_modifier(stat, value, layer)
+    
+    def remove_modifier(self, token):
+        return self.stats.remove_modifier(token)
     
     def get_stat(self, stat):
         return self.stats[stat]
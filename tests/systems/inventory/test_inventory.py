@@ -2,6 +2,7 @@ import pytest
 from src.systems.inventory.inventory import Inventory, InventorySlot
 from src.systems.inventory.item import Item, ItemType, ItemRarity
 from src.systems.inventory.equipment import Equipment, EquipmentSlot
+from src.systems.character.stats import StatBlock
 
 @pytest.fixture
 def empty_inventory():
@@ -59,17 +60,21 @@ def basic_equipment():
 
 class MockCharacter:
     def __init__(self, level=10):
+        self.id = id(self)
         self.level = level
         self.character_class = "Warrior"
-        self.stats = {
+        self.stats = StatBlock({
             "attack": 5,
             "defense": 5,
             "magic_attack": 5,
             "magic_defense": 5
-        }
+        })
     
-    def modify_stat(self, stat, value):
-        self.stats[stat] += value
+    def add_modifier(self, stat, value, layer):
+        return self.stats.add_modifier(stat, value, layer)
+    
+    def remove_modifier(self, token):
+        return self.stats.remove_modifier(token)
     
     def get_stat(self, stat):
         return self.stats[stat]